@@ -0,0 +1,482 @@
+# converters/batch.py
+import os
+import csv
+import json
+import time
+import traceback
+from datetime import datetime
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from converters.common import file_to_json, file_to_json_stream, get_converter_version
+from converters.cache import ConversionCache, DEFAULT_CACHE_DIR, DEFAULT_CACHE_SIZE_MB, refresh_file_metadata
+from converters.defaults import DEFAULT_EPUB_READER, DEFAULT_PARSER_ENGINE, DEFAULT_TABLE_DETECTION
+from utils.token_counter import DEFAULT_CHUNK_UNIT
+from utils.file_utils import hash_file
+from utils.file_discovery import iter_files
+from utils.stage_timer import StageTimer, NULL_TIMER, STAGE_FIELDS, merge_stage_stats
+from converters.exporters import convert_to_markdown, convert_to_text, save_json_file, MergedOutputWriter
+from converters.document_model import Document
+
+# 출력 포맷별 확장자
+OUTPUT_EXTENSIONS = {
+    "json": ".json",
+    "markdown": ".md",
+    "text": ".txt",
+}
+
+# 변환 가능한 입력 파일 확장자
+SUPPORTED_EXTENSIONS = ('.epub', '.pdf', '.html', '.htm')
+
+# 워커 시작 시 미리 로드해 둘 무거운 모듈들
+WARM_MODULES = ("fitz", "bs4", "ebooklib", "pandas", "lxml")
+
+# 워커 프로세스를 비정상 종료(세그폴트, 메모리 부족 등)시킨 것으로 보이는 작업을 단독으로 다시 실행하는 횟수
+MAX_CRASH_RETRIES = 1
+
+# 워커 프로세스별 변환 캐시 (처음 사용할 때 생성)
+_worker_cache = None
+
+
+def default_worker_count():
+    """기본 워커 수 (CPU 코어 수)"""
+    return max(1, os.cpu_count() or 1)
+
+
+def default_page_workers(worker_count, job_count):
+    """
+    문서 하나를 페이지 단위로 나누어 변환할 프로세스 수.
+    변환할 문서가 워커 수보다 적을 때 남는 코어를 큰 PDF의 페이지 변환에 나누어 줍니다.
+    """
+    return max(1, worker_count // max(1, job_count))
+
+
+def _warm_up_worker():
+    """워커 프로세스 시작 시 변환기와 의존 모듈을 한 번만 로드합니다."""
+    for module_name in WARM_MODULES:
+        try:
+            __import__(module_name)
+        except ImportError:
+            pass
+
+
+def iter_document_files(folder, recursive=True, excludes=None):
+    """
+    폴더 안의 변환 가능한 문서 파일을 찾는 대로 하나씩 반환합니다.
+    excludes는 .gitignore 형식 제외 규칙 목록입니다 (utils.file_discovery).
+    """
+    return iter_files(folder, patterns=[f"*{ext}" for ext in SUPPORTED_EXTENSIONS], excludes=excludes,
+                      recursive=recursive, ignore_case=True)
+
+
+def find_document_files(folder, recursive=True, excludes=None):
+    """폴더 안의 변환 가능한 문서 파일 목록을 반환합니다."""
+    return list(iter_document_files(folder, recursive, excludes))
+
+
+def build_jobs(document_files, output_folder, output_format, intermediate_dir=None):
+    """
+    변환 작업 목록 (인덱스, 입력 파일, 출력 경로)을 만듭니다.
+    intermediate_dir가 주어지면 병합용 중간 JSON 경로를 사용합니다.
+    하위 폴더 등에서 이름이 같은 입력 파일이 여럿이면 여러 워커가 같은 파일에 쓰지 않도록
+    두 번째부터 "이름 (2).json"처럼 번호를 붙입니다 (대소문자만 다른 이름도 같은 것으로 봄).
+    """
+    jobs = []
+    used_paths = set()
+    for idx, doc_file in enumerate(document_files, start=1):
+        if intermediate_dir:
+            output_path = os.path.join(intermediate_dir, f"{idx:06d}.json")
+        else:
+            base_name = os.path.splitext(os.path.basename(doc_file))[0]
+            extension = OUTPUT_EXTENSIONS[output_format]
+            output_path = os.path.join(output_folder, base_name + extension)
+            number = 1
+            while os.path.normcase(output_path).lower() in used_paths:
+                number += 1
+                output_path = os.path.join(output_folder, f"{base_name} ({number}){extension}")
+            used_paths.add(os.path.normcase(output_path).lower())
+        jobs.append((idx, doc_file, output_path))
+    return jobs
+
+
+def renamed_jobs(jobs):
+    """build_jobs가 이름 충돌 때문에 번호를 붙인 작업 목록을 반환합니다."""
+    return [job for job in jobs
+            if os.path.splitext(os.path.basename(job[2]))[0] != os.path.splitext(os.path.basename(job[1]))[0]]
+
+
+def export_document(data, output_path, output_format, compact_json=False):
+    """출력 포맷에 맞는 내보내기 함수를 호출합니다."""
+    if output_format == "json":
+        return save_json_file(data, output_path, compact=compact_json)
+    elif output_format == "markdown":
+        return convert_to_markdown(data, output_path)
+    elif output_format == "text":
+        return convert_to_text(data, output_path)
+    return False, f"지원하지 않는 출력 포맷: {output_format}"
+
+
+def get_worker_cache(options):
+    """옵션에 맞는 워커 프로세스의 변환 캐시를 반환합니다. 캐시를 쓰지 않으면 None."""
+    global _worker_cache
+    if not options.get('use_cache'):
+        return None
+    cache_dir = options.get('cache_dir') or DEFAULT_CACHE_DIR
+    max_size_mb = options.get('cache_size_mb') or DEFAULT_CACHE_SIZE_MB
+    if (_worker_cache is None or _worker_cache.cache_dir != cache_dir
+            or _worker_cache.max_bytes != int(max_size_mb * 1024 * 1024)):
+        _worker_cache = ConversionCache(cache_dir, max_size_mb)
+    return _worker_cache
+
+
+def convert_with_cache(doc_file, options, record, timer=NULL_TIMER):
+    """
+    캐시에 저장된 결과가 있으면 재사용하고, 없으면 변환 후 캐시에 저장합니다.
+    캐시를 쓰지 않으면 EPUB은 챕터 단위 제너레이터로 반환되어 내보내는 동안 하나씩 추출됩니다.
+    단, 처리 시간을 출력 메타데이터에 넣을 때(embed_timings)는 변환을 먼저 끝냅니다.
+    """
+    cache = get_worker_cache(options)
+    cache_key = None
+    if cache is not None:
+        converter_version = get_converter_version(doc_file)
+        if converter_version:
+            with timer.stage('cache'):
+                cache_key = cache.make_key(doc_file, options, converter_version, record.get('input_hash'))
+                data = cache.get(cache_key)
+            if data is not None:
+                record['cache'] = 'hit'
+                return refresh_file_metadata(data, doc_file), None
+            record['cache'] = 'miss'
+
+    convert = file_to_json if cache_key or options.get('embed_timings') else file_to_json_stream
+    data, error = convert(
+        doc_file,
+        chunk_size=options.get('chunk_size', 1000),
+        include_toc=options.get('include_toc', True),
+        advanced_metadata=options.get('advanced_metadata', True),
+        gpt_optimized=options.get('gpt_optimized', True),
+        epub_reader=options.get('epub_reader') or DEFAULT_EPUB_READER,
+        parser_engine=options.get('parser_engine') or DEFAULT_PARSER_ENGINE,
+        page_workers=options.get('page_workers') or 1,
+        table_detection=options.get('table_detection') or DEFAULT_TABLE_DETECTION,
+        chunk_unit=options.get('chunk_unit') or DEFAULT_CHUNK_UNIT,
+        tokenizer=options.get('tokenizer') or None,
+        timer=timer
+    )
+
+    if cache_key and not error:
+        try:
+            with timer.stage('cache'):
+                cache.put(cache_key, data)
+        except Exception:
+            # 캐시 저장 실패는 변환 결과에 영향을 주지 않음
+            pass
+    return data, error
+
+
+def count_items(document):
+    """변환 결과의 청크/챕터/섹션 수를 셉니다. 제너레이터는 세지 않습니다 (None)."""
+    return len(document.body) if hasattr(document.body, '__len__') else None
+
+
+def _count_while_exporting(items, record):
+    """제너레이터 배열을 내보내는 동안 요소 수를 상태 레코드에 기록합니다."""
+    record['item_count'] = 0
+    for item in items:
+        record['item_count'] += 1
+        yield item
+
+
+def new_record(doc_file, output_path, error=None):
+    """변환 상태 레코드를 생성합니다."""
+    return {
+        'file': doc_file,
+        'success': False,
+        'stage': 'convert',
+        'error': error,
+        'output_path': output_path,
+        'output_size': 0,
+        'item_count': 0,
+        'keys': [],
+        'title': None,
+        'creator': None,
+        'cache': None,
+        'seconds': 0.0,
+        'stages': {},
+    }
+
+
+def convert_document(doc_file, output_path, output_format, options):
+    """
+    워커 프로세스에서 문서 하나를 변환하고 결과 파일을 직접 기록합니다.
+    GUI 프로세스로는 작은 상태 레코드만 돌려보냅니다.
+    상태 레코드의 'stages'에는 단계별 시간/바이트/항목 수를, 'seconds'에는 전체 시간을 기록합니다.
+    """
+    record = new_record(doc_file, output_path)
+    timer = StageTimer()
+    start = time.perf_counter()
+
+    try:
+        if options.get('incremental'):
+            # 증분 변환 매니페스트용 입력 파일 상태 (변환 전에 기록)
+            stat = os.stat(doc_file)
+            record['input_size'] = stat.st_size
+            record['input_mtime_ns'] = stat.st_mtime_ns
+            with timer.stage('hash', bytes_read=stat.st_size):
+                record['input_hash'] = hash_file(doc_file)
+
+        data, error = convert_with_cache(doc_file, options, record, timer)
+        if error:
+            record['error'] = error
+            return record
+
+        record['item_count'] = count_items(data)
+        if record['item_count'] is None:
+            data.body = _count_while_exporting(data.body, record)
+        record['keys'] = data.field_names()
+        record['title'] = data.metadata.get('title')
+        record['creator'] = data.metadata.get('creator')
+        if 'table_pages_skipped' in data.metadata:
+            record['pages'] = data.metadata.get('pages')
+            record['table_pages_skipped'] = data.metadata['table_pages_skipped']
+
+        if options.get('embed_timings'):
+            # 출력 파일 기록(write) 전까지의 단계별 기록
+            data.metadata['timings'] = timer.to_dict()
+
+        record['stage'] = 'export'
+        with timer.stage('write'):
+            success, error = export_document(data, output_path, output_format, options.get('compact_json', False))
+        if not success:
+            record['error'] = error
+            # 기록 도중 실패한 불완전한 출력 파일은 남기지 않음
+            try:
+                os.remove(output_path)
+            except OSError:
+                pass
+            return record
+
+        record['output_size'] = os.path.getsize(output_path)
+        timer.add('write', items=record['item_count'] or 0, bytes_written=record['output_size'])
+        record['success'] = True
+    except Exception as e:
+        record['error'] = str(e)
+        if options.get('debug'):
+            record['traceback'] = traceback.format_exc()
+    finally:
+        record['seconds'] = time.perf_counter() - start
+        record['stages'] = timer.to_dict()
+
+    return record
+
+
+class MergedBatchWriter:
+    """
+    완료 순서와 관계없이 입력 순서대로 문서를 병합 출력에 기록합니다.
+    앞선 문서가 끝나는 즉시 중간 JSON을 하나씩 읽어 기록하고 삭제하므로
+    메모리에는 한 번에 문서 하나만 올라갑니다.
+    """
+
+    def __init__(self, output_path, output_format, jobs, gpt_optimized, compact_json=False):
+        self.writer = MergedOutputWriter(output_path, output_format, len(jobs), gpt_optimized, compact_json)
+        self.order = [idx for idx, _, _ in jobs]
+        self.position = 0
+        self.pending = {}
+
+    def add(self, idx, record):
+        """
+        완료된 작업의 상태 레코드를 추가하고, 순서가 된 문서들을 기록합니다.
+        기록된 문서의 입력 파일 경로 목록을 반환합니다.
+        """
+        self.pending[idx] = record
+        merged = []
+        while self.position < len(self.order) and self.order[self.position] in self.pending:
+            record = self.pending.pop(self.order[self.position])
+            self.position += 1
+            if not record['success']:
+                continue
+            with open(record['output_path'], 'r', encoding='utf-8') as f:
+                document = Document.from_dict(json.load(f))
+            self.writer.add_document(document, record['file'])
+            del document
+            try:
+                os.remove(record['output_path'])
+            except OSError:
+                pass
+            merged.append(record['file'])
+        return merged
+
+    def close(self):
+        """병합 출력을 마무리합니다. (성공 여부, 오류 메시지)를 반환합니다."""
+        return self.writer.close()
+
+    def abort(self):
+        """병합을 중단하고 작성 중이던 출력 파일을 삭제합니다."""
+        self.writer.abort()
+
+
+def summarize_cache(records):
+    """상태 레코드들의 캐시 적중/미스 횟수를 집계합니다."""
+    hits = sum(1 for record in records if record.get('cache') == 'hit')
+    misses = sum(1 for record in records if record.get('cache') == 'miss')
+    return hits, misses
+
+
+def summarize_table_detection(records):
+    """PDF 상태 레코드들의 (표 탐지를 생략한 페이지 수, 전체 페이지 수)를 집계합니다."""
+    pdf_records = [record for record in records if record.get('table_pages_skipped') is not None]
+    skipped = sum(record['table_pages_skipped'] for record in pdf_records)
+    pages = sum(record.get('pages') or 0 for record in pdf_records)
+    return skipped, pages
+
+
+def summarize_stages(records):
+    """상태 레코드들의 단계별 시간/바이트/항목 수를 합칩니다."""
+    return merge_stage_stats(record.get('stages') or {} for record in records)
+
+
+def write_run_report(records, report_path):
+    """
+    배치 변환 보고서를 기록합니다. 확장자가 .csv면 파일/단계별 한 줄씩, 아니면 JSON으로 저장합니다.
+    (성공 여부, 오류 메시지)를 반환합니다.
+    """
+    try:
+        if report_path.lower().endswith('.csv'):
+            with open(report_path, 'w', encoding='utf-8-sig', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['file', 'success', 'cache', 'total_seconds', 'stage', *STAGE_FIELDS])
+                for record in records:
+                    for stage, stats in (record.get('stages') or {}).items():
+                        writer.writerow([record['file'], record['success'], record.get('cache') or '',
+                                         round(record.get('seconds') or 0.0, 6), stage,
+                                         *(stats[field] for field in STAGE_FIELDS)])
+        else:
+            report = {
+                'generated': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                'files': [{
+                    'file': record['file'],
+                    'success': record['success'],
+                    'error': record.get('error'),
+                    'cache': record.get('cache'),
+                    'seconds': round(record.get('seconds') or 0.0, 6),
+                    'item_count': record.get('item_count'),
+                    'output_size': record.get('output_size'),
+                    'stages': record.get('stages') or {},
+                } for record in records],
+                'stages': summarize_stages(records),
+            }
+            with open(report_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=4)
+        return True, None
+    except Exception as e:
+        return False, str(e)
+
+
+def merged_output_path(output_folder, merge_filename, output_format):
+    """병합 출력 파일 경로를 만듭니다. 확장자가 없으면 추가합니다."""
+    output_ext = OUTPUT_EXTENSIONS[output_format]
+    if not merge_filename.endswith(output_ext):
+        merge_filename += output_ext
+    return os.path.join(output_folder, merge_filename)
+
+
+class ConversionPool:
+    """
+    세션 동안 유지되는 변환 워커 프로세스 풀.
+    워커는 fitz/bs4/pandas 등을 한 번만 로드하고 여러 배치에서 재사용됩니다.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or default_worker_count()
+        self._executor = None
+
+    def _get_executor(self, max_workers=None):
+        """필요 시 워커 풀을 생성합니다. 워커 수가 바뀌면 풀을 다시 만듭니다."""
+        max_workers = max(1, max_workers or self.max_workers)
+        if self._executor is not None and max_workers != self.max_workers:
+            self.shutdown()
+        if self._executor is None:
+            self.max_workers = max_workers
+            self._executor = ProcessPoolExecutor(max_workers=max_workers,
+                                                 initializer=_warm_up_worker)
+        return self._executor
+
+    def run(self, jobs, output_format, options, max_workers=None, stop_requested=None):
+        """
+        (인덱스, 입력 파일, 출력 경로) 작업 목록을 병렬로 변환합니다.
+        완료되는 순서대로 (인덱스, 상태 레코드)를 반환하는 제너레이터입니다.
+        워커 프로세스가 비정상 종료되어 풀이 깨지면(BrokenProcessPool) 새 풀을 만들어 끝나지 않은 작업을 다시 제출합니다.
+        이때 실행 중이었을 수 있는 작업은 나머지가 끝난 뒤 하나씩 단독으로 실행하여 원인 파일을 가려내고,
+        단독 실행에서도 워커를 종료시킨 파일은 MAX_CRASH_RETRIES번 다시 시도한 뒤 그 파일만 실패로 기록합니다.
+        """
+        futures = {}        # Future -> 작업 (제출 순서 유지)
+        suspects = deque()  # 단독으로 다시 실행할 작업
+        crashes = {}        # 단독 실행 중 워커가 종료된 횟수 (작업 인덱스별)
+        isolated = None     # 단독 실행 중인 작업
+
+        def submit(job):
+            idx, doc_file, output_path = job
+            executor = self._get_executor(max_workers)
+            futures[executor.submit(convert_document, doc_file, output_path, output_format, options)] = job
+
+        for job in jobs:
+            submit(job)
+
+        try:
+            while futures or suspects:
+                if not futures:
+                    isolated = suspects.popleft()
+                    submit(isolated)
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                if stop_requested and stop_requested():
+                    break
+                if any(isinstance(future.exception(), BrokenProcessPool) for future in done):
+                    # 깨진 풀의 나머지 작업도 곧 모두 끝나므로 한꺼번에 정리
+                    done, _ = wait(futures)
+
+                lost = []
+                for future in [future for future in futures if future in done]:
+                    job = futures.pop(future)
+                    idx, doc_file, output_path = job
+                    error = future.exception()
+                    if isinstance(error, BrokenProcessPool):
+                        lost.append(job)
+                        continue
+                    if error is not None:
+                        record = new_record(doc_file, output_path, f"워커 프로세스 오류: {str(error)}")
+                    else:
+                        record = future.result()
+                    yield idx, record
+                if not lost:
+                    isolated = None
+                    continue
+
+                # 깨진 풀은 종료하고 다음 제출 때 새로 생성
+                self.shutdown()
+                if lost == [isolated]:
+                    idx, doc_file, output_path = isolated
+                    crashes[idx] = crashes.get(idx, 0) + 1
+                    if crashes[idx] > MAX_CRASH_RETRIES:
+                        yield idx, new_record(doc_file, output_path,
+                                              "워커 프로세스 오류: 변환 중 워커 프로세스가 비정상 종료되었습니다.")
+                    else:
+                        suspects.append(isolated)
+                    isolated = None
+                    continue
+                # 풀은 제출 순서대로 작업을 넘기므로, 실행 중이었을 수 있는 작업은 끝나지 않은 앞쪽 작업
+                # (워커 수 + 대기열 1개)뿐입니다. 나머지는 새 풀에서 바로 다시 실행합니다.
+                running_count = self.max_workers + 1
+                suspects.extend(lost[:running_count])
+                for job in lost[running_count:]:
+                    submit(job)
+        finally:
+            # 중단 시 아직 시작하지 않은 작업은 취소
+            for future in futures:
+                future.cancel()
+
+    def shutdown(self):
+        """워커 프로세스를 종료합니다."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
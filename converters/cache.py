@@ -0,0 +1,160 @@
+# converters/cache.py
+import os
+import json
+import pickle
+import hashlib
+import tempfile
+from datetime import datetime
+
+from utils.file_utils import hash_file
+from utils.token_counter import tokenizer_fingerprint
+
+# 설정 파일(~/.epub_converter/config.json)과 같은 폴더에 캐시 저장
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".epub_converter", "cache")
+DEFAULT_CACHE_SIZE_MB = 1024
+
+# 캐시 항목 저장 형식이 바뀌면 올립니다
+CACHE_FORMAT_VERSION = 2
+
+# 캐시 키에 포함되는 변환 옵션
+CACHE_KEY_OPTIONS = ('chunk_size', 'include_toc', 'advanced_metadata', 'gpt_optimized', 'parser_engine',
+                     'table_detection', 'chunk_unit', 'tokenizer')
+
+
+class ConversionCache:
+    """
+    file_to_json 결과(Document)를 입력 파일 내용 해시 + 변환 옵션 + 변환기 버전으로 저장하는 디스크 캐시.
+    전체 크기가 한도를 넘으면 가장 오래 사용되지 않은 항목부터 삭제합니다 (LRU).
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_size_mb=DEFAULT_CACHE_SIZE_MB):
+        self.cache_dir = cache_dir
+        self.entries_dir = os.path.join(cache_dir, "entries")
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self._total_bytes = None
+        os.makedirs(self.entries_dir, exist_ok=True)
+
+    def make_key(self, file_path, options, converter_version, file_hash=None):
+        """
+        입력 파일 내용 해시, 변환 옵션, 변환기 버전으로 캐시 키를 만듭니다.
+        제목이 없는 문서는 파일 이름을 제목으로 쓰므로 파일 이름도 키에 포함합니다.
+        이미 계산한 내용 해시가 있으면 file_hash로 전달해 파일을 다시 읽지 않습니다.
+        토크나이저 파일은 경로뿐 아니라 내용 해시도 키에 넣어, 같은 경로의 어휘 파일이 바뀌면 다시 변환합니다.
+        """
+        key_data = {
+            'file_hash': file_hash or hash_file(file_path),
+            'file_name': os.path.basename(file_path),
+            'options': {name: options.get(name) for name in CACHE_KEY_OPTIONS},
+            'converter_version': converter_version,
+            'cache_format': CACHE_FORMAT_VERSION,
+        }
+        if options.get('tokenizer'):
+            key_data['tokenizer_hash'] = tokenizer_fingerprint(options['tokenizer'])
+        return hashlib.sha256(json.dumps(key_data, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.entries_dir, key[:2], key + ".pkl")
+
+    def get(self, key):
+        """캐시된 변환 결과를 반환합니다. 없으면 None."""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            self.misses += 1
+            return None
+        except Exception:
+            # 손상되었거나 호환되지 않는 항목은 삭제
+            self._remove(path)
+            self.misses += 1
+            return None
+
+        # LRU 순서를 위해 마지막 사용 시각 갱신
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        self.hits += 1
+        return data
+
+    def put(self, key, data):
+        """변환 결과를 캐시에 저장하고, 한도를 넘으면 오래된 항목을 정리합니다."""
+        path = self._entry_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        payload = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        self._atomic_write(path, payload)
+
+        if self._total_bytes is None:
+            self._total_bytes = self._scan()[1]
+        else:
+            self._total_bytes += len(payload)
+        if self._total_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """전체 크기가 한도의 90% 이하가 될 때까지 가장 오래 사용되지 않은 항목을 삭제합니다."""
+        entries, total = self._scan()
+        target = self.max_bytes * 0.9
+        entries.sort(key=lambda entry: entry[1])
+        for path, _, size in entries:
+            if total <= target:
+                break
+            if self._remove(path):
+                total -= size
+        self._total_bytes = total
+
+    def clear(self):
+        """캐시 항목을 모두 삭제합니다."""
+        for path, _, _ in self._scan()[0]:
+            self._remove(path)
+        self._total_bytes = 0
+
+    def stats(self):
+        """적중/미스 횟수를 반환합니다."""
+        return {'hits': self.hits, 'misses': self.misses}
+
+    def _scan(self):
+        """(경로, 마지막 사용 시각, 크기) 목록과 전체 크기를 반환합니다."""
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.entries_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, stat.st_mtime, stat.st_size))
+                total += stat.st_size
+        return entries, total
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    def _atomic_write(self, path, payload):
+        """여러 워커 프로세스가 동시에 써도 깨지지 않도록 임시 파일에 쓴 뒤 교체합니다."""
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except Exception:
+            self._remove(tmp_path)
+            raise
+
+
+def refresh_file_metadata(data, file_path):
+    """캐시에서 꺼낸 결과의 파일 경로/변환 일시 메타데이터를 현재 입력에 맞게 갱신합니다."""
+    metadata = data.metadata
+    if 'file_path' in metadata:
+        metadata['file_path'] = file_path
+        metadata['file_name'] = os.path.basename(file_path)
+        metadata['processed_date'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return data
@@ -1,20 +1,70 @@
 # converters/common.py
 import os
-from converters.epub_converter import epub_to_json
-from converters.pdf_converter import pdf_to_json
-from converters.html_converter import html_to_json
+import importlib
+from converters.defaults import DEFAULT_EPUB_READER, DEFAULT_PARSER_ENGINE, DEFAULT_TABLE_DETECTION
+from utils.token_counter import DEFAULT_CHUNK_UNIT
+from utils.stage_timer import NULL_TIMER
 
-def file_to_json(file_path, chunk_size=1000, include_toc=True, advanced_metadata=True, gpt_optimized=True):
-    """파일 유형에 따라 적절한 변환 함수를 호출합니다."""
+# 확장자별 변환기 모듈 (fitz, ebooklib, bs4 등을 불러오므로 해당 형식을 처음 변환할 때 import)
+# 문자열로만 import하므로 PyInstaller 빌드 스크립트(scripts/build_*.bat)의
+# --hidden-import 목록과 맞춰야 합니다.
+CONVERTER_MODULES = {
+    '.epub': 'converters.epub_converter',
+    '.pdf': 'converters.pdf_converter',
+    '.html': 'converters.html_converter',
+    '.htm': 'converters.html_converter',
+}
+
+def load_converter(ext):
+    """확장자에 해당하는 변환기 모듈을 반환합니다. 지원하지 않는 형식이면 None."""
+    module_name = CONVERTER_MODULES.get(ext)
+    return importlib.import_module(module_name) if module_name else None
+
+def get_converter_version(file_path):
+    """파일 유형에 해당하는 변환기 버전을 반환합니다. 지원하지 않는 형식이면 None."""
+    converter = load_converter(os.path.splitext(file_path)[1].lower())
+    return converter.CONVERTER_VERSION if converter else None
+
+def file_to_json(file_path, chunk_size=1000, include_toc=True, advanced_metadata=True, gpt_optimized=True,
+                 epub_reader=DEFAULT_EPUB_READER, parser_engine=DEFAULT_PARSER_ENGINE, page_workers=1,
+                 table_detection=DEFAULT_TABLE_DETECTION, chunk_unit=DEFAULT_CHUNK_UNIT, tokenizer=None,
+                 timer=NULL_TIMER):
+    """
+    파일 유형에 따라 적절한 변환 함수를 호출합니다.
+    timer(utils.stage_timer.StageTimer)를 넘기면 변환 단계별 시간과 처리량을 기록합니다.
+    """
     ext = os.path.splitext(file_path)[1].lower()
+    converter = load_converter(ext)
     
     if ext == '.epub':
-        return epub_to_json(file_path, chunk_size, include_toc, advanced_metadata, gpt_optimized)
+        return converter.epub_to_json(file_path, chunk_size, include_toc, advanced_metadata, gpt_optimized,
+                                      epub_reader, parser_engine, chunk_unit, tokenizer, timer)
     elif ext == '.pdf':
         # PDF 변환 시 목차는 무시 (PDF의 목차 추출은 더 복잡함)
-        return pdf_to_json(file_path, chunk_size, advanced_metadata, gpt_optimized)
+        return converter.pdf_to_json(file_path, chunk_size, advanced_metadata, gpt_optimized, page_workers,
+                                     table_detection, timer)
     elif ext in ['.html', '.htm']:
         # HTML 변환 시 목차는 무시
-        return html_to_json(file_path, chunk_size, advanced_metadata, gpt_optimized)
+        return converter.html_to_json(file_path, chunk_size, advanced_metadata, gpt_optimized, parser_engine,
+                                      timer)
     else:
         return None, f"지원하지 않는 파일 형식: {ext}"
+
+def file_to_json_stream(file_path, chunk_size=1000, include_toc=True, advanced_metadata=True, gpt_optimized=True,
+                        epub_reader=DEFAULT_EPUB_READER, parser_engine=DEFAULT_PARSER_ENGINE, page_workers=1,
+                        table_detection=DEFAULT_TABLE_DETECTION, chunk_unit=DEFAULT_CHUNK_UNIT, tokenizer=None,
+                        timer=NULL_TIMER):
+    """
+    file_to_json과 같지만 EPUB은 챕터/청크 배열을 제너레이터로 반환하여
+    내보내기 함수가 한 챕터씩 바로 기록할 수 있게 합니다.
+    다른 형식은 file_to_json 결과를 그대로 반환합니다.
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    
+    if ext == '.epub':
+        converter = load_converter(ext)
+        return converter.epub_to_json_stream(file_path, chunk_size, include_toc, advanced_metadata, gpt_optimized,
+                                             epub_reader, parser_engine, chunk_unit, tokenizer, timer)
+    return file_to_json(file_path, chunk_size, include_toc, advanced_metadata, gpt_optimized,
+                        parser_engine=parser_engine, page_workers=page_workers, table_detection=table_detection,
+                        timer=timer)
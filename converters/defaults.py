@@ -0,0 +1,19 @@
+# converters/defaults.py
+"""
+변환 옵션 선택지와 기본값.
+
+UI와 명령줄, 배치 모듈이 시작할 때 불러오는 모듈이므로 fitz/ebooklib/bs4/lxml 같은
+무거운 의존성을 import하지 않습니다. 각 변환기 모듈은 처음 변환할 때 불러옵니다.
+"""
+
+# EPUB 읽기 방식: zip (필요한 파일만 읽음), ebooklib (전체 로드)
+EPUB_READERS = ("zip", "ebooklib")
+DEFAULT_EPUB_READER = "zip"
+
+# EPUB/HTML 파싱 엔진 (parser_engines 참고)
+PARSER_ENGINES = ("html.parser", "bs4-lxml", "lxml")
+DEFAULT_PARSER_ENGINE = "html.parser"
+
+# 표 탐지 방식: always (모든 페이지), auto (표가 있을 수 있는 페이지만), never (표 탐지 안 함)
+TABLE_DETECTION_MODES = ("always", "auto", "never")
+DEFAULT_TABLE_DETECTION = "auto"
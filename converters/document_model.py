@@ -0,0 +1,203 @@
+# converters/document_model.py
+"""
+모든 변환기가 만드는 중간 문서 모델.
+
+Document 하나에 본문 배열 하나(청크, 챕터 텍스트, 섹션)가 들어 있고,
+내보내기 함수와 병합 출력은 본문 노드를 한 번씩만 순회합니다.
+노드는 __slots__ 객체이며 JSON 형식의 딕셔너리는 to_dict()로 내보낼 때만 만듭니다.
+"""
+from utils.text_utils import strip_chunk_pieces
+
+# 본문 배열 키 (JSON 출력의 최상위 키)
+BODY_KEYS = ('chunks', 'chapters', 'sections')
+
+
+class Document:
+    """
+    변환된 문서 하나.
+    JSON 최상위 키 순서대로 metadata, head(본문 앞 항목), body_key: body, tail(본문 뒤 항목)을 가집니다.
+    body는 리스트 또는 한 번만 순회할 수 있는 이터레이터이며, tail의 'total_<body_key>'가 None이면
+    내보내면서 센 노드 수로 채웁니다.
+    """
+
+    __slots__ = ('metadata', 'head', 'body_key', 'body', 'tail')
+
+    def __init__(self, metadata, body_key, body, head=None, tail=None):
+        self.metadata = metadata
+        self.body_key = body_key
+        self.body = body
+        self.head = head if head is not None else {}
+        self.tail = tail if tail is not None else {}
+
+    @property
+    def toc(self):
+        return self.head.get('toc')
+
+    def fields(self):
+        """JSON 최상위 (키, 값)을 출력 순서대로 반환합니다."""
+        yield 'metadata', self.metadata
+        yield from self.head.items()
+        yield self.body_key, self.body
+        yield from self.tail.items()
+
+    def field_names(self):
+        """JSON 최상위 키 목록"""
+        return ['metadata', *self.head, self.body_key, *self.tail]
+
+    def to_dict(self):
+        """본문 노드까지 모두 JSON 형식의 딕셔너리로 만듭니다 (본문 이터레이터는 소비됨)."""
+        data = {}
+        for key, value in self.fields():
+            if key == self.body_key:
+                value = [node if isinstance(node, str) else node.to_dict() for node in value]
+            data[key] = value
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """to_dict()나 저장된 JSON 파일에서 읽은 딕셔너리로 문서를 다시 만듭니다."""
+        body_key = next((key for key in BODY_KEYS if key in data), None)
+        if body_key is None:
+            raise ValueError("본문(chunks/chapters/sections)이 없는 문서입니다.")
+        head, tail = {}, {}
+        fields = head
+        for key, value in data.items():
+            if key == body_key:
+                fields = tail
+            elif key != 'metadata':
+                fields[key] = value
+        body = data[body_key]
+        if body_key == 'chunks':
+            body = [Chunk.from_dict(chunk) for chunk in body]
+        elif body_key == 'sections':
+            body = [Section.from_dict(section) for section in body]
+        return cls(data.get('metadata', {}), body_key, body, head, tail)
+
+
+class Section:
+    """
+    h2 섹션(level 2) 또는 h3 하위 섹션(level 3).
+    content는 Paragraph/Table 목록이고, 하위 섹션은 level 2 섹션에만 있습니다.
+    """
+
+    __slots__ = ('level', 'title', 'content', 'subsections')
+
+    def __init__(self, title, level=2):
+        self.level = level
+        self.title = title
+        self.content = []
+        self.subsections = [] if level == 2 else None
+
+    def to_dict(self):
+        if self.level != 2:
+            return {'subtitle': self.title, 'content': [item.to_dict() for item in self.content]}
+        return {
+            'title': self.title,
+            'content': [item.to_dict() for item in self.content],
+            'subsections': [subsection.to_dict() for subsection in self.subsections]
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        section = cls(data.get('title', data.get('subtitle')), 2 if 'subsections' in data else 3)
+        section.content = [Table(item.get('data')) if item.get('type') == 'table' else Paragraph(item.get('text', ''))
+                           for item in data.get('content', [])]
+        if section.level == 2:
+            section.subsections = [cls.from_dict(subsection) for subsection in data['subsections']]
+        return section
+
+
+class Paragraph:
+    """본문 단락"""
+
+    __slots__ = ('text',)
+
+    def __init__(self, text):
+        self.text = text
+
+    def to_dict(self):
+        return {'type': 'paragraph', 'text': self.text}
+
+
+class Table:
+    """표 (행 딕셔너리 목록)"""
+
+    __slots__ = ('data',)
+
+    def __init__(self, data):
+        self.data = data
+
+    def to_dict(self):
+        return {'type': 'table', 'data': self.data}
+
+
+class Chapter:
+    """청크들이 공유하는 챕터 원문"""
+
+    __slots__ = ('index', 'title', 'text')
+
+    def __init__(self, index, title, text):
+        self.index = index
+        self.title = title
+        self.text = text
+
+
+class Chunk:
+    """
+    챕터 원문의 [start, end) 구간을 가리키는 청크.
+    원문에서 이어지지 않는 조각(문장 사이 공백이 다르거나 빈 단락을 건너뛴 경우)으로 된 청크만
+    pieces에 (앞 구분자, 시작, 끝) 조각 튜플을 보관합니다.
+    """
+
+    __slots__ = ('chapter', 'chunk_index', 'start', 'end', 'pieces', 'token_count')
+
+    def __init__(self, chapter, chunk_index, pieces, token_count=None):
+        pieces = strip_chunk_pieces(chapter.text, pieces)
+        self.chapter = chapter
+        self.chunk_index = chunk_index
+        self.start = pieces[0][1] if pieces else 0
+        self.end = pieces[-1][2] if pieces else 0
+        self.pieces = pieces if len(pieces) > 1 else None
+        self.token_count = token_count
+
+    @property
+    def id(self):
+        return f"ch{self.chapter.index}_{self.chunk_index}"
+
+    @property
+    def content(self):
+        text = self.chapter.text
+        if self.pieces is None:
+            return text[self.start:self.end]
+        return ''.join([separator + text[start:end] for separator, start, end in self.pieces])
+
+    @property
+    def char_count(self):
+        if self.pieces is None:
+            return self.end - self.start
+        return sum(len(separator) + end - start for separator, start, end in self.pieces)
+
+    def to_dict(self):
+        """epub_to_json 청크 딕셔너리 형식으로 만듭니다 (여기서 처음으로 청크 문자열을 만듦)."""
+        content = self.content
+        chunk = {
+            'id': self.id,
+            'chapter_index': self.chapter.index,
+            'chunk_index': self.chunk_index,
+            'chapter_title': self.chapter.title,
+            'content': content,
+            'char_count': len(content)
+        }
+        if self.token_count is not None:
+            chunk['token_count'] = self.token_count
+        return chunk
+
+    @classmethod
+    def from_dict(cls, data):
+        """저장된 청크 딕셔너리에서 청크 내용 전체를 원문으로 갖는 청크를 만듭니다."""
+        content = data.get('content', '')
+        chapter = Chapter(data.get('chapter_index'), data.get('chapter_title'), content)
+        return cls(chapter, data.get('chunk_index'), [('', 0, len(content))], data.get('token_count'))
+
+    def __repr__(self):
+        return f"Chunk({self.id!r}, {self.start}, {self.end})"
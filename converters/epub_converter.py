@@ -1,29 +1,91 @@
 # converters/epub_converter.py
 import os
-from ebooklib import epub, ITEM_DOCUMENT
-from bs4 import BeautifulSoup
 from datetime import datetime
-from utils.text_utils import split_text_into_chunks
+from utils.text_utils import iter_chunk_spans, token_chunk_spans
+from utils.token_counter import load_token_counter, DEFAULT_CHUNK_UNIT
+from utils.stage_timer import NULL_TIMER
+from converters.epub_reader import open_epub, DEFAULT_EPUB_READER
+from converters.parser_engines import extract_chapter, DEFAULT_PARSER_ENGINE
+from converters.document_model import Document, Chapter, Chunk
 
-def epub_to_json(epub_path, chunk_size=1000, include_toc=True, advanced_metadata=True, gpt_optimized=True):
+# 변환 결과 형식이 바뀌면 버전을 올립니다 (변환 캐시 키에도 사용됨)
+CONVERTER_VERSION = "2.1.0"
+
+def iter_epub_records(documents, chunk_size=1000, gpt_optimized=True, parser_engine=DEFAULT_PARSER_ENGINE,
+                      token_counter=None, timer=NULL_TIMER):
     """
-    EPUB 파일을 읽어 메타데이터와 본문(챕터) 텍스트를 추출하여
-    JSON 형식의 딕셔너리로 반환합니다.
+    EPUB 본문 문서(챕터)를 하나씩 파싱하여 레코드를 차례로 반환하는 제너레이터.
+    documents는 open_epub이 반환한 본문 문서 이터레이터입니다.
+    gpt_optimized면 청크 노드(Chunk)를, 아니면 챕터 텍스트를 반환합니다.
+    청크 노드는 챕터 원문 위치만 가지며 내보낼 때 to_dict()로 청크 딕셔너리가 됩니다.
+    token_counter가 주어지면 chunk_size를 토큰 수로 보고 나누며, 청크에 token_count를 추가합니다.
+    한 번에 챕터 하나만 메모리에 올라갑니다.
+    timer(StageTimer)에는 read(압축 해제), parse(HTML 파싱), chunk(청크 분할) 단계를 기록합니다.
     """
+    documents = iter(documents)
+    chapter_idx = 0
+    while True:
+        with timer.stage('read'):
+            item = next(documents, None)
+        if item is None:
+            break
+        chapter_idx += 1
+        content = item.get_content()
+        with timer.stage('parse', items=1, bytes_read=len(content)):
+            text, chapter_title = extract_chapter(content, parser_engine, with_title=gpt_optimized)
+        if not text:
+            continue
+        
+        if not gpt_optimized:
+            # 기존 형식: 챕터 텍스트 전체
+            yield text
+            continue
+        
+        # 챕터의 청크들은 챕터 원문 하나를 공유 (청크 분할 시간만 재도록 챕터 단위로 만든 뒤 반환)
+        chapter = Chapter(chapter_idx, chapter_title, text)
+        with timer.stage('chunk'):
+            # 토큰 단위: 챕터마다 토큰 수를 묶어서 계산
+            if token_counter is not None:
+                chunks = [Chunk(chapter, i+1, pieces, token_count) for i, (pieces, token_count)
+                          in enumerate(token_chunk_spans(text, chunk_size, token_counter.count_batch))]
+            # GPT 최적화 형식: 청크로 분할하고 인덱스 부여
+            else:
+                chunks = [Chunk(chapter, i+1, pieces) for i, pieces in enumerate(iter_chunk_spans(text, chunk_size))]
+        timer.add('chunk', items=len(chunks))
+        yield from chunks
+
+def epub_to_json_stream(epub_path, chunk_size=1000, include_toc=True, advanced_metadata=True, gpt_optimized=True,
+                        epub_reader=DEFAULT_EPUB_READER, parser_engine=DEFAULT_PARSER_ENGINE,
+                        chunk_unit=DEFAULT_CHUNK_UNIT, tokenizer=None, timer=NULL_TIMER):
+    """
+    epub_to_json과 같은 구조를 반환하지만 본문(body)은 iter_epub_records 제너레이터입니다.
+    개수('total_chunks'/'total_chapters')는 아직 알 수 없으므로 None이며,
+    save_json_file이 기록한 요소 수로 채웁니다.
+    epub_reader가 "ebooklib"이면 zip 리더 대신 ebooklib으로 전체를 읽습니다.
+    parser_engine은 챕터 파싱 엔진입니다 (parser_engines.PARSER_ENGINES).
+    chunk_unit이 "tokens"면 chunk_size를 토큰 수로 보고, tokenizer 파일(vocab.txt, tokenizer.json)이 없으면
+    토큰 수를 추정합니다.
+    timer(StageTimer)에는 open(OPF/목차 읽기) 단계와 iter_epub_records의 단계를 기록합니다.
+    """
+    token_counter = None
+    if gpt_optimized and chunk_unit == "tokens":
+        token_counter, error = load_token_counter(tokenizer)
+        if error:
+            return None, error
+    
     try:
-        book = epub.read_epub(epub_path)
+        with timer.stage('open', bytes_read=os.path.getsize(epub_path)):
+            book, documents = open_epub(epub_path, epub_reader)
     except Exception as e:
         return None, f"EPUB 파일을 읽는 중 오류 발생: {str(e)}"
     
-    book_data = {}
-    
     # 기본 메타데이터 추출
     title = book.get_metadata('DC', 'title')
     creator = book.get_metadata('DC', 'creator')
     language = book.get_metadata('DC', 'language')
     identifier = book.get_metadata('DC', 'identifier')
     
-    book_data['metadata'] = {
+    metadata = {
         'title': title[0][0] if title else 'Unknown',
         'creator': creator[0][0] if creator else 'Unknown',
         'language': language[0][0] if language else 'Unknown',
@@ -33,15 +95,21 @@ def epub_to_json(epub_path, chunk_size=1000, include_toc=True, advanced_metadata
     
     # 확장 메타데이터 추가
     if advanced_metadata:
-        book_data['metadata'].update({
+        metadata.update({
             'file_path': epub_path,
             'file_name': os.path.basename(epub_path),
             'file_size': os.path.getsize(epub_path),
             'processed_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            'converter_version': "2.1.0"
+            'converter_version': CONVERTER_VERSION
+        })
+    if token_counter is not None:
+        metadata.update({
+            'chunk_unit': 'tokens',
+            'tokenizer': token_counter.name
         })
     
     # 목차 추출
+    head = {}
     if include_toc:
         try:
             toc = []
@@ -51,73 +119,38 @@ def epub_to_json(epub_path, chunk_size=1000, include_toc=True, advanced_metadata
                     toc.append({'title': title, 'href': href})
                 elif hasattr(item, 'title') and hasattr(item, 'href'):
                     toc.append({'title': item.title, 'href': item.href})
-            book_data['toc'] = toc
+            head['toc'] = toc
         except Exception as e:
-            book_data['toc_error'] = str(e)
-            book_data['toc'] = []
+            head['toc_error'] = str(e)
+            head['toc'] = []
     
-    # 각 문서(챕터) 추출 및 텍스트만 추출
-    if gpt_optimized:
-        # GPT 최적화 형식: 청크로 분할하고 인덱스 부여
-        chunks = []
-        chapter_idx = 0
-        
-        for item in book.get_items():
-            if item.get_type() == ITEM_DOCUMENT:
-                chapter_idx += 1
-                content = item.get_content().decode('utf-8', errors='replace')  # 명시적 디코딩 추가
-                soup = BeautifulSoup(content, 'html.parser')
-                
-                # 챕터 제목 추출 시도
-                chapter_title = "Unknown"
-                try:
-                    if soup.title and soup.title.string:
-                        chapter_title = soup.title.string.strip()
-                    else:
-                        h_tags = soup.find(['h1', 'h2', 'h3', 'h4'])
-                        if h_tags and h_tags.text:
-                            chapter_title = h_tags.text.strip()
-                except:
-                    pass
-                
-                text = soup.get_text().strip()
-                if not text:
-                    continue
-                
-                # 텍스트를 청크로 분할
-                text_chunks = split_text_into_chunks(text, chunk_size)
-                
-                for i, chunk in enumerate(text_chunks):
-                    chunks.append({
-                        'id': f"ch{chapter_idx}_{i+1}",
-                        'chapter_index': chapter_idx,
-                        'chunk_index': i+1,
-                        'chapter_title': chapter_title,
-                        'content': chunk,
-                        'char_count': len(chunk)
-                    })
-        
-        book_data['chunks'] = chunks
-        book_data['total_chunks'] = len(chunks)
+    # 각 문서(챕터)는 소비하는 쪽에서 필요할 때 하나씩 추출
+    records = iter_epub_records(documents, chunk_size, gpt_optimized, parser_engine, token_counter, timer)
+    body_key = 'chunks' if gpt_optimized else 'chapters'
+    tail = {
+        f'total_{body_key}': None,
+        # GPT 지식 파일에 활용 가능하도록 정보 추가
+        'gpt_knowledge': True,
+        'format_version': "2.0" if gpt_optimized else "1.0",
+        'chunked': gpt_optimized,
+        'book_converter': "Lexi Convert by El Fenomeno"
+    }
     
-    else:
-        # 기존 형식: 챕터 텍스트 전체 저장
-        chapters = []
-        for item in book.get_items():
-            if item.get_type() == ITEM_DOCUMENT:
-                content = item.get_content().decode('utf-8', errors='replace')  # 명시적 디코딩 추가
-                soup = BeautifulSoup(content, 'html.parser')
-                text = soup.get_text().strip()
-                if text:
-                    chapters.append(text)
-        
-        book_data['chapters'] = chapters
-        book_data['total_chapters'] = len(chapters)
+    return Document(metadata, body_key, records, head, tail), None
+
+def epub_to_json(epub_path, chunk_size=1000, include_toc=True, advanced_metadata=True, gpt_optimized=True,
+                 epub_reader=DEFAULT_EPUB_READER, parser_engine=DEFAULT_PARSER_ENGINE,
+                 chunk_unit=DEFAULT_CHUNK_UNIT, tokenizer=None, timer=NULL_TIMER):
+    """
+    EPUB 파일을 읽어 메타데이터와 본문(챕터) 텍스트를 추출하여
+    Document(document_model)로 반환합니다.
+    """
+    document, error = epub_to_json_stream(epub_path, chunk_size, include_toc, advanced_metadata, gpt_optimized,
+                                          epub_reader, parser_engine, chunk_unit, tokenizer, timer)
+    if error:
+        return None, error
     
-    # GPT 지식 파일에 활용 가능하도록 정보 추가
-    book_data['gpt_knowledge'] = True
-    book_data['format_version'] = "2.0" if gpt_optimized else "1.0"
-    book_data['chunked'] = gpt_optimized
-    book_data['book_converter'] = "Lexi Convert by El Fenomeno"
+    document.body = list(document.body)
+    document.tail[f'total_{document.body_key}'] = len(document.body)
     
-    return book_data, None
+    return document, None
@@ -0,0 +1,134 @@
+# converters/epub_reader.py
+import zipfile
+import posixpath as zip_path
+from urllib.parse import unquote
+
+from ebooklib import epub, ITEM_DOCUMENT
+
+from converters.defaults import EPUB_READERS, DEFAULT_EPUB_READER
+
+
+class LazyEpubReader(epub.EpubReader):
+    """
+    zipfile 위에서 동작하는 가벼운 EPUB 리더.
+    메타데이터와 목차(OPF/NCX/nav) 해석은 ebooklib의 EpubReader를 그대로 사용하지만,
+    매니페스트의 다른 항목은 내용을 읽지 않고 본문 XHTML만 iter_documents에서 하나씩 읽습니다.
+    이미지/폰트/CSS는 읽지 않으므로 삽화가 많은 EPUB도 본문 크기만큼의 메모리로 처리합니다.
+    """
+
+    def __init__(self, epub_file_name, options=None):
+        super().__init__(epub_file_name, options)
+        self._content_paths = {}
+
+    def load(self):
+        """컨테이너와 OPF를 읽고 EpubBook을 반환합니다. zip 파일은 close() 전까지 열어 둡니다."""
+        try:
+            self.zf = zipfile.ZipFile(self.file_name, "r", compression=zipfile.ZIP_DEFLATED, allowZip64=True)
+        except zipfile.BadZipfile:
+            raise epub.EpubException(0, "Bad Zip file")
+        except zipfile.LargeZipFile:
+            raise epub.EpubException(1, "Large Zip file")
+
+        try:
+            self._load_container()
+            self._load_opf_file()
+        except Exception:
+            self.close()
+            raise
+        return self.book
+
+    def _load_manifest(self):
+        """ebooklib과 같은 항목 객체를 만들되, nav 외에는 내용을 읽지 않고 경로만 기억합니다."""
+        for r in self.container.find("{%s}%s" % (epub.NAMESPACES["OPF"], "manifest")):
+            if r is not None and r.tag != "{%s}item" % epub.NAMESPACES["OPF"]:
+                continue
+
+            media_type = r.get("media-type")
+            _properties = r.get("properties", "")
+            properties = _properties.split(" ") if _properties else []
+            href = unquote(r.get("href"))
+
+            # 잘못된 콘텐츠 타입 보정 (ebooklib과 동일)
+            if media_type == "image/jpg":
+                media_type = "image/jpeg"
+
+            if media_type == "application/x-dtbncx+xml":
+                ei = epub.EpubNcx(uid=r.get("id"), file_name=href)
+            elif media_type == "application/smil+xml":
+                ei = epub.EpubSMIL(uid=r.get("id"), file_name=href)
+            elif media_type == "application/xhtml+xml":
+                if "nav" in properties:
+                    ei = epub.EpubNav(uid=r.get("id"), file_name=href)
+                    # 목차 해석에 필요하므로 nav 문서만 바로 읽음
+                    ei.content = self.read_file(zip_path.join(self.opf_dir, r.get("href")))
+                elif "cover" in properties:
+                    # 표지 문서는 ebooklib 템플릿으로 만들어지므로 내용이 필요 없음
+                    ei = epub.EpubCoverHtml()
+                else:
+                    ei = epub.EpubHtml()
+                    ei.id = r.get("id")
+                    ei.file_name = href
+                    ei.media_type = media_type
+                    ei.media_overlay = r.get("media-overlay", None)
+                    ei.media_duration = r.get("duration", None)
+                    ei.properties = properties
+                    self._content_paths[id(ei)] = zip_path.join(self.opf_dir, ei.get_name())
+            elif media_type in epub.IMAGE_MEDIA_TYPES:
+                if "cover-image" in properties:
+                    ei = epub.EpubCover(uid=r.get("id"), file_name=href)
+                else:
+                    ei = epub.EpubImage()
+                    ei.id = r.get("id")
+                    ei.file_name = href
+                ei.media_type = media_type
+            else:
+                ei = epub.EpubItem()
+                ei.id = r.get("id")
+                ei.file_name = href
+                ei.media_type = media_type
+
+            # ebooklib처럼 매니페스트에 있는 파일이 없으면 오류 (KeyError)
+            self.zf.getinfo(zip_path.normpath(zip_path.join(self.opf_dir, href)))
+            self.book.add_item(ei)
+
+    def iter_documents(self):
+        """
+        본문 문서(ITEM_DOCUMENT)를 매니페스트 순서대로 하나씩 읽어 반환하는 제너레이터.
+        다음 문서로 넘어가면 이전 문서의 내용은 메모리에서 해제하고, 끝나면 zip 파일을 닫습니다.
+        """
+        try:
+            for item in self.book.get_items():
+                if item.get_type() != ITEM_DOCUMENT:
+                    continue
+                path = self._content_paths.get(id(item))
+                if path is not None:
+                    item.content = self.read_file(path)
+                yield item
+                if path is not None:
+                    item.content = b""
+        finally:
+            self.close()
+
+    def close(self):
+        """열려 있는 zip 파일을 닫습니다."""
+        if self.zf is not None:
+            self.zf.close()
+            self.zf = None
+
+
+def open_epub(epub_path, reader=DEFAULT_EPUB_READER):
+    """
+    EPUB 파일을 열어 (EpubBook, 본문 문서 이터레이터)를 반환합니다.
+    reader가 "zip"이면 LazyEpubReader를 쓰고, 읽을 수 없는 구조면 ebooklib으로 다시 읽습니다.
+    """
+    if reader == "zip":
+        lazy_reader = LazyEpubReader(epub_path)
+        try:
+            book = lazy_reader.load()
+            return book, lazy_reader.iter_documents()
+        except Exception:
+            # zip 리더로 읽지 못하면 ebooklib으로 다시 시도
+            pass
+
+    book = epub.read_epub(epub_path)
+    return book, book.get_items_of_type(ITEM_DOCUMENT)
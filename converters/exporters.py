@@ -1,177 +1,285 @@
 # converters/exporters.py
 import os
-import json
-from utils.json_encoder import CustomJSONEncoder
+from datetime import datetime
+from utils.json_stream import JsonStreamWriter
+from converters.document_model import Section, Paragraph, Chunk
 
-def convert_to_markdown(json_data, output_path):
-    """JSON 데이터를 마크다운 형식으로 변환합니다."""
+def _write_markdown_header(md_file, metadata, toc=None):
+    """마크다운 제목, 메타데이터, 목차를 기록하고 파일 유형을 반환합니다."""
+    # 제목 및 메타데이터
+    md_file.write(f"# {metadata['title']}\n\n")
+
+    # 작가 정보
+    if 'creator' in metadata and metadata['creator']:
+        md_file.write(f"**작가**: {metadata['creator']}\n\n")
+
+    # 파일 유형
+    file_type = metadata.get('file_type', '')
+    if file_type:
+        md_file.write(f"**파일 유형**: {file_type}\n\n")
+
+    md_file.write("---\n\n")
+
+    # 목차가 있으면 목차 추가 (EPUB 전용)
+    if toc:
+        md_file.write("## 목차\n\n")
+        for item in toc:
+            md_file.write(f"- {item['title']}\n")
+        md_file.write("\n---\n\n")
+
+    return file_type
+
+def _write_markdown_chunk(md_file, chunk, state):
+    """청크 하나를 기록합니다. EPUB 문서면 챕터가 바뀔 때 챕터 제목을 먼저 기록합니다."""
+    if state.get('file_type') == 'EPUB' and chunk.chapter.index != state.get('current_chapter', 0):
+        state['current_chapter'] = chunk.chapter.index
+        md_file.write(f"## {chunk.chapter.title}\n\n")
+    md_file.write(f"{chunk.content}\n\n")
+    md_file.write("---\n\n")
+
+def _write_markdown_chapter(md_file, chapter, state):
+    """챕터 텍스트 하나를 기록합니다. 챕터 번호는 state에서 이어 셉니다."""
+    state['chapter_number'] = state.get('chapter_number', 0) + 1
+    md_file.write(f"## 챕터 {state['chapter_number']}\n\n")
+    md_file.write(f"{chapter}\n\n")
+    md_file.write("---\n\n")
+
+def _write_markdown_section(md_file, section, state):
+    """h2 섹션 하나와 하위 섹션의 단락/표를 기록합니다."""
+    md_file.write(f"## {section.title}\n\n")
+    for sub in section.subsections:
+        md_file.write(f"### {sub.title}\n\n")
+        for content_item in sub.content:
+            if isinstance(content_item, Paragraph):
+                md_file.write(f"{content_item.text}\n\n")
+            elif content_item.data:
+                # 테이블 데이터를 마크다운 테이블 형식으로 변환
+                headers = content_item.data[0].keys()
+                md_file.write(f"| {' | '.join(headers)} |\n")
+                md_file.write(f"|{'---|' * len(headers)}\n")
+                for row in content_item.data:
+                    md_file.write(f"| {' | '.join(str(v) for v in row.values())} |\n")
+                    md_file.write("\n")
+                    md_file.write("---\n\n")
+
+# 본문 노드 종류별 마크다운 기록 함수
+_MARKDOWN_WRITERS = {
+    Chunk: _write_markdown_chunk,
+    str: _write_markdown_chapter,
+    Section: _write_markdown_section,
+}
+
+def _write_markdown_body(md_file, nodes, state):
+    """
+    본문 노드(청크, 챕터 텍스트, 섹션)를 순서대로 한 번 순회하며 기록합니다.
+    state에 파일 유형과 현재 챕터를 보관하므로 여러 번 나누어 호출해도 결과가 같습니다.
+    """
+    for node in nodes:
+        _MARKDOWN_WRITERS[type(node)](md_file, node, state)
+
+def _write_text_header(txt_file, metadata):
+    """텍스트 제목과 메타데이터를 기록하고 파일 유형을 반환합니다."""
+    txt_file.write(f"{metadata['title']}\n")
+
+    # 작가 정보
+    if 'creator' in metadata and metadata['creator']:
+        txt_file.write(f"작가: {metadata['creator']}\n")
+
+    # 파일 유형
+    file_type = metadata.get('file_type', '')
+    if file_type:
+        txt_file.write(f"파일 유형: {file_type}\n")
+
+    txt_file.write("="*50 + "\n\n")
+    return file_type
+
+def _write_text_chunk(txt_file, chunk, state):
+    """청크 하나를 텍스트로 기록합니다. state는 _write_markdown_chunk와 같습니다."""
+    if state.get('file_type') == 'EPUB' and chunk.chapter.index != state.get('current_chapter', 0):
+        state['current_chapter'] = chunk.chapter.index
+        txt_file.write(f"=== {chunk.chapter.title} ===\n\n")
+    txt_file.write(f"{chunk.content}\n\n")
+    txt_file.write("-"*50 + "\n\n")
+
+def _write_text_chapter(txt_file, chapter, state):
+    """챕터 텍스트 하나를 텍스트로 기록합니다."""
+    state['chapter_number'] = state.get('chapter_number', 0) + 1
+    txt_file.write(f"=== 챕터 {state['chapter_number']} ===\n\n")
+    txt_file.write(f"{chapter}\n\n")
+    txt_file.write("-"*50 + "\n\n")
+
+def _write_text_section(txt_file, section, state):
+    """h2 섹션 하나와 하위 섹션의 단락/표를 텍스트로 기록합니다."""
+    txt_file.write(f"=== {section.title} ===\n\n")
+    for sub in section.subsections:
+        txt_file.write(f"--- {sub.title} ---\n\n")
+        for content_item in sub.content:
+            if isinstance(content_item, Paragraph):
+                txt_file.write(f"{content_item.text}\n\n")
+            elif content_item.data:
+                # 테이블 데이터를 텍스트로 변환
+                for row in content_item.data:
+                    row_text = ', '.join(f"{k}: {v}" for k, v in row.items())
+                    txt_file.write(f"- {row_text}\n")
+                    txt_file.write("\n")
+                    txt_file.write("="*50 + "\n\n")
+
+# 본문 노드 종류별 텍스트 기록 함수
+_TEXT_WRITERS = {
+    Chunk: _write_text_chunk,
+    str: _write_text_chapter,
+    Section: _write_text_section,
+}
+
+def _write_text_body(txt_file, nodes, state):
+    """본문 노드를 순서대로 한 번 순회하며 텍스트로 기록합니다."""
+    for node in nodes:
+        _TEXT_WRITERS[type(node)](txt_file, node, state)
+
+def convert_to_markdown(document, output_path):
+    """문서(Document)를 마크다운 형식으로 변환합니다."""
     try:
         with open(output_path, 'w', encoding='utf-8') as md_file:
-            # 제목 및 메타데이터
-            md_file.write(f"# {json_data['metadata']['title']}\n\n")
-            
-            # 작가 정보
-            if 'creator' in json_data['metadata'] and json_data['metadata']['creator']:
-                md_file.write(f"**작가**: {json_data['metadata']['creator']}\n\n")
-            
-            # 파일 유형
-            file_type = json_data['metadata'].get('file_type', '')
-            if file_type:
-                md_file.write(f"**파일 유형**: {file_type}\n\n")
-            
-            md_file.write("---\n\n")
-            
-            # 목차가 있으면 목차 추가 (EPUB 전용)
-            if 'toc' in json_data and json_data['toc']:
-                md_file.write("## 목차\n\n")
-                for item in json_data['toc']:
-                    md_file.write(f"- {item['title']}\n")
-                md_file.write("\n---\n\n")
-            
-            # 청크 또는 챕터/페이지 내용 출력
-            if 'chunks' in json_data:
-                # EPUB 처리 - 챕터별 구성
-                if file_type == 'EPUB':
-                    current_chapter = 0
-                    for chunk in json_data['chunks']:
-                        if 'chapter_index' in chunk and chunk['chapter_index'] != current_chapter:
-                            current_chapter = chunk['chapter_index']
-                            md_file.write(f"## {chunk.get('chapter_title', f'챕터 {current_chapter}')}\n\n")
-                        md_file.write(f"{chunk['content']}\n\n")
-                        md_file.write("---\n\n")
-                # PDF 처리 - 페이지별 구성
-                else:
-                    current_page = 0
-                    for chunk in json_data['chunks']:
-                        if 'page_number' in chunk and chunk['page_number'] != current_page:
-                            current_page = chunk['page_number']
-                            md_file.write(f"## 페이지 {current_page}\n\n")
-                        md_file.write(f"{chunk['content']}\n\n")
-                        md_file.write("---\n\n")
-            
-            # 챕터 형식 (EPUB 용)
-            elif 'chapters' in json_data:
-                for i, chapter in enumerate(json_data['chapters'], 1):
-                    md_file.write(f"## 챕터 {i}\n\n")
-                    md_file.write(f"{chapter}\n\n")
-                    md_file.write("---\n\n")
-            
-            # 페이지 형식 (PDF 용)
-            elif 'pages' in json_data:
-                for page in json_data['pages']:
-                    page_num = page.get('page_number', 0)
-                    md_file.write(f"## 페이지 {page_num}\n\n")
-                    md_file.write(f"{page['content']}\n\n")
-                    md_file.write("---\n\n")
+            # 제목, 메타데이터, 목차
+            file_type = _write_markdown_header(md_file, document.metadata, document.toc)
+
+            # 청크, 챕터 또는 섹션 내용 출력
+            _write_markdown_body(md_file, document.body, {'file_type': file_type})
 
-            # ✅ [추가] HTML의 'sections' 형식 처리
-            elif 'sections' in json_data:
-                for section in json_data['sections']:
-                    md_file.write(f"## {section.get('title', '제목 없음')}\n\n")
-                    if 'subsections' in section:
-                        for sub in section['subsections']:
-                            md_file.write(f"### {sub.get('subtitle', '')}\n\n")
-                            for content_item in sub.get('content', []):
-                                if content_item.get('type') == 'paragraph':
-                                    md_file.write(f"{content_item.get('text', '')}\n\n")
-                                elif content_item.get('type') == 'table':
-                                    # 테이블 데이터를 마크다운 테이블 형식으로 변환
-                                    if content_item.get('data'):
-                                        headers = content_item['data'][0].keys()
-                                        md_file.write(f"| {' | '.join(headers)} |\n")
-                                        md_file.write(f"|{'---|' * len(headers)}\n")
-                                        for row in content_item['data']:
-                                            md_file.write(f"| {' | '.join(str(v) for v in row.values())} |\n")
-                                            md_file.write("\n")
-                                            md_file.write("---\n\n")
-        
         return True, None
     except Exception as e:
         return False, str(e)
 
-def convert_to_text(json_data, output_path):
-    """JSON 데이터를 일반 텍스트 형식으로 변환합니다."""
+def convert_to_text(document, output_path):
+    """문서(Document)를 일반 텍스트 형식으로 변환합니다."""
     try:
         with open(output_path, 'w', encoding='utf-8') as txt_file:
             # 제목 및 메타데이터
-            txt_file.write(f"{json_data['metadata']['title']}\n")
-            
-            # 작가 정보
-            if 'creator' in json_data['metadata'] and json_data['metadata']['creator']:
-                txt_file.write(f"작가: {json_data['metadata']['creator']}\n")
-            
-            # 파일 유형
-            file_type = json_data['metadata'].get('file_type', '')
-            if file_type:
-                txt_file.write(f"파일 유형: {file_type}\n")
-            
-            txt_file.write("="*50 + "\n\n")
-            
-            # 청크 또는 챕터/페이지 내용 출력
-            if 'chunks' in json_data:
-                # EPUB 처리
-                if file_type == 'EPUB':
-                    current_chapter = 0
-                    for chunk in json_data['chunks']:
-                        if 'chapter_index' in chunk and chunk['chapter_index'] != current_chapter:
-                            current_chapter = chunk['chapter_index']
-                            txt_file.write(f"=== {chunk.get('chapter_title', f'챕터 {current_chapter}')} ===\n\n")
-                        txt_file.write(f"{chunk['content']}\n\n")
-                        txt_file.write("-"*50 + "\n\n")
-                # PDF 처리
-                else:
-                    current_page = 0
-                    for chunk in json_data['chunks']:
-                        if 'page_number' in chunk and chunk['page_number'] != current_page:
-                            current_page = chunk['page_number']
-                            txt_file.write(f"=== 페이지 {current_page} ===\n\n")
-                        txt_file.write(f"{chunk['content']}\n\n")
-                        txt_file.write("-"*50 + "\n\n")
-            
-            # 챕터 형식 (EPUB 용)
-            elif 'chapters' in json_data:
-                for i, chapter in enumerate(json_data['chapters'], 1):
-                    txt_file.write(f"=== 챕터 {i} ===\n\n")
-                    txt_file.write(f"{chapter}\n\n")
-                    txt_file.write("-"*50 + "\n\n")
-            
-            # 페이지 형식 (PDF 용)
-            elif 'pages' in json_data:
-                for page in json_data['pages']:
-                    page_num = page.get('page_number', 0)
-                    txt_file.write(f"=== 페이지 {page_num} ===\n\n")
-                    txt_file.write(f"{page['content']}\n\n")
-                    txt_file.write("-"*50 + "\n\n")
-
-            # ✅ [추가] HTML의 'sections' 형식 처리
-            elif 'sections' in json_data:
-                for section in json_data['sections']:
-                    txt_file.write(f"=== {section.get('title', '제목 없음')} ===\n\n")
-                    if 'subsections' in section:
-                        for sub in section['subsections']:
-                            txt_file.write(f"--- {sub.get('subtitle', '')} ---\n\n")
-                            for content_item in sub.get('content', []):
-                                if content_item.get('type') == 'paragraph':
-                                    txt_file.write(f"{content_item.get('text', '')}\n\n")
-                                elif content_item.get('type') == 'table':
-                                    # 테이블 데이터를 텍스트로 변환
-                                    if content_item.get('data'):
-                                        for row in content_item['data']:
-                                            row_text = ', '.join(f"{k}: {v}" for k, v in row.items())
-                                            txt_file.write(f"- {row_text}\n")
-                                            txt_file.write("\n")
-                                            txt_file.write("="*50 + "\n\n")
-        
+            file_type = _write_text_header(txt_file, document.metadata)
+
+            # 청크, 챕터 또는 섹션 내용 출력
+            _write_text_body(txt_file, document.body, {'file_type': file_type})
+
         return True, None
     except Exception as e:
         return False, str(e)
 
-def save_json_file(json_data, output_path):
-    """JSON 데이터를 파일로 저장합니다."""
+def save_json_file(document, output_path, compact=False):
+    """
+    문서(Document)를 JSON 파일로 저장합니다.
+    본문 배열은 노드 단위로 기록하므로 리스트 대신 이터레이터여도 됩니다.
+    이때 값이 None인 'total_<키>' 항목은 기록한 노드 수로 채웁니다.
+    compact=True면 들여쓰기 없이 저장합니다.
+    """
     try:
         with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(json_data, f, indent=4, ensure_ascii=False, cls=CustomJSONEncoder)
-        
+            writer = JsonStreamWriter(f, compact=compact)
+            counts = {}
+            for key, value in document.fields():
+                if key == document.body_key:
+                    counts[f"total_{key}"] = writer.write_array(key, value)
+                elif value is None and key in counts:
+                    writer.write_item(key, counts[key])
+                else:
+                    writer.write_item(key, value)
+            writer.close()
+
         return True, None
     except Exception as e:
         return False, str(e)
+
+class MergedOutputWriter:
+    """
+    여러 문서를 하나의 출력 파일로 병합하면서 각 문서의 청크/챕터를 바로 파일에 기록합니다.
+    병합 데이터 전체를 메모리에 모으지 않으므로 최대 메모리 사용량은 문서 하나 정도입니다.
+    청크 수와 병합 파일 목록은 마지막에 기록됩니다.
+    """
+
+    def __init__(self, output_path, output_format, total_files, gpt_optimized, compact=False):
+        self.output_path = output_path
+        self.output_format = output_format
+        self.gpt_optimized = gpt_optimized
+        self.list_key = 'chunks' if gpt_optimized else 'chapters'
+        self.metadata = {
+            'title': f"병합된 문서 파일 ({total_files}개)",
+            'creator': "Document to JSON Converter",
+            'merged_count': total_files,
+            'processed_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+        self.item_count = 0
+        self.merged_files = []
+        self.state = {}
+        self._file = open(output_path, 'w', encoding='utf-8')
+
+        if output_format == "json":
+            self._json = JsonStreamWriter(self._file, compact=compact)
+            self._json.write_item('metadata', self.metadata)
+            self._json.begin_array(self.list_key)
+        elif output_format == "markdown":
+            self.state['file_type'] = _write_markdown_header(self._file, self.metadata)
+        else:
+            self.state['file_type'] = _write_text_header(self._file, self.metadata)
+
+    def add_document(self, document, doc_file):
+        """변환된 문서(Document) 하나의 청크/챕터를 병합 출력에 기록합니다."""
+        file_ext = os.path.splitext(doc_file)[1].lower()
+        file_type = "EPUB" if file_ext == ".epub" else "PDF"
+        base_name = os.path.splitext(os.path.basename(doc_file))[0]
+
+        if document.body_key == self.list_key:
+            # 청크 ID는 병합 출력 전체 기준으로 다시 매김 (파일 타입에 따라 ID 형식 다름)
+            prefix = "ch" if file_type == "EPUB" else "pg"
+            for node in document.body:
+                self._write_node(node, f"{prefix}{self.item_count + 1}", base_name)
+
+        # 병합된 파일 목록에 추가
+        self.merged_files.append({
+            'file_name': os.path.basename(doc_file),
+            'file_type': file_type,
+            'title': document.metadata.get('title'),
+            'creator': document.metadata.get('creator')
+        })
+
+    def _write_node(self, node, chunk_id, source_file):
+        """청크 또는 챕터(str) 하나를 출력 포맷에 맞게 기록합니다."""
+        if self.output_format == "json":
+            if isinstance(node, Chunk):
+                node = node.to_dict()
+                node['id'] = chunk_id
+                # 파일 소스 정보 추가
+                node['source_file'] = source_file
+            self._json.add_element(node)
+        elif self.output_format == "markdown":
+            _MARKDOWN_WRITERS[type(node)](self._file, node, self.state)
+        else:
+            _TEXT_WRITERS[type(node)](self._file, node, self.state)
+        self.item_count += 1
+
+    def close(self):
+        """남은 요약 정보를 기록하고 파일을 닫습니다."""
+        try:
+            if self.output_format == "json":
+                self._json.end_array()
+                summary = [
+                    (f"total_{self.list_key}", self.item_count),
+                    ('merged_files', self.merged_files),
+                    ('gpt_knowledge', True),
+                    ('format_version', "2.0" if self.gpt_optimized else "1.0"),
+                    ('chunked', self.gpt_optimized),
+                ]
+                for key, value in summary:
+                    self._json.write_item(key, value)
+                self._json.close()
+            self._file.close()
+            return True, None
+        except Exception as e:
+            self._file.close()
+            return False, str(e)
+
+    def abort(self):
+        """병합을 중단하고 작성 중이던 출력 파일을 삭제합니다."""
+        self._file.close()
+        try:
+            os.remove(self.output_path)
+        except OSError:
+            pass
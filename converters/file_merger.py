@@ -1,33 +1,248 @@
 # converters/file_merger.py
+import io
 import os
-import glob
 import json
+import time
+import codecs
+import threading
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from utils.json_encoder import CustomJSONEncoder
+from utils.file_discovery import find_files, default_discovery_workers
+from utils.file_utils import copy_file_data
 
-def merge_text_files(directory_path, output_path, file_pattern="*.txt", include_filename=True, include_folder_structure=True, recursive=True):
-    """텍스트 파일들을 병합합니다. recursive=True이면 하위 폴더까지 탐색합니다."""
+# 바이너리 판별에 읽는 파일 앞부분 크기 (이 안에 NUL 바이트가 있으면 바이너리로 보고 건너뜀)
+BINARY_SNIFF_SIZE = 8000
+# 인코딩 검사/변환 시 한 번에 디코딩할 크기
+DECODE_CHUNK_SIZE = 1024 * 1024
+# 미리 읽기(read-ahead)로 메모리에 올려 둘 수 있는 파일 내용의 합 (MB)
+DEFAULT_READ_AHEAD_MB = 64
+
+# 병합 출력은 운영체제와 관계없이 newline='\n'으로 열어 헤더와 구분선을 모두 '\n'으로 쓰고,
+# 파일 내용의 줄바꿈은 바이트 복사/인코딩 변환 경로 모두 원본 그대로 둡니다 (두 경로의 결과가 같도록).
+
+# 미리 읽기 결과: 바이너리 파일 / 한도보다 커서 쓰는 쪽이 직접 복사할 파일
+_BINARY = object()
+_DIRECT = object()
+
+def _codec_name(encoding):
+    """인코딩 이름을 정규화합니다 (None이면 UTF-8)."""
+    return codecs.lookup(encoding or 'utf-8').name
+
+def _is_binary(prefix, codec):
+    """파일 앞부분에 NUL 바이트가 있으면 바이너리로 봅니다 (UTF-16/32 텍스트에는 NUL 바이트가 정상적으로 들어 있음)."""
+    return b'\0' in prefix and not codec.startswith(('utf-16', 'utf-32'))
+
+def _check_decodable(infile, encoding):
+    """infile 전체가 encoding으로 디코딩되는지 조각 단위로 확인합니다. 실패하면 UnicodeDecodeError가 발생합니다."""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    infile.seek(0)
+    while True:
+        block = infile.read(DECODE_CHUNK_SIZE)
+        decoder.decode(block, final=not block)
+        if not block:
+            return
+
+def _finish_file(outfile, ends_with_newline):
+    """파일 간 구분을 위한 빈 줄을 추가합니다."""
+    if not ends_with_newline:
+        outfile.write('\n')
+    outfile.write('\n')
+
+def _append_data(outfile, data, codec, validate):
+    """미리 읽은 파일 내용(bytes)을 _append_file과 같은 규칙으로 병합 출력에 씁니다."""
+    if codec != 'utf-8':
+        text = data.decode(codec)
+        outfile.write(text)
+        _finish_file(outfile, text.endswith('\n'))
+        return
+    if validate:
+        data.decode(codec)
+    outfile.flush()
+    outfile.buffer.write(data)
+    _finish_file(outfile, data.endswith(b'\n'))
+
+def _append_file(outfile, file_path, encoding=None, validate=False, prefetched=None):
+    """
+    파일 하나의 내용을 병합 출력에 이어 쓰고 파일 간 구분을 위한 빈 줄을 추가합니다.
+    원본이 UTF-8이면 디코딩하지 않고 바이트를 그대로 복사합니다. 줄바꿈 문자는 어느 경우든 원본 그대로 둡니다.
+    validate=True면 먼저 끝까지 디코딩되는지 확인하고, encoding이 UTF-8이 아니면 UTF-8로 변환해 씁니다.
+    앞부분에 NUL 바이트가 있는 바이너리 파일은 끝까지 읽지 않고 건너뛰며, 이때 False를 반환합니다.
+    prefetched는 _iter_read_ahead가 준 미리 읽기 결과(Future)입니다.
+    """
+    codec = _codec_name(encoding)
+    if prefetched is not None:
+        data = prefetched.result()
+        if data is _BINARY:
+            outfile.write("[바이너리 파일 건너뜀]\n\n")
+            return False
+        if data is not _DIRECT:
+            _append_data(outfile, data, codec, validate)
+            return True
+
+    transcode = codec != 'utf-8'
+    with open(file_path, 'rb', buffering=0) as infile:
+        prefix = infile.read(BINARY_SNIFF_SIZE)
+        if _is_binary(prefix, codec):
+            outfile.write("[바이너리 파일 건너뜀]\n\n")
+            return False
+
+        if validate or transcode:
+            _check_decodable(infile, codec)
+        infile.seek(0)
+
+        if transcode:
+            reader = io.TextIOWrapper(io.BufferedReader(infile), encoding=codec, newline='')
+            last = ''
+            while True:
+                text = reader.read(DECODE_CHUNK_SIZE)
+                if not text:
+                    break
+                outfile.write(text)
+                last = text
+            ends_with_newline = last.endswith('\n')
+        else:
+            ends_with_newline = False
+            if copy_file_data(infile, outfile):
+                infile.seek(-1, os.SEEK_END)
+                ends_with_newline = infile.read(1) == b'\n'
+
+    _finish_file(outfile, ends_with_newline)
+    return True
+
+class _ReadAheadBudget:
+    """
+    미리 읽어 두고 아직 쓰지 않은 파일 내용의 합을 한도(limit 바이트) 안으로 유지합니다.
+    쓰는 쪽이 지금 기다리는 파일(next_index)은 한도와 관계없이 읽을 수 있으므로 서로 기다리며 멈추지 않으며,
+    메모리 사용량은 한도 + 지금 쓰는 파일 하나로 제한됩니다.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.used = 0
+        self.next_index = 0
+        self.reserved = {}
+        self.stopped = False
+        self.cond = threading.Condition()
+
+    def reserve(self, index, size):
+        """index번째 파일을 size 바이트만큼 읽어도 될 때까지 기다립니다. 중단되면 False를 반환합니다."""
+        with self.cond:
+            while (not self.stopped and index != self.next_index
+                   and self.used + size > self.limit):
+                self.cond.wait()
+            if self.stopped:
+                return False
+            self.used += size
+            self.reserved[index] = size
+            return True
+
+    def release(self, index):
+        """index번째 파일의 예약을 풉니다 (읽기 실패 시 작업 스레드가 호출)."""
+        with self.cond:
+            self.used -= self.reserved.pop(index, 0)
+            self.cond.notify_all()
+
+    def written(self, index):
+        """쓰는 쪽이 index번째 파일을 다 쓴 뒤 호출합니다."""
+        with self.cond:
+            self.used -= self.reserved.pop(index, 0)
+            self.next_index = index + 1
+            self.cond.notify_all()
+
+    def stop(self):
+        with self.cond:
+            self.stopped = True
+            self.cond.notify_all()
+
+def _prefetch(file_path, index, budget, codec):
+    """작업 스레드: 파일 내용을 읽어 반환합니다. 바이너리면 _BINARY, 한도보다 크면 _DIRECT를 반환합니다."""
+    with open(file_path, 'rb', buffering=0) as infile:
+        prefix = infile.read(BINARY_SNIFF_SIZE)
+        if _is_binary(prefix, codec):
+            return _BINARY
+        size = os.fstat(infile.fileno()).st_size
+        if size > budget.limit:
+            return _DIRECT
+        if not budget.reserve(index, size):
+            return _DIRECT
+        try:
+            return prefix + infile.readall()
+        except BaseException:
+            budget.release(index)
+            raise
+
+def _iter_read_ahead(files, workers, read_ahead_mb, encoding=None):
+    """
+    (파일 경로, 미리 읽기 결과 Future 또는 None)을 files 순서대로 반환하는 제너레이터.
+    workers가 2 이상이면 스레드 풀이 뒤쪽 파일을 미리 읽어 두므로, 파일을 여는 데 오래 걸리는
+    네트워크 드라이브에서 작은 파일을 많이 병합할 때 빨라집니다. 쓰는 쪽은 호출한 스레드 하나뿐이며,
+    다음 항목을 요청하는 시점에 앞 파일을 다 쓴 것으로 보고 그 메모리 예약을 풉니다.
+    """
+    if workers <= 1:
+        for file_path in files:
+            yield file_path, None
+        return
+
+    budget = _ReadAheadBudget(read_ahead_mb * 1024 * 1024)
+    codec = _codec_name(encoding)
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="merge-read")
+    try:
+        # 작업 큐는 제출 순서대로 처리되므로 쓰는 쪽이 기다리는 파일은 항상 먼저 읽기 시작함
+        futures = [pool.submit(_prefetch, file_path, index, budget, codec)
+                   for index, file_path in enumerate(files)]
+        for index, file_path in enumerate(files):
+            yield file_path, futures[index]
+            budget.written(index)
+            futures[index] = None
+    finally:
+        budget.stop()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def _read_workers(read_workers, path):
+    """미리 읽기 스레드 수. None이면 path가 네트워크 경로일 때만 여러 스레드를 사용합니다."""
+    if read_workers is None:
+        return default_discovery_workers(path)
+    return max(1, read_workers)
+
+def _result_note(skipped, count, elapsed, workers):
+    """결과 메시지 뒤에 붙일 처리 속도와 건너뛴 바이너리 파일 수."""
+    rate = count / elapsed if elapsed > 0 else float(count)
+    note = f" ({elapsed:.2f}초, {rate:,.0f}개/초"
+    if workers > 1:
+        note += f", 미리 읽기 {workers}스레드"
+    note += ")"
+    if skipped:
+        note += f" (바이너리 파일 {skipped}개 건너뜀)"
+    return note
+
+def merge_text_files(directory_path, output_path, file_pattern="*.txt", include_filename=True, include_folder_structure=True, recursive=True,
+                     excludes=None, encoding=None, validate=False, read_workers=None, read_ahead_mb=DEFAULT_READ_AHEAD_MB):
+    """
+    텍스트 파일들을 병합합니다. recursive=True이면 하위 폴더까지 탐색합니다.
+    숨김 파일/폴더(.git 등)와 excludes(.gitignore 형식 제외 규칙)에 맞는 항목은 건너뜁니다.
+    원본 인코딩(encoding, 기본 UTF-8)과 인코딩 검사(validate)는 _append_file을 참고하세요.
+    read_workers는 미리 읽기 스레드 수(None이면 네트워크 경로일 때만 사용), read_ahead_mb는 미리 읽어 둘 내용의 한도입니다.
+    """
     try:
         # 해당 패턴의 모든 파일 찾기 (recursive=True면 하위 폴더까지)
-        files = []
-        if recursive:
-            for root, _, _ in os.walk(directory_path):
-                for file in glob.glob(os.path.join(root, file_pattern)):
-                    files.append(file)
-        else:
-            files = glob.glob(os.path.join(directory_path, file_pattern))
+        files = find_files(directory_path, patterns=[file_pattern], excludes=excludes, recursive=recursive,
+                           include_hidden=False)
         
         if not files:
             return False, f"지정된 경로({directory_path})에서 {file_pattern} 패턴의 파일을 찾을 수 없습니다."
         
         # 출력 파일 열기
-        with open(output_path, 'w', encoding='utf-8') as outfile:
+        with open(output_path, 'w', encoding='utf-8', newline='\n') as outfile:
             # 헤더 추가
             outfile.write(f"# 병합된 파일 ({len(files)}개)\n")
             outfile.write(f"# 생성 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
             
             # 각 파일의 내용 병합
-            for file_path in files:
+            skipped = 0
+            workers = _read_workers(read_workers, directory_path)
+            started = time.perf_counter()
+            for file_path, prefetched in _iter_read_ahead(files, workers, read_ahead_mb, encoding):
                 rel_path = os.path.relpath(file_path, directory_path)
                 file_name = os.path.basename(file_path)
                 folder_path = os.path.dirname(rel_path)
@@ -40,46 +255,30 @@ def merge_text_files(directory_path, output_path, file_pattern="*.txt", include_
                     outfile.write(f"{'=' * 80}\n\n")
                 
                 try:
-                    with open(file_path, 'r', encoding='utf-8') as infile:
-                        content = infile.read()
-                        outfile.write(content)
-                        
-                        # 파일 간 구분을 위한 빈 줄 추가
-                        if not content.endswith('\n'):
-                            outfile.write('\n')
-                        outfile.write('\n')
+                    if not _append_file(outfile, file_path, encoding, validate, prefetched):
+                        skipped += 1
                 except Exception as e:
                     outfile.write(f"[파일 읽기 오류: {str(e)}]\n\n")
         
-        return True, f"{len(files)}개의 파일이 성공적으로 병합되었습니다: {output_path}"
+        note = _result_note(skipped, len(files), time.perf_counter() - started, workers)
+        return True, f"{len(files)}개의 파일이 성공적으로 병합되었습니다: {output_path}{note}"
     
     except Exception as e:
         return False, f"파일 병합 중 오류 발생: {str(e)}"
 
-def merge_code_files(directory_path, output_path, file_extension, include_filename=True, include_folder_structure=True, recursive=True):
-    """코드 파일들(.py, .c, .h 등)을 병합합니다. recursive=True이면 하위 폴더까지 탐색합니다."""
+def merge_code_files(directory_path, output_path, file_extension, include_filename=True, include_folder_structure=True, recursive=True,
+                     excludes=None, encoding=None, validate=False, read_workers=None, read_ahead_mb=DEFAULT_READ_AHEAD_MB):
+    """
+    코드 파일들(.py, .c, .h 등)을 병합합니다. recursive=True이면 하위 폴더까지 탐색합니다.
+    excludes는 .gitignore 형식 제외 규칙 목록이고, encoding/validate/read_workers/read_ahead_mb는 merge_text_files와 같습니다.
+    파일은 항상 경로 이름 순서로 쓰며, 미리 읽기를 사용해도 순서는 같습니다.
+    """
     if not file_extension.startswith('.'):
         file_extension = '.' + file_extension
     
-    # 파일 목록 수집
-    files = []
-    if recursive:
-        for root, dirs, filenames in os.walk(directory_path):
-            # .git과 같은 숨김 폴더 제외
-            dirs[:] = [d for d in dirs if not d.startswith('.')]
-            
-            for filename in filenames:
-                # 정확히 해당 확장자로 끝나는 파일만 추가
-                if filename.endswith(file_extension):
-                    full_path = os.path.join(root, filename)
-                    files.append(full_path)
-    else:
-        # 비재귀적 검색일 경우 현재 폴더만 검색
-        for filename in os.listdir(directory_path):
-            if filename.endswith(file_extension):
-                full_path = os.path.join(directory_path, filename)
-                if os.path.isfile(full_path):
-                    files.append(full_path)
+    # 파일 목록 수집 (.git과 같은 숨김 폴더 제외, 정확히 해당 확장자로 끝나는 파일만)
+    files = find_files(directory_path, patterns=[f"*{file_extension}"], excludes=excludes, recursive=recursive,
+                       include_hidden=False, ignore_case=False)
     
     if not files:
         return False, f"지정된 경로({directory_path})에서 {file_extension} 확장자를 가진 파일을 찾을 수 없습니다."
@@ -88,14 +287,17 @@ def merge_code_files(directory_path, output_path, file_extension, include_filena
     files.sort()
     
     # 출력 파일 열기
-    with open(output_path, 'w', encoding='utf-8') as outfile:
+    with open(output_path, 'w', encoding='utf-8', newline='\n') as outfile:
         # 헤더 추가
         outfile.write(f"# 병합된 파일 ({len(files)}개)\n")
         outfile.write(f"# 생성 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
         outfile.write(f"# 파일 확장자: {file_extension}\n\n")
         
         # 각 파일의 내용 병합
-        for file_path in files:
+        skipped = 0
+        workers = _read_workers(read_workers, directory_path)
+        started = time.perf_counter()
+        for file_path, prefetched in _iter_read_ahead(files, workers, read_ahead_mb, encoding):
             rel_path = os.path.relpath(file_path, directory_path)
             file_name = os.path.basename(file_path)
             folder_path = os.path.dirname(rel_path)
@@ -108,32 +310,25 @@ def merge_code_files(directory_path, output_path, file_extension, include_filena
                 outfile.write(f"{'=' * 80}\n\n")
             
             try:
-                with open(file_path, 'r', encoding='utf-8') as infile:
-                    content = infile.read()
-                    outfile.write(content)
-                    
-                    # 파일 간 구분을 위한 빈 줄 추가
-                    if not content.endswith('\n'):
-                        outfile.write('\n')
-                    outfile.write('\n')
+                if not _append_file(outfile, file_path, encoding, validate, prefetched):
+                    skipped += 1
             except Exception as e:
                 outfile.write(f"[파일 읽기 오류: {str(e)}]\n\n")
     
-    return True, f"{len(files)}개의 {file_extension} 확장자 파일이 성공적으로 병합되었습니다: {output_path}"
+    note = _result_note(skipped, len(files), time.perf_counter() - started, workers)
+    return True, f"{len(files)}개의 {file_extension} 확장자 파일이 성공적으로 병합되었습니다: {output_path}{note}"
 
 
 
-def merge_json_files(directory_path, output_path, recursive=True):
-    """JSON 파일들을 하나의 JSON 배열로 병합합니다. recursive=True이면 하위 폴더까지 탐색합니다."""
+def merge_json_files(directory_path, output_path, recursive=True, excludes=None):
+    """
+    JSON 파일들을 하나의 JSON 배열로 병합합니다. recursive=True이면 하위 폴더까지 탐색합니다.
+    숨김 파일/폴더와 excludes(.gitignore 형식 제외 규칙)에 맞는 항목은 건너뜁니다.
+    """
     try:
         # JSON 파일들 찾기
-        files = []
-        if recursive:
-            for root, _, _ in os.walk(directory_path):
-                for file in glob.glob(os.path.join(root, "*.json")):
-                    files.append(file)
-        else:
-            files = glob.glob(os.path.join(directory_path, "*.json"))
+        files = find_files(directory_path, patterns=["*.json"], excludes=excludes, recursive=recursive,
+                           include_hidden=False)
         
         if not files:
             return False, f"지정된 경로({directory_path})에서 JSON 파일을 찾을 수 없습니다."
@@ -167,17 +362,21 @@ def merge_json_files(directory_path, output_path, recursive=True):
     except Exception as e:
         return False, f"JSON 파일 병합 중 오류 발생: {str(e)}"
 
-def merge_documents(input_files, output_path, file_type="txt"):
-    """여러 문서 파일들을 병합합니다."""
+def merge_documents(input_files, output_path, file_type="txt", encoding=None, validate=False, read_workers=None,
+                    read_ahead_mb=DEFAULT_READ_AHEAD_MB):
+    """여러 문서 파일들을 병합합니다. encoding/validate/read_workers/read_ahead_mb는 merge_text_files와 같습니다."""
     if file_type.lower() == "txt":
         try:
-            with open(output_path, 'w', encoding='utf-8') as outfile:
+            with open(output_path, 'w', encoding='utf-8', newline='\n') as outfile:
                 # 헤더 추가
                 outfile.write(f"# 병합된 문서 ({len(input_files)}개)\n")
                 outfile.write(f"# 생성 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
                 
                 # 각 파일의 내용 병합
-                for file_path in input_files:
+                skipped = 0
+                workers = _read_workers(read_workers, os.path.dirname(input_files[0])) if input_files else 1
+                started = time.perf_counter()
+                for file_path, prefetched in _iter_read_ahead(input_files, workers, read_ahead_mb, encoding):
                     file_name = os.path.basename(file_path)
                     
                     outfile.write(f"\n{'=' * 80}\n")
@@ -185,18 +384,13 @@ def merge_documents(input_files, output_path, file_type="txt"):
                     outfile.write(f"{'=' * 80}\n\n")
                     
                     try:
-                        with open(file_path, 'r', encoding='utf-8') as infile:
-                            content = infile.read()
-                            outfile.write(content)
-                            
-                            # 파일 간 구분을 위한 빈 줄 추가
-                            if not content.endswith('\n'):
-                                outfile.write('\n')
-                            outfile.write('\n')
+                        if not _append_file(outfile, file_path, encoding, validate, prefetched):
+                            skipped += 1
                     except Exception as e:
                         outfile.write(f"[파일 읽기 오류: {str(e)}]\n\n")
             
-            return True, f"{len(input_files)}개의 문서가 성공적으로 병합되었습니다: {output_path}"
+            note = _result_note(skipped, len(input_files), time.perf_counter() - started, workers)
+            return True, f"{len(input_files)}개의 문서가 성공적으로 병합되었습니다: {output_path}{note}"
         
         except Exception as e:
             return False, f"문서 병합 중 오류 발생: {str(e)}"
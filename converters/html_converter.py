@@ -5,12 +5,21 @@ import os
 from bs4 import BeautifulSoup, NavigableString
 from datetime import datetime
 from utils.text_utils import split_text_into_chunks
-import pandas as pd
+from converters.parser_engines import (make_soup, parse_html_document, element_text, find_element,
+                                       find_all_elements, has_class, DEFAULT_PARSER_ENGINE)
+from converters.document_model import Document, Section, Paragraph, Table
+from utils.stage_timer import NULL_TIMER
+from lxml import etree
+import lxml.html
+
+# 변환 결과 형식이 바뀌면 버전을 올립니다 (변환 캐시 키에도 사용됨)
+CONVERTER_VERSION = "2.2.1"
 
 def parse_table_to_json(table_soup):
     """HTML 테이블(soup)을 JSON 친화적인 리스트-딕셔너리 형태로 변환합니다."""
     try:
-        # pandas를 사용하여 HTML 테이블을 DataFrame으로 읽어옵니다.
+        # pandas를 사용하여 HTML 테이블을 DataFrame으로 읽어옵니다. (불러오는 데 오래 걸리므로 표가 있을 때만 import)
+        import pandas as pd
         df = pd.read_html(StringIO(str(table_soup)), flavor='bs4')[0]
         return df.to_dict(orient='records')
     except Exception:
@@ -23,104 +32,174 @@ def parse_table_to_json(table_soup):
         return rows
 
 
-def html_to_json(html_path, chunk_size=1000, advanced_metadata=True, gpt_optimized=True):
-    """
-    구조화된 리포트 HTML 파일을 분석하여 계층적인 JSON으로 변환합니다.
-    """
-    try:
-        with open(html_path, 'r', encoding='utf-8', errors='replace') as f:
-            content = f.read()
-        soup = BeautifulSoup(content, 'html.parser')
-    except Exception as e:
-        return None, f"HTML 파일을 읽는 중 오류 발생: {str(e)}"
-
-    book_data = {}
+def _get_text(element, use_lxml):
+    """요소의 get_text(strip=True) 결과를 반환합니다 (soup/lxml 공용)."""
+    return element_text(element, strip=True) if use_lxml else element.get_text(strip=True)
+
+
+def _table_to_json(table, use_lxml):
+    """테이블 요소를 parse_table_to_json으로 변환합니다. lxml 요소는 테이블 부분만 soup으로 만들어 처리합니다."""
+    if use_lxml:
+        table_html = lxml.html.tostring(table, encoding='unicode', with_tail=False)
+        table = BeautifulSoup(table_html, 'html.parser').find('table')
+    return parse_table_to_json(table)
+
+
+def _parse_references(doc, use_lxml):
+    """참고문헌(References) 목록을 추출합니다. 참고문헌 영역이 없으면 None."""
+    if use_lxml:
+        references_section = find_element(doc, 'div', id='h0-References')
+    else:
+        references_section = doc.find('div', id='h0-References')
+    if references_section is None:
+        return None
+
+    if use_lxml:
+        ref_divs = [div for div in references_section.itersiblings('div') if has_class(div, 'text-[14px]')]
+    else:
+        ref_divs = references_section.find_next_siblings('div', class_='text-[14px]')
+
+    references_list = []
+    for ref_div in ref_divs:
+        if use_lxml:
+            ref_id_tag = find_element(ref_div, 'a', 'no-underline')
+            source_tag = find_element(ref_div, 'span')
+            link_tag = find_element(ref_div, 'a', target='_blank')
+            link_href = link_tag.get('href', '') if link_tag is not None else ''
+        else:
+            ref_id_tag = ref_div.find('a', class_='no-underline')
+            source_tag = ref_div.find('span')
+            link_tag = ref_div.find('a', target='_blank')
+            link_href = link_tag['href'] if link_tag and link_tag.has_attr('href') else ''
 
-    # 1. 메타데이터 추출
-    title_tag = soup.find('div', class_='text-[22px]')
-    title = title_tag.get_text(strip=True) if title_tag else os.path.basename(html_path)
-    book_data['metadata'] = { 'title': title, 'file_type': 'HTML' }
+        ref_id = _get_text(ref_id_tag, use_lxml) if ref_id_tag is not None else ''
+        source = _get_text(source_tag, use_lxml) if source_tag is not None else ''
+        link_text = _get_text(link_tag, use_lxml) if link_tag is not None else ''
 
-    if advanced_metadata:
-        book_data['metadata'].update({
-            'file_path': html_path,
-            'file_name': os.path.basename(html_path),
-            'file_size': os.path.getsize(html_path),
-            'processed_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            'converter_version': "2.2.1" # 최종 버전
+        references_list.append({
+            'id': ref_id,
+            'source': source,
+            'title': link_text,
+            'url': link_href
         })
+    return references_list
 
-    # 2. 본문 섹션 구조적으로 파싱 (개선된 최종 로직)
-    main_content_divs = soup.find_all('div', class_='markdown-body')
+
+def _timed_table(element, use_lxml, timer):
+    """표 하나를 변환하고 tables 단계에 기록합니다."""
+    with timer.stage('tables', items=1):
+        return Table(_table_to_json(element, use_lxml))
+
+
+def _parse_sections(doc, use_lxml, timer):
+    """본문(markdown-body)의 h2/h3/p/table을 차례로 읽어 섹션 목록을 만듭니다."""
+    if use_lxml:
+        main_content_divs = list(find_all_elements(doc, 'div', 'markdown-body'))
+    else:
+        main_content_divs = doc.find_all('div', class_='markdown-body')
     sections = []
     current_section = None
     
     for content_div in main_content_divs:
         # div 바로 아래의 태그들만 순회하여 계층 구조를 명확히 함
-        for element in content_div.find_all(['h2', 'h3', 'p', 'table']):
-            if element.name == 'h2':
+        if use_lxml:
+            elements = content_div.iter('h2', 'h3', 'p', 'table')
+        else:
+            elements = content_div.find_all(['h2', 'h3', 'p', 'table'])
+        for element in elements:
+            name = element.tag if use_lxml else element.name
+            if name == 'h2':
                 # 새로운 h2가 나오면, 이전 h2 섹션을 리스트에 추가
                 if current_section:
                     sections.append(current_section)
                 # 새로운 h2 섹션 시작
-                current_section = {'title': element.get_text(strip=True), 'content': [], 'subsections': []}
+                current_section = Section(_get_text(element, use_lxml))
             
-            elif element.name == 'h3':
+            elif name == 'h3':
                 # h2가 없는 상태에서 h3가 나올 경우 무시
                 if not current_section: continue
                 # 새로운 h3를 subsections에 추가
-                subsection = {'subtitle': element.get_text(strip=True), 'content': []}
-                current_section['subsections'].append(subsection)
+                current_section.subsections.append(Section(_get_text(element, use_lxml), level=3))
 
-            elif element.name == 'p' or element.name == 'table':
+            elif name == 'p' or name == 'table':
                 # h2가 없는 상태에서 p나 table이 나올 경우 무시
                 if not current_section: continue
 
                 # 콘텐츠 아이템 생성
-                if element.name == 'p':
-                    text = element.get_text(strip=True)
+                if name == 'p':
+                    text = _get_text(element, use_lxml)
                     if not text: continue
-                    content_item = {'type': 'paragraph', 'text': text}
+                    content_item = Paragraph(text)
                 else: # table
-                    table_data = parse_table_to_json(element)
-                    content_item = {'type': 'table', 'data': table_data}
+                    content_item = _timed_table(element, use_lxml, timer)
 
                 # h3가 있으면 h3에, 없으면 h2에 콘텐츠 추가
-                if current_section['subsections']:
-                    current_section['subsections'][-1]['content'].append(content_item)
+                if current_section.subsections:
+                    current_section.subsections[-1].content.append(content_item)
                 else:
-                    current_section['content'].append(content_item)
+                    current_section.content.append(content_item)
 
     # 마지막으로 작업 중이던 h2 섹션을 리스트에 추가
     if current_section:
         sections.append(current_section)
-    
-    book_data['sections'] = sections
+    return sections
 
-    # 3. 참고문헌(References) 파싱
-    references_section = soup.find('div', id='h0-References')
-    if references_section:
-        references_list = []
-        for ref_div in references_section.find_next_siblings('div', class_='text-[14px]'):
-            ref_id_tag = ref_div.find('a', class_='no-underline')
-            ref_id = ref_id_tag.get_text(strip=True) if ref_id_tag else ''
-            
-            source_tag = ref_div.find('span')
-            source = source_tag.get_text(strip=True) if source_tag else ''
 
-            link_tag = ref_div.find('a', target='_blank')
-            link_text = link_tag.get_text(strip=True) if link_tag else ''
-            link_href = link_tag['href'] if link_tag and link_tag.has_attr('href') else ''
+def html_to_json(html_path, chunk_size=1000, advanced_metadata=True, gpt_optimized=True,
+                 parser_engine=DEFAULT_PARSER_ENGINE, timer=NULL_TIMER):
+    """
+    구조화된 리포트 HTML 파일을 분석하여 섹션 계층의 Document(document_model)로 변환합니다.
+    parser_engine은 파싱 엔진입니다 (parser_engines.PARSER_ENGINES).
+    timer(StageTimer)에는 read, parse, structure(섹션 구성), tables, references 단계를 기록합니다.
+    """
+    try:
+        with timer.stage('read', bytes_read=os.path.getsize(html_path)):
+            with open(html_path, 'r', encoding='utf-8', errors='replace') as f:
+                content = f.read()
+        with timer.stage('parse', items=1):
+            use_lxml = False
+            if parser_engine == "lxml":
+                try:
+                    doc = parse_html_document(content)
+                    use_lxml = True
+                except (ValueError, etree.ParserError):
+                    # 인코딩 선언이 있거나 비어 있는 문서는 html.parser로 처리
+                    pass
+            if not use_lxml:
+                doc = make_soup(content, parser_engine)
+    except Exception as e:
+        return None, f"HTML 파일을 읽는 중 오류 발생: {str(e)}"
+
+    # 1. 메타데이터 추출
+    if use_lxml:
+        title_tag = find_element(doc, 'div', 'text-[22px]')
+    else:
+        title_tag = doc.find('div', class_='text-[22px]')
+    title = _get_text(title_tag, use_lxml) if title_tag is not None else os.path.basename(html_path)
+    metadata = { 'title': title, 'file_type': 'HTML' }
 
-            references_list.append({
-                'id': ref_id,
-                'source': source,
-                'title': link_text,
-                'url': link_href
-            })
-        book_data['references'] = references_list
+    if advanced_metadata:
+        metadata.update({
+            'file_path': html_path,
+            'file_name': os.path.basename(html_path),
+            'file_size': os.path.getsize(html_path),
+            'processed_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'converter_version': CONVERTER_VERSION # 최종 버전
+        })
+
+    # 2. 본문 섹션 구조적으로 파싱 (개선된 최종 로직)
+    with timer.stage('structure'):
+        sections = _parse_sections(doc, use_lxml, timer)
+    timer.add('structure', items=len(sections))
+    
+    # 3. 참고문헌(References) 파싱
+    tail = {}
+    with timer.stage('references'):
+        references_list = _parse_references(doc, use_lxml)
+    if references_list is not None:
+        tail['references'] = references_list
 
-    book_data['gpt_knowledge'] = True
-    book_data['book_converter'] = "Lexi Convert by El Fenomeno"
+    tail['gpt_knowledge'] = True
+    tail['book_converter'] = "Lexi Convert by El Fenomeno"
 
-    return book_data, None
\ No newline at end of file
+    return Document(metadata, 'sections', sections, tail=tail), None
\ No newline at end of file
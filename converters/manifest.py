@@ -0,0 +1,130 @@
+# converters/manifest.py
+import os
+import json
+import tempfile
+
+from utils.file_utils import hash_file
+from utils.token_counter import tokenizer_fingerprint
+
+# 출력 폴더에 저장되는 변환 기록 파일 이름
+MANIFEST_FILENAME = ".lexi_manifest.json"
+MANIFEST_VERSION = 1
+
+# 출력 결과에 영향을 주는 설정 (바뀌면 다시 변환)
+MANIFEST_SETTING_KEYS = ('chunk_size', 'include_toc', 'advanced_metadata', 'gpt_optimized', 'compact_json',
+                         'parser_engine', 'table_detection', 'chunk_unit', 'tokenizer', 'embed_timings')
+
+
+def manifest_settings(options, output_format):
+    """매니페스트에 기록할 변환 설정을 만듭니다. 토크나이저 파일은 내용 해시도 기록합니다."""
+    settings = {name: options.get(name) for name in MANIFEST_SETTING_KEYS}
+    settings['output_format'] = output_format
+    if options.get('tokenizer'):
+        settings['tokenizer_hash'] = tokenizer_fingerprint(options['tokenizer'])
+    return settings
+
+
+class ConversionManifest:
+    """
+    출력 폴더에 이미 변환된 입력 파일의 경로, 크기, 수정 시각, 해시, 설정을 기록합니다.
+    다음 실행에서는 새로 추가되었거나 바뀐 파일만 변환합니다.
+    """
+
+    def __init__(self, output_folder):
+        self.output_folder = output_folder
+        self.path = os.path.join(output_folder, MANIFEST_FILENAME)
+        self.entries = {}
+        self.load()
+
+    def load(self):
+        """매니페스트 파일을 읽습니다. 없거나 손상된 경우 빈 기록으로 시작합니다."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') == MANIFEST_VERSION:
+                self.entries = manifest.get('files', {})
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def save(self):
+        """매니페스트를 임시 파일에 쓴 뒤 교체하여 저장합니다."""
+        os.makedirs(self.output_folder, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.output_folder, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'version': MANIFEST_VERSION, 'files': self.entries}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def is_up_to_date(self, doc_file, settings, output_path):
+        """입력 파일이 마지막 변환 이후 바뀌지 않았고 같은 설정으로 출력이 남아 있는지 확인합니다."""
+        entry = self.entries.get(os.path.abspath(doc_file))
+        if not entry or entry.get('settings') != settings:
+            return False
+        if entry.get('output_path') != output_path or not os.path.exists(output_path):
+            return False
+
+        try:
+            stat = os.stat(doc_file)
+        except OSError:
+            return False
+        if stat.st_size != entry.get('size'):
+            return False
+        if stat.st_mtime_ns == entry.get('mtime_ns'):
+            return True
+
+        # 수정 시각만 바뀐 경우 (복사/동기화 등) 내용 해시로 확인
+        if hash_file(doc_file) != entry.get('hash'):
+            return False
+        entry['mtime_ns'] = stat.st_mtime_ns
+        return True
+
+    def plan(self, jobs, settings):
+        """작업 목록을 (변환할 작업, 건너뛸 작업)으로 나눕니다."""
+        to_convert = []
+        unchanged = []
+        for job in jobs:
+            idx, doc_file, output_path = job
+            if self.is_up_to_date(doc_file, settings, output_path):
+                unchanged.append(job)
+            else:
+                to_convert.append(job)
+        return to_convert, unchanged
+
+    def record(self, record, settings):
+        """변환에 성공한 파일의 상태 레코드를 매니페스트에 기록합니다."""
+        self.entries[os.path.abspath(record['file'])] = {
+            'size': record['input_size'],
+            'mtime_ns': record['input_mtime_ns'],
+            'hash': record['input_hash'],
+            'settings': settings,
+            'output_path': record['output_path'],
+        }
+
+    def find_removed(self):
+        """입력 파일이 더 이상 존재하지 않는 기록 목록을 반환합니다."""
+        return [path for path in self.entries if not os.path.exists(path)]
+
+    def prune(self, removed_inputs):
+        """삭제된 입력 파일의 출력 파일과 기록을 지웁니다. 삭제한 출력 파일 경로 목록을 반환합니다."""
+        deleted = []
+        for input_path in removed_inputs:
+            entry = self.entries.pop(input_path, None)
+            if not entry:
+                continue
+            output_path = entry.get('output_path')
+            # 같은 이름의 다른 입력 파일이 같은 출력 파일을 쓰고 있으면 남겨 둠
+            if any(other.get('output_path') == output_path for other in self.entries.values()):
+                continue
+            if output_path and os.path.exists(output_path):
+                try:
+                    os.remove(output_path)
+                    deleted.append(output_path)
+                except OSError:
+                    pass
+        return deleted
@@ -0,0 +1,218 @@
+# converters/parser_engines.py
+"""
+EPUB 챕터와 HTML 리포트를 파싱하는 엔진 선택.
+
+- html.parser : BeautifulSoup + 파이썬 내장 파서 (기존 방식, 가장 호환성이 높음)
+- bs4-lxml    : BeautifulSoup + lxml 파서
+- lxml        : soup을 만들지 않고 lxml 트리에서 직접 텍스트/제목을 추출 (가장 빠름)
+
+lxml 엔진은 BeautifulSoup(html.parser)의 get_text 규칙(공백만 있는 문자열 축약,
+script/style/template/rt/rp 내부 문자열과 주석 제외)을 그대로 따르므로 같은 텍스트를 만듭니다.
+트리로 읽을 수 없는 문서는 html.parser로 처리합니다.
+"""
+import warnings
+from bs4 import BeautifulSoup
+from lxml import etree
+import lxml.html
+
+try:
+    from bs4 import XMLParsedAsHTMLWarning
+    # EPUB 챕터는 XML 선언이 있는 XHTML이므로 HTML 파서 사용 경고는 무시
+    warnings.filterwarnings("ignore", category=XMLParsedAsHTMLWarning)
+except ImportError:
+    pass
+
+from converters.defaults import PARSER_ENGINES, DEFAULT_PARSER_ENGINE
+
+# BeautifulSoup이 별도 문자열 타입으로 다루어 get_text에서 제외되는 태그
+_EXCLUDED_STRING_TAGS = frozenset(('script', 'style', 'template', 'rt', 'rp'))
+# 공백 문자열을 축약하지 않는 태그
+_PRESERVE_WHITESPACE_TAGS = frozenset(('pre', 'textarea'))
+# BeautifulSoup이 공백으로 보는 문자
+_ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+
+_HEADING_TAGS = frozenset(('h1', 'h2', 'h3', 'h4'))
+
+_xml_parser = None
+
+
+def make_soup(content, engine=DEFAULT_PARSER_ENGINE):
+    """엔진에 맞는 BeautifulSoup 객체를 만듭니다. (lxml 엔진은 호환용으로 html.parser 사용)"""
+    return BeautifulSoup(content, 'lxml' if engine == "bs4-lxml" else 'html.parser')
+
+
+def _get_xml_parser():
+    global _xml_parser
+    if _xml_parser is None:
+        _xml_parser = etree.XMLParser(resolve_entities=False, no_network=True)
+    return _xml_parser
+
+
+def tag_name(element):
+    """html.parser가 보는 것과 같은 태그 이름 (접두사:로컬이름, 소문자)을 반환합니다."""
+    tag = element.tag
+    if not isinstance(tag, str):
+        return None
+    if tag[0] == '{':
+        tag = tag[tag.index('}') + 1:]
+    if element.prefix:
+        tag = element.prefix + ':' + tag
+    return tag.lower()
+
+
+def _is_excluded(element):
+    """요소 자신이나 상위 요소가 get_text에서 제외되는 태그인지 확인합니다."""
+    if tag_name(element) in _EXCLUDED_STRING_TAGS:
+        return True
+    return any(tag_name(ancestor) in _EXCLUDED_STRING_TAGS for ancestor in element.iterancestors())
+
+
+def _is_preserved(element):
+    if tag_name(element) in _PRESERVE_WHITESPACE_TAGS:
+        return True
+    return any(tag_name(ancestor) in _PRESERVE_WHITESPACE_TAGS for ancestor in element.iterancestors())
+
+
+def _normalize(string, preserve):
+    """BeautifulSoup처럼 공백만 있는 문자열을 줄바꿈 또는 공백 하나로 축약합니다."""
+    if not preserve and not string.strip(_ASCII_SPACES):
+        return '\n' if '\n' in string else ' '
+    return string
+
+
+def _collect_strings(element, excluded, preserve, strings):
+    """요소 안의 텍스트 문자열을 문서 순서대로 모읍니다 (요소 자신의 tail 제외)."""
+    name = tag_name(element)
+    excluded = excluded or name in _EXCLUDED_STRING_TAGS
+    preserve = preserve or name in _PRESERVE_WHITESPACE_TAGS
+    if element.text and not excluded:
+        strings.append(_normalize(element.text, preserve))
+    for child in element:
+        if isinstance(child.tag, str):
+            _collect_strings(child, excluded, preserve, strings)
+        # 주석/처리 명령은 건너뛰고 뒤따르는 텍스트만 수집
+        if child.tail and not excluded:
+            strings.append(_normalize(child.tail, preserve))
+    return strings
+
+
+def element_text(element, strip=False):
+    """BeautifulSoup의 get_text(strip=strip)과 같은 결과를 lxml 요소에서 만듭니다."""
+    strings = _collect_strings(element, _is_excluded(element), _is_preserved(element), [])
+    if strip:
+        return ''.join(s for s in (string.strip() for string in strings) if s)
+    return ''.join(strings)
+
+
+def _element_string(element):
+    """BeautifulSoup의 Tag.string과 같은 값 (자식이 하나뿐일 때 그 문자열)을 반환합니다."""
+    children = []
+    if element.text:
+        children.append(element.text)
+    for child in element:
+        children.append(child)
+        if child.tail:
+            children.append(child.tail)
+    if len(children) != 1:
+        return None
+
+    child = children[0]
+    if isinstance(child, str):
+        return _normalize(child, _is_preserved(element))
+    if isinstance(child, etree._Comment):
+        return _normalize(child.text, _is_preserved(element)) if child.text else child.text
+    if isinstance(child.tag, str):
+        return _element_string(child)
+    return None
+
+
+def _chapter_title_lxml(root):
+    """title 태그 또는 첫 h1~h4 태그에서 챕터 제목을 추출합니다 (epub_converter._chapter_title과 동일)."""
+    chapter_title = "Unknown"
+    title = heading = None
+    for element in root.iter(etree.Element):
+        name = tag_name(element)
+        if title is None and name == 'title':
+            title = element
+        elif heading is None and name in _HEADING_TAGS:
+            heading = element
+        if title is not None and heading is not None:
+            break
+
+    title_string = _element_string(title) if title is not None else None
+    if title_string:
+        return title_string.strip()
+    if heading is not None:
+        text = element_text(heading)
+        if text:
+            chapter_title = text.strip()
+    return chapter_title
+
+
+def _chapter_title_soup(soup):
+    """챕터 문서의 제목(title 태그 또는 첫 제목 태그)을 추출합니다."""
+    chapter_title = "Unknown"
+    try:
+        if soup.title and soup.title.string:
+            chapter_title = soup.title.string.strip()
+        else:
+            h_tags = soup.find(['h1', 'h2', 'h3', 'h4'])
+            if h_tags and h_tags.text:
+                chapter_title = h_tags.text.strip()
+    except:
+        pass
+    return chapter_title
+
+
+def extract_chapter(content, engine=DEFAULT_PARSER_ENGINE, with_title=True):
+    """
+    EPUB 챕터 문서(bytes)에서 (본문 텍스트, 챕터 제목)을 추출합니다.
+    본문 텍스트는 앞뒤 공백을 제거한 get_text() 결과이며, with_title이 False면 제목은 None입니다.
+    """
+    if engine == "lxml":
+        try:
+            # ebooklib이 돌려주는 챕터는 lxml이 직렬화한 XHTML이므로 XML로 읽으면 원문 공백이 그대로 유지됨
+            root = etree.fromstring(content, _get_xml_parser()) if content else None
+        except etree.XMLSyntaxError:
+            root = None
+        if root is not None:
+            text = element_text(root).strip()
+            title = _chapter_title_lxml(root) if with_title and text else None
+            return text, title
+
+    soup = make_soup(content.decode('utf-8', errors='replace'), engine)  # 명시적 디코딩 추가
+    text = soup.get_text().strip()
+    title = _chapter_title_soup(soup) if with_title and text else None
+    return text, title
+
+
+def parse_html_document(content):
+    """HTML 문서 문자열을 lxml 트리로 파싱합니다."""
+    return lxml.html.document_fromstring(content)
+
+
+def has_class(element, class_name):
+    """요소의 class 속성에 class_name이 있는지 확인합니다 (BeautifulSoup class_ 검색과 동일)."""
+    classes = element.get('class')
+    if classes is None:
+        return False
+    return class_name in classes.split() or classes == class_name
+
+
+def find_element(root, tag, class_name=None, **attrs):
+    """BeautifulSoup의 find처럼 조건에 맞는 첫 하위 요소를 반환합니다. 없으면 None."""
+    for element in find_all_elements(root, tag, class_name, **attrs):
+        return element
+    return None
+
+
+def find_all_elements(root, tag, class_name=None, **attrs):
+    """BeautifulSoup의 find_all처럼 조건에 맞는 하위 요소를 문서 순서대로 반환합니다."""
+    for element in root.iter(tag):
+        if element is root:
+            continue
+        if class_name is not None and not has_class(element, class_name):
+            continue
+        if any(element.get(name) != value for name, value in attrs.items()):
+            continue
+        yield element
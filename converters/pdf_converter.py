@@ -1,19 +1,44 @@
 # converters/pdf_converter.py
 
 import os
-import fitz  # PyMuPDF
-import pandas as pd
+import numpy as np
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from io import StringIO
+from converters.document_model import Document, Section, Paragraph, Table
+from converters.defaults import TABLE_DETECTION_MODES, DEFAULT_TABLE_DETECTION
+from utils.stage_timer import StageTimer, NULL_TIMER
 
 # PDF 지원 체크
 try:
-    import fitz
+    import fitz  # PyMuPDF
     PDF_SUPPORT = True
 except ImportError:
     fitz = None
     PDF_SUPPORT = False
 
+# 변환 결과 형식이 바뀌면 버전을 올립니다 (변환 캐시 키에도 사용됨)
+CONVERTER_VERSION = "2.5.0"
+
+# 이 페이지 수 이상인 PDF만 페이지 범위로 나누어 여러 프로세스에서 변환
+PARALLEL_MIN_PAGES = 200
+# 워커 프로세스 하나가 한 번에 맡는 최대 페이지 수
+PAGES_PER_RANGE = 50
+
+# find_tables가 가로/세로 선으로 인정하는 기울기 허용치 (PyMuPDF 기본 snap_tolerance)
+_SNAP_TOLERANCE = 3
+
+# 본문 글자 크기 대비 제목으로 보는 배율 (h2: 섹션 제목, h3: 하위 섹션 제목)
+H2_SCALE = 1.5
+H3_SCALE = 1.2
+
+# 텍스트 추출 플래그: get_text("dict") 기본값에서 사용하지 않는 이미지 블록(원본 이미지 데이터)만 제외
+# 이 상수가 없는 구버전 PyMuPDF에서는 flags 옵션 없이 호출합니다.
+if PDF_SUPPORT and hasattr(fitz, 'TEXTFLAGS_DICT') and hasattr(fitz, 'TEXT_PRESERVE_IMAGES'):
+    TEXT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+else:
+    TEXT_FLAGS = None
+
 def parse_pdf_table(table, page_height):
     """PyMuPDF의 Table 객체를 JSON 친화적인 형태로 변환"""
     header_names = [cell for cell in table.header.names]
@@ -26,20 +51,242 @@ def parse_pdf_table(table, page_height):
         rows_data.append(row_dict)
     return rows_data
 
-def pdf_to_json(pdf_path, chunk_size=1000, advanced_metadata=True, gpt_optimized=True):
+class TableRegionIndex:
+    """
+    페이지의 표 영역을 세로 방향 구간(band)별로 등록해 두고, 블록이 표와 겹치는지
+    블록이 걸친 구간의 표만 확인합니다. 결과는 fitz.Rect.intersects와 같습니다.
+    """
+
+    # 구간 높이 (pt). 본문 블록은 보통 한두 구간에 걸침
+    BAND_HEIGHT = 24
+
+    def __init__(self, bboxes):
+        self._bands = {}
+        for bbox in bboxes:
+            rect = fitz.Rect(bbox)
+            # 빈 영역이나 무한 영역은 Rect.intersects에서 항상 겹치지 않음
+            if rect.is_empty or rect.is_infinite:
+                continue
+            region = (rect.x0, rect.y0, rect.x1, rect.y1)
+            for band in range(self._band(rect.y0), self._band(rect.y1) + 1):
+                self._bands.setdefault(band, []).append(region)
+
+    def _band(self, y):
+        return int(y // self.BAND_HEIGHT)
+
+    def intersects(self, bbox):
+        """(x0, y0, x1, y1) 영역이 어느 표와 겹치면 True를 반환합니다."""
+        if not self._bands:
+            return False
+        x0, y0, x1, y1 = bbox
+        if x0 >= x1 or y0 >= y1:
+            return False
+        for band in range(self._band(y0), self._band(y1) + 1):
+            for tx0, ty0, tx1, ty1 in self._bands.get(band, ()):
+                if x0 < tx1 and tx0 < x1 and y0 < ty1 and ty0 < y1:
+                    return True
+        return False
+
+def _layout_tables_enabled():
+    """pymupdf_layout 분석기가 설치되어 있으면 find_tables가 선 없이도 표를 찾으므로 미리 거를 수 없습니다."""
+    try:
+        import pymupdf
+    except ImportError:
+        return False
+    return getattr(pymupdf, '_get_layout', None) is not None
+
+def may_contain_table(page):
+    """
+    find_tables를 호출하기 전에 표가 있을 수 있는 페이지인지 빠르게 판단합니다.
+    기본(lines) 전략은 벡터 그림의 선과 사각형으로만 표 테두리를 만들기 때문에,
+    그림이 없거나 한 방향의 가는 선(밑줄, 구분선)만 있는 페이지에는 표가 없습니다.
+    """
+    if _layout_tables_enabled():
+        return True
+    horizontal = vertical = False
+    for path in page.get_cdrawings():
+        x0, y0, x1, y1 = path['rect']
+        # 면적이 있는 그림은 사각형이나 텍스트를 감싼 테두리로 표가 될 수 있음
+        if x1 - x0 > _SNAP_TOLERANCE and y1 - y0 > _SNAP_TOLERANCE:
+            return True
+        for item in path['items']:
+            if item[0] in ('re', 'qu'):
+                return True
+            if item[0] == 'l':
+                (ax, ay), (bx, by) = item[1], item[2]
+                if abs(ay - by) <= _SNAP_TOLERANCE:
+                    horizontal = True
+                if abs(ax - bx) <= _SNAP_TOLERANCE:
+                    vertical = True
+        # 가로선과 세로선이 모두 있으면 칸을 이룰 수 있음
+        if horizontal and vertical:
+            return True
+    return False
+
+def extract_page(page, table_detection=DEFAULT_TABLE_DETECTION, timer=NULL_TIMER):
+    """
+    페이지 하나에서 (블록 목록, 표 목록, 표 탐지 생략 여부, 글자 크기 배열)을 추출합니다.
+    블록은 (텍스트, 가장 큰 글자 크기) 튜플이며, 글자 크기 배열은 페이지의 모든 span 크기입니다.
+    제목 판별과 페이지 간 섹션 구성은 문서 전체를 모은 뒤 build_sections에서 합니다.
+    텍스트가 없는 페이지는 표도 사용하지 않으므로 find_tables를 호출하지 않습니다.
+    timer(StageTimer)에는 layout(텍스트 블록 추출)과 tables(표 탐지 및 변환) 단계를 기록합니다.
+    """
+    with timer.stage('layout', items=1):
+        if TEXT_FLAGS is None:
+            # ✅ 구버전과 호환되도록 flags 옵션을 사용하지 않습니다.
+            blocks = page.get_text("dict")["blocks"]
+        else:
+            # 이미지 블록은 lines가 없어 어차피 건너뛰므로 이미지 데이터를 추출하지 않음
+            blocks = page.get_text("dict", flags=TEXT_FLAGS)["blocks"]
+        
+        font_sizes = np.fromiter((span['size'] for b in blocks for l in b.get('lines', []) for span in l.get('spans', [])),
+                                 dtype=np.float64)
+    if not font_sizes.size: return [], [], True, font_sizes
+    
+    with timer.stage('tables'):
+        if table_detection == "always" or (table_detection == "auto" and may_contain_table(page)):
+            tables = page.find_tables()
+            table_skipped = False
+        else:
+            tables = []
+            table_skipped = True
+    
+    with timer.stage('layout'):
+        table_regions = TableRegionIndex(table.bbox for table in tables)
+        page_blocks = []
+        for b in blocks:
+            if not b.get('lines') or table_regions.intersects(b['bbox']): continue
+
+            spans = [s for l in b['lines'] for s in l['spans']]
+            block_text = " ".join(s['text'] for s in spans).strip()
+            if not block_text: continue
+            block_font_size = max((s['size'] for s in spans), default=0)
+            
+            page_blocks.append((block_text, block_font_size))
+    
+    with timer.stage('tables', items=0 if table_skipped else 1):
+        page_tables = [parse_pdf_table(table, page.rect.height) for table in tables]
+    return page_blocks, page_tables, table_skipped, font_sizes
+
+def extract_page_range(pdf_path, start, stop, table_detection=DEFAULT_TABLE_DETECTION):
+    """
+    워커 프로세스에서 실행됩니다. PDF를 직접 열어 [start, stop) 범위 페이지의
+    (extract_page 결과 목록, 단계별 기록)을 반환합니다.
+    """
+    timer = StageTimer()
+    doc = fitz.open(pdf_path)
+    try:
+        pages = [extract_page(doc[page_index], table_detection, timer) for page_index in range(start, stop)]
+        return pages, timer.to_dict()
+    finally:
+        doc.close()
+
+def page_ranges(page_count, page_workers):
+    """페이지를 워커 수에 맞게 [start, stop) 범위들로 나눕니다."""
+    range_size = max(1, min(PAGES_PER_RANGE, -(-page_count // page_workers)))
+    return [(start, min(start + range_size, page_count)) for start in range(0, page_count, range_size)]
+
+def extract_pages_parallel(pdf_path, page_count, page_workers, table_detection=DEFAULT_TABLE_DETECTION,
+                           timer=NULL_TIMER):
+    """
+    페이지 범위를 여러 프로세스에서 나누어 추출하고, 페이지 순서대로 합친 결과를 반환합니다.
+    프로세스 풀을 사용할 수 없는 환경이면 None을 반환합니다.
+    워커들의 단계별 시간은 timer에 더하므로 경과 시간이 아니라 워커 시간의 합입니다.
+    """
+    ranges = page_ranges(page_count, page_workers)
+    try:
+        with ProcessPoolExecutor(max_workers=min(page_workers, len(ranges))) as executor:
+            # map은 제출 순서대로 결과를 돌려주므로 완료 순서와 관계없이 페이지 순서가 유지됨
+            range_results = list(executor.map(extract_page_range, repeat(pdf_path),
+                                              [start for start, _ in ranges], [stop for _, stop in ranges],
+                                              repeat(table_detection)))
+    except Exception:
+        # 워커 생성 실패나 페이지 오류는 순차 변환으로 다시 처리 (오류가 있으면 그쪽에서 발생)
+        return None
+    for _, stages in range_results:
+        timer.merge(stages)
+    return [page for pages, _ in range_results for page in pages]
+
+def common_font_size(page_results):
+    """문서 전체 span 글자 크기의 히스토그램에서 가장 많이 쓰인 크기(본문 크기)를 반환합니다. 텍스트가 없으면 None."""
+    font_sizes = np.concatenate([page_result[3] for page_result in page_results] or [np.empty(0)])
+    if not font_sizes.size:
+        return None
+    sizes, counts = np.unique(font_sizes, return_counts=True)
+    return float(sizes[np.argmax(counts)])
+
+def classify_blocks(page_results):
+    """
+    모든 페이지의 블록을 문서 전체 본문 크기 기준으로 한 번에 분류합니다.
+    블록 순서대로 0 (본문), 1 (h3), 2 (h2) 값을 가진 배열을 반환합니다.
+    """
+    block_sizes = np.fromiter((size for page_result in page_results for _, size in page_result[0]),
+                              dtype=np.float64)
+    body_size = common_font_size(page_results)
+    if body_size is None or not block_sizes.size:
+        return np.zeros(block_sizes.size, dtype=np.int8)
+    return np.select([block_sizes >= body_size * H2_SCALE, block_sizes >= body_size * H3_SCALE],
+                     [2, 1], default=0).astype(np.int8)
+
+def build_sections(page_results):
+    """
+    페이지별 추출 결과를 순서대로 이어 붙여 섹션/하위 섹션 목록을 만듭니다.
+    제목 판별은 문서 전체 기준(classify_blocks)이고, 페이지를 넘어 이어지는 섹션 상태는
+    여기서만 관리하므로 순차/병렬 추출 결과가 같습니다.
+    첫 h2 제목보다 앞의 본문과 하위 섹션은 들어갈 섹션이 없으므로 버립니다.
+    """
+    page_results = list(page_results)
+    block_levels = iter(classify_blocks(page_results).tolist())
+
+    sections = []
+    current_section = None
+    current_subsection = None
+
+    def add_item(item):
+        target = current_subsection or current_section
+        if target is not None:
+            target.content.append(item)
+
+    for page_blocks, page_tables, _, _ in page_results:
+        for block_text, _ in page_blocks:
+            block_level = next(block_levels)
+            if block_level == 2:
+                if current_section is not None: sections.append(current_section)
+                current_section = Section(block_text)
+                current_subsection = None
+            elif block_level == 1:
+                if current_subsection is not None and current_section is not None:
+                    current_section.subsections.append(current_subsection)
+                current_subsection = Section(block_text, level=3)
+            else:
+                add_item(Paragraph(block_text))
+        
+        for table_data in page_tables:
+            add_item(Table(table_data))
+
+    if current_subsection is not None and current_section is not None:
+        current_section.subsections.append(current_subsection)
+    if current_section is not None: sections.append(current_section)
+    return sections
+
+def pdf_to_json(pdf_path, chunk_size=1000, advanced_metadata=True, gpt_optimized=True, page_workers=1,
+                table_detection=DEFAULT_TABLE_DETECTION, timer=NULL_TIMER):
     """
-    구조화된 리포트 PDF 파일을 분석하여 계층적인 JSON으로 변환합니다.
+    구조화된 리포트 PDF 파일을 분석하여 섹션 계층의 Document(document_model)로 변환합니다.
+    page_workers가 2 이상이고 PARALLEL_MIN_PAGES 이상인 PDF는 페이지 범위를 여러 프로세스에서 나누어 추출합니다.
+    table_detection은 TABLE_DETECTION_MODES 중 하나이며, 표 탐지를 생략한 페이지 수는 확장 메타데이터에 기록됩니다.
+    timer(StageTimer)에는 open, layout, tables, structure(제목 분류와 섹션 구성) 단계를 기록합니다.
     """
     if not PDF_SUPPORT:
         return None, "PDF 변환을 위해 PyMuPDF(fitz) 모듈이 필요합니다."
 
     try:
-        doc = fitz.open(pdf_path)
+        with timer.stage('open', bytes_read=os.path.getsize(pdf_path)):
+            doc = fitz.open(pdf_path)
     except Exception as e:
         return None, f"PDF 파일을 열기 실패: {str(e)}"
 
-    book_data = {}
-    book_data['metadata'] = {
+    metadata = {
         'title': doc.metadata.get('title', os.path.basename(pdf_path)),
         'creator': doc.metadata.get('author', 'Unknown'),
         'pages': len(doc),
@@ -47,77 +294,35 @@ def pdf_to_json(pdf_path, chunk_size=1000, advanced_metadata=True, gpt_optimized
     }
 
     if advanced_metadata:
-        book_data['metadata'].update({
+        metadata.update({
             'file_path': pdf_path,
             'file_name': os.path.basename(pdf_path),
             'file_size': os.path.getsize(pdf_path),
             'processed_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            'converter_version': "2.2.0"
+            'converter_version': CONVERTER_VERSION
         })
 
-    sections = []
-    current_section = {}
-    current_subsection = {}
+    page_results = None
+    if page_workers > 1 and len(doc) >= PARALLEL_MIN_PAGES:
+        page_results = extract_pages_parallel(pdf_path, len(doc), page_workers, table_detection, timer)
+    if page_results is None:
+        page_results = [extract_page(page, table_detection, timer) for page in doc]
 
-    for page_num, page in enumerate(doc, 1):
-        tables = page.find_tables()
-        table_bboxes = [table.bbox for table in tables]
-        
-        # ✅ 구버전과 호환되도록 flags 옵션을 사용하지 않습니다.
-        blocks = page.get_text("dict")["blocks"]
-        
-        font_sizes = [span['size'] for b in blocks for l in b.get('lines', []) for span in l.get('spans', [])]
-        if not font_sizes: continue
-        
-        common_font_size = max(set(font_sizes), key=font_sizes.count)
-        h2_threshold = common_font_size * 1.5
-        h3_threshold = common_font_size * 1.2
+    if advanced_metadata:
+        metadata.update({
+            'table_detection': table_detection,
+            'table_pages_skipped': sum(1 for _, _, table_skipped, _ in page_results if table_skipped)
+        })
 
-        for b in blocks:
-            block_bbox = fitz.Rect(b['bbox'])
-            in_table = any(block_bbox.intersects(table_bbox) for table_bbox in table_bboxes)
-            if in_table or not b.get('lines'): continue
-
-            block_text = ""
-            block_font_size = 0
-            for l in b['lines']:
-                for s in l['spans']:
-                    block_text += s['text'] + " "
-                    if s['size'] > block_font_size:
-                        block_font_size = s['size']
-            
-            block_text = block_text.strip()
-            if not block_text: continue
-            
-            if block_font_size >= h2_threshold:
-                if current_section: sections.append(current_section)
-                current_section = {'title': block_text, 'subsections': [], 'content': []}
-                current_subsection = {}
-            elif block_font_size >= h3_threshold:
-                if current_subsection: current_section.get('subsections', []).append(current_subsection)
-                current_subsection = {'subtitle': block_text, 'content': []}
-            else:
-                content_item = {'type': 'paragraph', 'text': block_text}
-                if current_subsection:
-                    current_subsection.get('content', []).append(content_item)
-                elif current_section:
-                    current_section.get('content', []).append(content_item)
-        
-        for table in tables:
-            table_data = parse_pdf_table(table, page.rect.height)
-            table_item = {'type': 'table', 'data': table_data}
-            if current_subsection:
-                current_subsection.get('content', []).append(table_item)
-            elif current_section:
-                current_section.get('content', []).append(table_item)
-
-    if current_subsection: current_section.get('subsections', []).append(current_subsection)
-    if current_section: sections.append(current_section)
-
-    book_data['sections'] = sections
-    book_data['gpt_knowledge'] = True
-    book_data['book_converter'] = "Lexi Convert by El Fenomeno"
+    tail = {
+        'gpt_knowledge': True,
+        'book_converter': "Lexi Convert by El Fenomeno"
+    }
+    with timer.stage('structure'):
+        sections = build_sections(page_results)
+    timer.add('structure', items=len(sections))
+    document = Document(metadata, 'sections', sections, tail=tail)
     
     doc.close()
     
-    return book_data, None
\ No newline at end of file
+    return document, None
@@ -0,0 +1,248 @@
+# lexi_convert.py
+"""
+Lexi Convert 명령줄 일괄 변환기 (tkinter 없이 동작)
+
+사용 예:
+    python -m lexi_convert 문서폴더 -o 출력폴더 -r -w 8 -f markdown
+    python -m lexi_convert a.epub b.pdf -o out --merge 지식파일
+"""
+import os
+import sys
+import shutil
+import argparse
+import tempfile
+import multiprocessing
+
+from utils.module_checker import find_missing_modules
+
+
+def build_parser():
+    """명령줄 인자 파서를 생성합니다."""
+    parser = argparse.ArgumentParser(
+        prog="lexi_convert",
+        description="EPUB/PDF/HTML 문서를 JSON, 마크다운, 텍스트로 일괄 변환합니다."
+    )
+    parser.add_argument("inputs", nargs="+", help="변환할 문서 파일 또는 폴더")
+    parser.add_argument("-o", "--output", required=True, help="출력 폴더")
+    parser.add_argument("-f", "--format", choices=["json", "markdown", "text"], default="json",
+                        help="출력 포맷 (기본: json)")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="변환 워커 프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument("--page-workers", type=int, default=None,
+                        help="큰 PDF 하나를 페이지 범위로 나누어 변환할 프로세스 수 "
+                             "(기본: 문서 수보다 남는 워커 수, 1이면 사용 안 함)")
+    parser.add_argument("-r", "--recursive", action="store_true",
+                        help="입력 폴더의 하위 폴더까지 검색")
+    parser.add_argument("--exclude", action="append", default=[], metavar="PATTERN",
+                        help="입력 폴더 검색에서 제외할 .gitignore 형식 규칙 (여러 번 지정 가능, 예: 'drafts/', '*_old.pdf')")
+    parser.add_argument("-m", "--merge", nargs="?", const="merged_output", default=None, metavar="NAME",
+                        help="모든 문서를 하나의 출력 파일로 병합 (기본 이름: merged_output)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="텍스트 청크 크기 (기본: 1000)")
+    parser.add_argument("--chunk-unit", choices=["chars", "tokens"], default="chars",
+                        help="청크 크기 단위 (EPUB, chars: 문자 수, tokens: 토큰 수, 기본: chars)")
+    parser.add_argument("--tokenizer", default=None, metavar="PATH",
+                        help="토큰 수 계산에 쓸 로컬 어휘 파일 (vocab.txt 또는 tokenizer.json, 기본: 추정)")
+    parser.add_argument("--gpt-optimized", action="store_true",
+                        help="문서 구조 무시하고 텍스트만 강제 분할")
+    parser.add_argument("--no-toc", action="store_true", help="목차 정보 제외 (EPUB)")
+    parser.add_argument("--no-metadata", action="store_true", help="확장 메타데이터 제외")
+    parser.add_argument("--epub-reader", choices=["zip", "ebooklib"], default="zip",
+                        help="EPUB 읽기 방식 (zip: 본문만 필요할 때 읽음, ebooklib: 전체 로드, 기본: zip)")
+    parser.add_argument("--parser", choices=["html.parser", "bs4-lxml", "lxml"], default="html.parser",
+                        help="EPUB/HTML 파싱 엔진 (html.parser: 호환성, bs4-lxml, lxml: 가장 빠름, 기본: html.parser)")
+    parser.add_argument("--table-detection", choices=["always", "auto", "never"], default="auto",
+                        help="PDF 표 탐지 (auto: 선/사각형이 있는 페이지만 검사, 기본: auto)")
+    parser.add_argument("--compact-json", action="store_true", help="JSON을 들여쓰기 없이 저장 (파일 크기 감소)")
+    parser.add_argument("--no-cache", action="store_true", help="변환 결과 캐시 사용 안 함")
+    parser.add_argument("--cache-dir", default=None, help="캐시 폴더 (기본: ~/.epub_converter/cache)")
+    parser.add_argument("--cache-size", type=int, default=None, metavar="MB",
+                        help="캐시 최대 크기 (MB, 기본: 1024)")
+    parser.add_argument("-i", "--incremental", action="store_true",
+                        help="출력 폴더의 변환 기록을 기준으로 새로 추가되거나 바뀐 파일만 변환")
+    parser.add_argument("--prune", action="store_true",
+                        help="증분 변환 시 삭제된 입력 파일의 출력도 삭제")
+    parser.add_argument("--embed-timings", action="store_true",
+                        help="단계별 처리 시간을 출력 메타데이터(timings)에 포함")
+    parser.add_argument("--report", default=None, metavar="PATH",
+                        help="파일/단계별 처리 시간 보고서 저장 (.csv면 CSV, 그 외 JSON)")
+    parser.add_argument("--debug", action="store_true", help="상세 로그 출력")
+    parser.add_argument("-q", "--quiet", action="store_true", help="오류 외의 로그 생략")
+    return parser
+
+
+def collect_inputs(inputs, recursive, excludes=None):
+    """입력 인자(파일/폴더)를 변환할 문서 파일 목록으로 펼칩니다."""
+    from converters.batch import SUPPORTED_EXTENSIONS, find_document_files
+
+    document_files = []
+    for path in inputs:
+        if os.path.isdir(path):
+            document_files.extend(find_document_files(path, recursive=recursive, excludes=excludes))
+        elif os.path.isfile(path) and path.lower().endswith(SUPPORTED_EXTENSIONS):
+            document_files.append(path)
+        else:
+            print(f"⚠️ 건너뜀 (지원하지 않거나 존재하지 않는 경로): {path}", file=sys.stderr)
+    return document_files
+
+
+def main(argv=None):
+    """명령줄 변환을 실행하고 종료 코드를 반환합니다."""
+    args = build_parser().parse_args(argv)
+
+    # 콘솔 인코딩(cp949 등)에서 출력할 수 없는 문자로 인해 중단되지 않도록 처리
+    for stream in (sys.stdout, sys.stderr):
+        if hasattr(stream, 'reconfigure'):
+            stream.reconfigure(errors='replace')
+
+    def log(message):
+        if not args.quiet:
+            print(message, flush=True)
+
+    missing = find_missing_modules()
+    if missing:
+        print(f"❌ 필요한 모듈이 설치되어 있지 않습니다: {', '.join(missing)}", file=sys.stderr)
+        print(f"   pip install {' '.join(missing)}", file=sys.stderr)
+        return 1
+
+    from converters.manifest import ConversionManifest, manifest_settings
+    from converters.batch import (ConversionPool, default_worker_count, default_page_workers, build_jobs,
+                                  renamed_jobs, MergedBatchWriter, merged_output_path, summarize_cache,
+                                  summarize_table_detection, summarize_stages, write_run_report)
+    from utils.stage_timer import format_stage_stats
+
+    document_files = collect_inputs(args.inputs, args.recursive, args.exclude)
+    if not document_files:
+        print("❌ 변환할 파일이 없습니다.", file=sys.stderr)
+        return 1
+
+    try:
+        os.makedirs(args.output, exist_ok=True)
+    except OSError as e:
+        print(f"❌ 출력 폴더 생성 실패: {e}", file=sys.stderr)
+        return 1
+
+    total_files = len(document_files)
+    merging = args.merge is not None and total_files > 1
+    options = {
+        'chunk_size': args.chunk_size,
+        'chunk_unit': args.chunk_unit,
+        'tokenizer': args.tokenizer,
+        'include_toc': not args.no_toc,
+        'advanced_metadata': not args.no_metadata,
+        'gpt_optimized': args.gpt_optimized,
+        'compact_json': args.compact_json,
+        'epub_reader': args.epub_reader,
+        'parser_engine': args.parser,
+        'table_detection': args.table_detection,
+        'use_cache': not args.no_cache,
+        'cache_dir': args.cache_dir,
+        'cache_size_mb': args.cache_size,
+        'embed_timings': args.embed_timings,
+        'debug': args.debug
+    }
+
+    intermediate_dir = tempfile.mkdtemp(prefix="lexi_merge_") if merging else None
+    jobs = build_jobs(document_files, args.output, args.format, intermediate_dir)
+    if not merging:
+        for idx, doc_file, output_path in renamed_jobs(jobs):
+            log(f"⚠️ 같은 이름의 출력 파일이 있어 {os.path.basename(output_path)}로 저장합니다: {doc_file}")
+
+    # 증분 변환: 마지막 변환 이후 바뀌지 않은 파일은 건너뜀
+    manifest = None
+    if args.incremental:
+        if merging:
+            print("⚠️ 병합 출력에서는 증분 변환을 사용할 수 없어 모든 파일을 변환합니다.", file=sys.stderr)
+        else:
+            manifest = ConversionManifest(args.output)
+            settings = manifest_settings(options, args.format)
+            options['incremental'] = True
+            jobs, unchanged = manifest.plan(jobs, settings)
+            log(f"⏭️ 변경되지 않은 {len(unchanged)}개 파일을 건너뛰고 {len(jobs)}개 파일을 변환합니다.")
+            if args.prune:
+                deleted = manifest.prune(manifest.find_removed())
+                log(f"🗑️ 삭제된 입력 파일의 출력 {len(deleted)}개를 정리했습니다.")
+    total_jobs = len(jobs)
+
+    worker_count = max(1, args.workers or default_worker_count())
+    options['page_workers'] = max(1, args.page_workers or default_page_workers(worker_count, total_jobs))
+    log(f"📚 총 {total_jobs}개의 문서 파일을 {worker_count}개의 워커 프로세스로 변환합니다.")
+
+    pool = ConversionPool(worker_count)
+    merge_writer = None
+    finished = []
+    failures = 0
+    completed = 0
+    try:
+        if merging:
+            # 끝난 문서부터 입력 순서대로 병합 파일에 바로 기록
+            output_path = merged_output_path(args.output, args.merge, args.format)
+            merge_writer = MergedBatchWriter(output_path, args.format, jobs, args.gpt_optimized,
+                                             args.compact_json)
+
+        for idx, record in pool.run(jobs, "json" if merging else args.format, options):
+            completed += 1
+            finished.append(record)
+            if record['success']:
+                log(f"[{completed}/{total_jobs}] ✅ {record['file']}")
+                if manifest:
+                    manifest.record(record, settings)
+                if args.debug:
+                    log(f" - {record['item_count']}개 항목, 구조: {', '.join(record['keys'])}, "
+                        f"출력 크기: {record['output_size'] / 1024:.2f} KB")
+                    log(f" - {record['seconds']:.3f}초: {format_stage_stats(record['stages'])}")
+            else:
+                failures += 1
+                print(f"[{completed}/{total_jobs}] ❌ {record['file']}: {record['error']}", file=sys.stderr)
+                if args.debug and record.get('traceback'):
+                    print(record['traceback'], file=sys.stderr)
+            if merge_writer:
+                merge_writer.add(idx, record)
+
+        if options['use_cache']:
+            cache_hits, cache_misses = summarize_cache(finished)
+            log(f"💾 변환 캐시: 적중 {cache_hits}개, 미스 {cache_misses}개")
+
+        table_skipped, table_pages = summarize_table_detection(finished)
+        if table_pages:
+            log(f"📊 PDF 표 탐지 생략: {table_pages}페이지 중 {table_skipped}페이지")
+
+        stages = summarize_stages(finished)
+        if stages:
+            log(f"⏱️ 단계별 처리 시간: {format_stage_stats(stages)}")
+        if args.report:
+            success, error = write_run_report(finished, args.report)
+            if success:
+                log(f"📝 처리 시간 보고서 저장 완료: {args.report}")
+            else:
+                print(f"⚠️ 처리 시간 보고서 저장 실패: {error}", file=sys.stderr)
+
+        if merge_writer:
+            success, error = merge_writer.close()
+            merge_writer = None
+            if not success:
+                print(f"❌ 병합 파일 저장 실패: {error}", file=sys.stderr)
+                return 1
+            log(f"📦 병합된 파일 저장 완료: {output_path}")
+    except KeyboardInterrupt:
+        print("⚠️ 사용자 요청으로 변환이 중단되었습니다.", file=sys.stderr)
+        return 130
+    except Exception as e:
+        print(f"❌ 변환 중 오류 발생: {str(e)}", file=sys.stderr)
+        return 1
+    finally:
+        pool.shutdown()
+        if merge_writer:
+            # 중단되었거나 오류가 난 경우 작성 중이던 병합 파일 삭제
+            merge_writer.abort()
+        if manifest:
+            manifest.save()
+        if intermediate_dir:
+            shutil.rmtree(intermediate_dir, ignore_errors=True)
+
+    log(f"🎉 변환 완료: 성공 {total_jobs - failures}개, 실패 {failures}개")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -1,6 +1,10 @@
 # main.py
+import multiprocessing
+
 from ui.main_app import DoctoJSONApp
 
 if __name__ == "__main__":
+    # PyInstaller 실행 파일에서 변환 워커 프로세스를 사용하기 위해 필요
+    multiprocessing.freeze_support()
     app = DoctoJSONApp()
     app.mainloop()
@@ -0,0 +1,117 @@
+# scripts/bench_file_discovery.py
+"""
+파일 검색 처리량 측정 스크립트
+
+사용 예:
+    python scripts/bench_file_discovery.py --entries 1000000
+    python scripts/bench_file_discovery.py --path //nas/share/docs --pattern "*.pdf" --workers 16
+
+--path가 없으면 임시 폴더에 --entries개 항목(파일과 폴더)으로 된 트리를 만든 뒤 측정하고 지웁니다.
+이전 방식(os.walk 안에서 폴더마다 glob 다시 나열, os.walk + 확장자 비교)과
+utils.file_discovery(os.scandir, 스레드 수별)의 검색 시간과 초당 항목 수를 비교합니다.
+"""
+import os
+import sys
+import glob
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.file_discovery import iter_files
+
+EXTENSIONS = (".txt", ".pdf", ".py", ".json", ".epub", ".md")
+
+
+def make_tree(root, entries, files_per_dir):
+    """폴더마다 files_per_dir개 파일, 하위 폴더 8개씩 두어 entries개 항목의 트리를 만듭니다."""
+    created = 0
+    queue = [root]
+    index = 0
+    while created < entries:
+        folder = queue[index]
+        index += 1
+        for i in range(files_per_dir):
+            if created >= entries:
+                break
+            with open(os.path.join(folder, f"file_{created}{EXTENSIONS[created % len(EXTENSIONS)]}"), 'wb'):
+                pass
+            created += 1
+        for i in range(8):
+            if created >= entries:
+                break
+            sub = os.path.join(folder, f"dir_{created}")
+            os.mkdir(sub)
+            queue.append(sub)
+            created += 1
+    return created
+
+
+def walk_glob(root, pattern):
+    """이전 merge_text_files 방식: os.walk의 폴더마다 glob으로 다시 나열"""
+    files = []
+    for folder, _, _ in os.walk(root):
+        files.extend(glob.glob(os.path.join(folder, pattern)))
+    return files
+
+
+def walk_suffix(root, pattern):
+    """이전 find_document_files 방식: os.walk + 확장자 비교"""
+    suffix = pattern.lstrip("*").lower()
+    files = []
+    for folder, _, filenames in os.walk(root):
+        for name in filenames:
+            if name.lower().endswith(suffix):
+                files.append(os.path.join(folder, name))
+    return files
+
+
+def measure(label, func, repeat, entries):
+    best = None
+    count = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = len(func())
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    rate = f", {entries / best:,.0f}항목/s" if entries else ""
+    print(f"{label:28s} {best:8.3f}초  파일 {count:,}개{rate}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="파일 검색 처리량 측정")
+    parser.add_argument("--path", default=None, help="측정할 기존 폴더 (없으면 임시 트리 생성)")
+    parser.add_argument("--entries", type=int, default=200000, help="생성할 트리의 항목 수 (기본: 200000)")
+    parser.add_argument("--files-per-dir", type=int, default=40, help="생성할 트리의 폴더당 파일 수 (기본: 40)")
+    parser.add_argument("--pattern", default="*.pdf", help="검색할 파일 패턴 (기본: *.pdf)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8], help="측정할 스레드 수 (기본: 1 8)")
+    parser.add_argument("--repeat", type=int, default=3, help="방식별 반복 횟수 (기본: 3, 최솟값 출력)")
+    args = parser.parse_args()
+
+    temp_root = None
+    entries = 0
+    if args.path:
+        root = args.path
+    else:
+        temp_root = tempfile.mkdtemp(prefix="lexi_discovery_")
+        root = temp_root
+        start = time.perf_counter()
+        entries = make_tree(root, args.entries, args.files_per_dir)
+        print(f"트리 생성: {entries:,}개 항목, {time.perf_counter() - start:.1f}초")
+
+    try:
+        measure("os.walk + glob (이전 병합)", lambda: walk_glob(root, args.pattern), args.repeat, entries)
+        measure("os.walk + 확장자 (이전 검색)", lambda: walk_suffix(root, args.pattern), args.repeat, entries)
+        for workers in args.workers:
+            measure(f"scandir ({workers} 스레드)",
+                    lambda: list(iter_files(root, patterns=[args.pattern], ignore_case=True, workers=workers)),
+                    args.repeat, entries)
+    finally:
+        if temp_root:
+            shutil.rmtree(temp_root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
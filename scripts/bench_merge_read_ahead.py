@@ -0,0 +1,96 @@
+# scripts/bench_merge_read_ahead.py
+"""
+코드 파일 병합(merge_code_files) 처리량 측정 스크립트
+
+사용 예:
+    python scripts/bench_merge_read_ahead.py --files 5000 --latency-ms 5
+    python scripts/bench_merge_read_ahead.py --path //nas/share/repo --ext .py --workers 1 8 16
+
+--path가 없으면 임시 폴더에 --files개의 작은 코드 파일을 만든 뒤 측정하고 지웁니다.
+--latency-ms를 주면 병합 중 파일을 열 때마다 그만큼 기다리게 하여 네트워크 드라이브를 흉내 냅니다.
+미리 읽기 스레드 수별로 병합 시간과 초당 파일 수를 출력하고, 결과 파일이 모두 같은지 확인합니다.
+"""
+import os
+import re
+import sys
+import time
+import shutil
+import builtins
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import converters.file_merger as file_merger
+
+
+def make_tree(root, count, size, ext):
+    """폴더마다 100개씩 count개의 코드 파일(약 size바이트)을 만듭니다."""
+    line = "print('lexi convert merge benchmark')\n"
+    body = line * max(1, size // len(line))
+    for i in range(count):
+        folder = os.path.join(root, f"pkg_{i // 100:04d}")
+        os.makedirs(folder, exist_ok=True)
+        with open(os.path.join(folder, f"module_{i:06d}{ext}"), 'w', encoding='utf-8') as f:
+            f.write(f"# module {i}\n{body}")
+
+
+def slow_open(latency):
+    """파일을 열 때마다 latency초 기다리는 open (병합 모듈 안에서만 사용)"""
+    def _open(*args, **kwargs):
+        time.sleep(latency)
+        return builtins.open(*args, **kwargs)
+    return _open
+
+
+def read_output(path):
+    """생성 시간 줄을 뺀 결과 파일 내용"""
+    with open(path, 'rb') as f:
+        return re.sub(rb'# \xec\x83\x9d\xec\x84\xb1 \xec\x8b\x9c\xea\xb0\x84: [^\n]*', b'', f.read())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="코드 파일 병합 처리량 측정 (미리 읽기 스레드 수별)")
+    parser.add_argument("--path", default=None, help="병합할 기존 폴더 (없으면 임시 트리 생성)")
+    parser.add_argument("--ext", default=".py", help="병합할 파일 확장자 (기본: .py)")
+    parser.add_argument("--files", type=int, default=3000, help="생성할 파일 수 (기본: 3000)")
+    parser.add_argument("--size", type=int, default=2048, help="생성할 파일 크기 (바이트, 기본: 2048)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="파일을 열 때마다 추가할 지연 (ms, 기본: 0)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8, 16],
+                        help="측정할 미리 읽기 스레드 수 (기본: 1 4 8 16, 1은 순차 병합)")
+    parser.add_argument("--read-ahead-mb", type=int, default=file_merger.DEFAULT_READ_AHEAD_MB,
+                        help=f"미리 읽기 한도 (MB, 기본: {file_merger.DEFAULT_READ_AHEAD_MB})")
+    args = parser.parse_args()
+
+    temp_root = tempfile.mkdtemp(prefix="lexi_merge_bench_")
+    root = args.path
+    if not root:
+        root = os.path.join(temp_root, "tree")
+        make_tree(root, args.files, args.size, args.ext)
+        print(f"트리 생성: 파일 {args.files:,}개, 파일당 약 {args.size:,}바이트")
+    if args.latency_ms:
+        file_merger.open = slow_open(args.latency_ms / 1000)
+        print(f"파일 열기 지연: {args.latency_ms}ms")
+
+    try:
+        outputs = []
+        for workers in args.workers:
+            output_path = os.path.join(temp_root, f"merged_{workers}.txt")
+            start = time.perf_counter()
+            success, message = file_merger.merge_code_files(root, output_path, args.ext,
+                                                            read_workers=workers, read_ahead_mb=args.read_ahead_mb)
+            elapsed = time.perf_counter() - start
+            if not success:
+                print(f"{workers:3d} 스레드: 실패 ({message})")
+                continue
+            count = int(message.split("개", 1)[0])
+            print(f"{workers:3d} 스레드 {elapsed:8.3f}초  {count / elapsed:10,.0f}개/초")
+            outputs.append(read_output(output_path))
+        if outputs:
+            print("결과 파일 동일:", "예" if all(output == outputs[0] for output in outputs) else "아니오")
+    finally:
+        shutil.rmtree(temp_root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
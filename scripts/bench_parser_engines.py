@@ -0,0 +1,75 @@
+# scripts/bench_parser_engines.py
+"""
+EPUB/HTML 파싱 엔진별 처리량 측정 스크립트
+
+사용 예:
+    python scripts/bench_parser_engines.py 책.epub 리포트.html -n 3
+
+엔진마다 같은 파일을 변환해 초당 처리량(MB/s, 챕터/s)을 출력하고,
+기본 엔진(html.parser)과 청크 결과가 같은지 확인합니다.
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from converters.common import file_to_json
+from converters.parser_engines import PARSER_ENGINES, DEFAULT_PARSER_ENGINE
+
+
+def _chunks_of(document):
+    """비교용으로 문서의 청크/섹션 목록을 딕셔너리로 반환합니다."""
+    return document.to_dict()[document.body_key]
+
+
+def bench_engine(files, engine, repeat, chunk_size, gpt_optimized):
+    """엔진 하나로 모든 파일을 repeat번 변환하고 (최단 시간, 항목 수, 결과 목록)을 반환합니다."""
+    best = None
+    items = 0
+    results = []
+    for _ in range(repeat):
+        results = []
+        items = 0
+        start = time.perf_counter()
+        for path in files:
+            document, error = file_to_json(path, chunk_size, gpt_optimized=gpt_optimized, parser_engine=engine)
+            if error:
+                raise RuntimeError(f"{path}: {error}")
+            chunks = _chunks_of(document)
+            items += len(chunks)
+            results.append(chunks)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, items, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="EPUB/HTML 파싱 엔진별 처리량 측정")
+    parser.add_argument("files", nargs="+", help="측정할 EPUB/HTML 파일")
+    parser.add_argument("-n", "--repeat", type=int, default=3, help="반복 횟수 (최단 시간 사용, 기본: 3)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="텍스트 청크 크기 (기본: 1000)")
+    parser.add_argument("--gpt-optimized", action="store_true", help="GPT 최적화 모드로 변환")
+    args = parser.parse_args(argv)
+
+    files = [path for path in args.files if path.lower().endswith(('.epub', '.html', '.htm'))]
+    if not files:
+        print("❌ 측정할 EPUB/HTML 파일이 없습니다.", file=sys.stderr)
+        return 1
+    total_mb = sum(os.path.getsize(path) for path in files) / (1024 * 1024)
+    print(f"📚 파일 {len(files)}개, {total_mb:.2f} MB, 반복 {args.repeat}회")
+
+    baseline = None
+    for engine in (DEFAULT_PARSER_ENGINE,) + tuple(e for e in PARSER_ENGINES if e != DEFAULT_PARSER_ENGINE):
+        elapsed, items, results = bench_engine(files, engine, args.repeat, args.chunk_size, args.gpt_optimized)
+        if baseline is None:
+            baseline = (elapsed, results)
+        same = "동일" if results == baseline[1] else "다름"
+        print(f"{engine:12s} {elapsed:8.3f}초  {total_mb / elapsed:8.2f} MB/s  {items / elapsed:10.1f} 항목/s  "
+              f"x{baseline[0] / elapsed:.2f}  기본 엔진과 결과 {same}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+# scripts/bench_startup.py
+"""
+시작 시간 측정 스크립트
+
+사용 예:
+    python scripts/bench_startup.py
+    python scripts/bench_startup.py --repeat 10 --root ../Python_Lexi_Convert_old
+
+매번 새 파이썬 프로세스에서 GUI/명령줄/변환 워커가 시작할 때 하는 일
+(모듈 import와 필수 모듈 확인)의 시간을 재고, 그 사이에 불러온 무거운 의존성 모듈을 출력합니다.
+--root를 주면 다른 체크아웃(예: 이전 버전의 git worktree)도 같은 방식으로 재어 비교합니다.
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+import statistics
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 시작할 때 불러오지 않아야 하는 무거운 의존성
+HEAVY_MODULES = ("fitz", "pandas", "numpy", "bs4", "lxml", "ebooklib", "PIL")
+
+# 측정 대상: 이름 -> 새 프로세스에서 실행할 코드
+TARGETS = {
+    "gui": "import ui.main_app\n"
+           "from utils.module_checker import find_missing_modules\n"
+           "find_missing_modules()",
+    "cli": "import lexi_convert\n"
+           "lexi_convert.build_parser()\n"
+           "lexi_convert.find_missing_modules()\n"
+           "import converters.batch, converters.manifest",
+    "worker": "import converters.batch",
+}
+
+MEASURE_CODE = """
+import sys, time, json
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+exec({code!r})
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(root, code, repeat):
+    """새 프로세스에서 code를 repeat번 실행하여 (중앙값 시간, 불러온 무거운 모듈)을 반환합니다."""
+    times = []
+    loaded = []
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-c", MEASURE_CODE.format(root=root, code=code, heavy=HEAVY_MODULES)],
+            cwd=root, capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "실행 실패")
+        # fitz 등이 표준 출력에 경고를 쓸 수 있으므로 마지막 줄만 사용
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        times.append(result['seconds'])
+        loaded = result['loaded']
+    return statistics.median(times), loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GUI/명령줄/워커 시작 시간 측정")
+    parser.add_argument("--repeat", type=int, default=5, help="대상별 반복 횟수 (기본: 5, 중앙값 출력)")
+    parser.add_argument("--root", default=None, help="비교할 다른 체크아웃 경로")
+    parser.add_argument("--targets", nargs="+", choices=list(TARGETS), default=list(TARGETS),
+                        help="측정 대상 (기본: 전체)")
+    args = parser.parse_args()
+
+    roots = [("현재", REPO_ROOT)]
+    if args.root:
+        roots.append(("비교", os.path.abspath(args.root)))
+
+    for target in args.targets:
+        results = []
+        for label, root in roots:
+            try:
+                seconds, loaded = measure(root, TARGETS[target], args.repeat)
+            except RuntimeError as e:
+                print(f"{target:7s} {label}: 실패 ({e})")
+                continue
+            results.append(seconds)
+            print(f"{target:7s} {label}: {seconds * 1000:8.1f} ms  불러온 의존성: {', '.join(loaded) or '없음'}")
+        if len(results) == 2 and results[0] > 0:
+            print(f"{target:7s} 비교 대비 {results[1] / results[0]:.1f}배 빠름")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+# scripts/bench_text_chunking.py
+"""
+split_text_into_chunks 처리량 측정 스크립트
+
+사용 예:
+    python scripts/bench_text_chunking.py --mb 100
+    python scripts/bench_text_chunking.py --mb 100 --reference-mb 2
+
+세 가지 합성 텍스트(일반 단락, 문장 분할이 필요한 긴 단락, 문장부호 없는 CJK 텍스트)를
+--mb 크기로 만들어 청크 분할 시간과 처리량(MB/s)을 출력합니다.
+--reference-mb를 주면 이전 방식(문자열 이어 붙이기) 구현과 결과와 시간을 비교합니다.
+"""
+import os
+import re
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.text_utils import split_text_into_chunks
+
+WORDS = ["문서", "변환", "텍스트", "청크", "knowledge", "convert", "시스템", "데이터", "분석", "report"]
+
+
+def make_paragraph_text(size, rng):
+    """청크 크기보다 짧은 단락들로 이루어진 텍스트"""
+    parts = []
+    total = 0
+    while total < size:
+        sentence_count = rng.randint(1, 6)
+        para = " ".join(" ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 14))) + "."
+                        for _ in range(sentence_count))
+        parts.append(para)
+        total += len(para) + 2
+    return "\n\n".join(parts)[:size]
+
+
+def make_long_paragraph_text(size, rng):
+    """청크 크기보다 긴 단락들 (문장 단위 분할 경로)"""
+    parts = []
+    total = 0
+    while total < size:
+        para = " ".join(" ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 14))) + rng.choice(".!?")
+                        for _ in range(rng.randint(40, 200)))
+        parts.append(para)
+        total += len(para) + 2
+    return "\n\n".join(parts)[:size]
+
+
+def make_unbroken_text(size, rng):
+    """문장부호와 단락 구분이 없는 CJK 텍스트 (강제 분할 경로)"""
+    block = "".join(rng.choice("가나다라마바사아자차카타파하漢字文書") for _ in range(4096))
+    return (block * (size // len(block) + 1))[:size]
+
+
+def reference_split_text_into_chunks(text, chunk_size=1000):
+    """비교용: 문자열을 이어 붙이던 이전 구현"""
+    chunks = []
+    current_chunk = ""
+    for para in text.split('\n\n'):
+        if not para.strip():
+            continue
+        if len(current_chunk) + len(para) > chunk_size:
+            if current_chunk:
+                chunks.append(current_chunk.strip())
+                current_chunk = ""
+            if len(para) > chunk_size:
+                for sentence in re.split(r'(?<=[.!?])\s+', para):
+                    if len(current_chunk) + len(sentence) > chunk_size:
+                        if current_chunk:
+                            chunks.append(current_chunk.strip())
+                            current_chunk = ""
+                        if len(sentence) > chunk_size:
+                            while sentence:
+                                chunks.append(sentence[:chunk_size].strip())
+                                sentence = sentence[chunk_size:]
+                        else:
+                            current_chunk = sentence
+                    else:
+                        current_chunk += " " + sentence if current_chunk else sentence
+            else:
+                current_chunk = para
+        else:
+            current_chunk += "\n\n" + para if current_chunk else para
+    if current_chunk:
+        chunks.append(current_chunk.strip())
+    return chunks
+
+
+def timed(func, text, chunk_size):
+    start = time.perf_counter()
+    chunks = func(text, chunk_size)
+    return time.perf_counter() - start, chunks
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="split_text_into_chunks 처리량 측정")
+    parser.add_argument("--mb", type=float, default=100, help="텍스트 크기 (백만 문자, 기본: 100)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="청크 크기 (기본: 1000)")
+    parser.add_argument("--reference-mb", type=float, default=0,
+                        help="이전 구현과 비교할 텍스트 크기 (백만 문자, 0이면 비교 안 함)")
+    parser.add_argument("--seed", type=int, default=0, help="난수 시드")
+    args = parser.parse_args(argv)
+
+    generators = [
+        ("단락", make_paragraph_text),
+        ("긴 단락", make_long_paragraph_text),
+        ("CJK 연속", make_unbroken_text),
+    ]
+    size = int(args.mb * 1_000_000)
+    for name, generate in generators:
+        text = generate(size, random.Random(args.seed))
+        elapsed, chunks = timed(split_text_into_chunks, text, args.chunk_size)
+        print(f"{name:8s} {len(text) / 1_000_000:8.1f}M자  {elapsed:8.3f}초  "
+              f"{len(text) / 1_000_000 / elapsed:8.1f} M자/s  청크 {len(chunks)}개")
+        del text, chunks
+
+        if args.reference_mb:
+            text = generate(int(args.reference_mb * 1_000_000), random.Random(args.seed))
+            new_elapsed, new_chunks = timed(split_text_into_chunks, text, args.chunk_size)
+            old_elapsed, old_chunks = timed(reference_split_text_into_chunks, text, args.chunk_size)
+            same = "동일" if new_chunks == old_chunks else "다름"
+            print(f"{'':8s} 이전 구현 {len(text) / 1_000_000:.1f}M자: {old_elapsed:.3f}초 vs {new_elapsed:.3f}초 "
+                  f"(x{old_elapsed / new_elapsed:.1f}), 결과 {same}")
+            del text, new_chunks, old_chunks
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
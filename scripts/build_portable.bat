@@ -4,9 +4,13 @@ REM PyInstaller를 이용해 폴더 형태의 실행 파일 생성
 REM --windowed: 콘솔 창 없이 GUI 모드로 실행
 REM --icon: 실행 파일 아이콘 지정
 REM --add-data: 추가 데이터 파일 포함 (이미지 등)
+REM --hidden-import: 확장자별로 필요할 때 불러오는 변환기 모듈 (import 문이 없어 자동으로 포함되지 않음)
 
 pyinstaller --noconfirm --windowed --icon="..\assets\images\Lexi_Convert.png" ^
 --add-data "..\assets\images\Lexi_Convert.png;assets\images" ^
+--hidden-import converters.epub_converter --hidden-import converters.pdf_converter ^
+--hidden-import converters.html_converter --hidden-import converters.parser_engines ^
+--hidden-import converters.epub_reader ^
 --name "Lexi_Convert_Portable" ^
 ..\main.py
 
@@ -0,0 +1,111 @@
+# tests/test_file_discovery.py
+"""utils.file_discovery의 .gitignore 형식 제외 규칙과 파일 검색 테스트"""
+import os
+
+import pytest
+
+from utils.file_discovery import ExcludeRules, iter_files, find_files
+
+
+def make_files(root, paths):
+    """root 아래에 상대 경로('/' 구분) 목록의 빈 파일을 만듭니다."""
+    for path in paths:
+        full_path = os.path.join(root, *path.split('/'))
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, 'wb'):
+            pass
+
+
+def relative(root, files):
+    return [os.path.relpath(path, root).replace(os.sep, '/') for path in files]
+
+
+@pytest.mark.parametrize("rules, rel_path, name, is_dir, expected", [
+    # '/'가 없는 패턴: 모든 깊이의 이름과 비교
+    (["*.log"], "debug.log", "debug.log", False, True),
+    (["*.log"], "a/b/debug.log", "debug.log", False, True),
+    (["*.log"], "a/b/debug.txt", "debug.txt", False, False),
+    # '*'와 '?'는 '/'를 넘지 않음
+    (["a*c"], "abc", "abc", False, True),
+    (["a?c"], "abc", "abc", False, True),
+    (["a?c"], "abbc", "abbc", False, False),
+    # '/'로 끝나는 패턴: 폴더에만 적용
+    (["build/"], "build", "build", True, True),
+    (["build/"], "src/build", "build", True, True),
+    (["build/"], "build", "build", False, False),
+    # '/'가 있는 패턴: 시작 폴더 기준 상대 경로와 비교
+    (["/docs/tmp"], "docs/tmp", "tmp", True, True),
+    (["/docs/tmp"], "src/docs/tmp", "tmp", True, False),
+    (["docs/tmp"], "docs/tmp", "tmp", True, True),
+    (["docs/*.md"], "docs/a.md", "a.md", False, True),
+    (["docs/*.md"], "docs/sub/a.md", "a.md", False, False),
+    # "**/": 0개 이상의 폴더
+    (["**/cache"], "cache", "cache", True, True),
+    (["**/cache"], "a/b/cache", "cache", True, True),
+    (["**/cache"], "a/b/cache2", "cache2", True, False),
+    (["docs/**/tmp"], "docs/tmp", "tmp", True, True),
+    (["docs/**/tmp"], "docs/a/b/tmp", "tmp", True, True),
+    # 끝의 "**": 하위 항목 전체
+    (["logs/**"], "logs/a/b.txt", "b.txt", False, True),
+    # '!': 앞 규칙에서 제외된 항목을 다시 포함, 마지막으로 맞은 규칙이 적용
+    (["*.log", "!keep.log"], "keep.log", "keep.log", False, False),
+    (["*.log", "!keep.log"], "drop.log", "drop.log", False, True),
+    (["!keep.log", "*.log"], "keep.log", "keep.log", False, True),
+    # 문자 범위, 역슬래시 이스케이프
+    (["file[0-9].txt"], "file3.txt", "file3.txt", False, True),
+    (["file[!0-9].txt"], "file3.txt", "file3.txt", False, False),
+    (["file[!0-9].txt"], "fileA.txt", "fileA.txt", False, True),
+    (["\\!important"], "!important", "!important", False, True),
+    # 주석과 빈 줄은 무시
+    (["# *.log", ""], "debug.log", "debug.log", False, False),
+])
+def test_exclude_rules(rules, rel_path, name, is_dir, expected):
+    assert ExcludeRules(rules).excluded(rel_path, name, is_dir) is expected
+
+
+def test_empty_rules_are_falsy():
+    assert not ExcludeRules(["# 주석", "", "/"])
+    assert ExcludeRules(["*.log"])
+
+
+def test_iter_files_applies_excludes(tmp_path):
+    make_files(tmp_path, [
+        "a.txt", "debug.log", "keep.log",
+        "build/out.txt", "src/build/out.txt", "src/main.txt",
+        "docs/tmp/x.txt", "docs/readme.txt", "src/docs/tmp/y.txt",
+        "deep/er/cache/z.txt",
+    ])
+    files = find_files(str(tmp_path), excludes=["build/", "*.log", "/docs/tmp", "**/cache", "!keep.log"])
+    assert sorted(relative(tmp_path, files)) == [
+        "a.txt", "docs/readme.txt", "keep.log", "src/docs/tmp/y.txt", "src/main.txt",
+    ]
+
+
+def test_excluded_folder_contents_are_not_reincluded(tmp_path):
+    # 제외된 폴더의 하위 항목은 검사하지 않으므로 '!'로 다시 포함할 수 없음 (.gitignore와 같음)
+    make_files(tmp_path, ["build/keep.txt", "other.txt"])
+    files = find_files(str(tmp_path), excludes=["build/", "!build/keep.txt"])
+    assert relative(tmp_path, files) == ["other.txt"]
+
+
+def test_patterns_hidden_and_recursive(tmp_path):
+    make_files(tmp_path, ["a.py", "b.txt", ".hidden.py", ".git/c.py", "pkg/d.py", "pkg/E.PY"])
+    root = str(tmp_path)
+    assert sorted(relative(tmp_path, find_files(root, patterns=["*.py"], include_hidden=False, ignore_case=False))) == [
+        "a.py", "pkg/d.py",
+    ]
+    assert sorted(relative(tmp_path, find_files(root, patterns=["*.py"], include_hidden=False, ignore_case=True))) == [
+        "a.py", "pkg/E.PY", "pkg/d.py",
+    ]
+    assert sorted(relative(tmp_path, find_files(root, patterns=["*.py"], recursive=False))) == [".hidden.py", "a.py"]
+
+
+def test_parallel_order_matches_serial(tmp_path):
+    make_files(tmp_path, [f"d{i}/s{j}/f{k}.txt" for i in range(4) for j in range(3) for k in range(3)]
+               + ["top.txt"])
+    root = str(tmp_path)
+    serial = list(iter_files(root, workers=1))
+    assert list(iter_files(root, workers=8)) == serial
+    # os.walk와 같은 순서 (폴더의 파일을 먼저, 그다음 하위 폴더)
+    walked = [os.path.join(folder, name) for folder, _, names in os.walk(root) for name in names]
+    assert serial == walked
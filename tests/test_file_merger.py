@@ -0,0 +1,114 @@
+# tests/test_file_merger.py
+"""converters.file_merger의 바이트 복사 병합과 미리 읽기(read-ahead) 테스트"""
+import os
+import re
+import threading
+
+import pytest
+
+from converters.file_merger import merge_code_files, merge_text_files, _iter_read_ahead
+
+# 병합할 때마다 달라지는 생성 시간 줄
+_TIMESTAMP_LINE = re.compile(rb'# \xec\x83\x9d\xec\x84\xb1 \xec\x8b\x9c\xea\xb0\x84: [^\n]*\n')
+# 병합이 끝나지 않으면(교착 상태) 실패로 처리할 시간 (초)
+MERGE_TIMEOUT = 60
+
+
+def write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def read_merged(path):
+    with open(path, 'rb') as f:
+        return _TIMESTAMP_LINE.sub(b'', f.read())
+
+
+def run_with_timeout(func, *args, **kwargs):
+    """func를 스레드에서 실행하고, MERGE_TIMEOUT 안에 끝나지 않으면 테스트를 실패시킵니다."""
+    result = []
+    thread = threading.Thread(target=lambda: result.append(func(*args, **kwargs)), daemon=True)
+    thread.start()
+    thread.join(MERGE_TIMEOUT)
+    assert not thread.is_alive(), "병합이 끝나지 않았습니다 (미리 읽기 교착 상태)"
+    return result[0]
+
+
+@pytest.fixture
+def code_tree(tmp_path):
+    """크기가 여러 가지인 코드 파일, 줄바꿈 없는 파일, 빈 파일, 바이너리 파일이 섞인 트리"""
+    root = tmp_path / "src"
+    for i in range(60):
+        size = (0, 10, 3000, 40000, 200000)[i % 5]
+        body = (f"# module {i}\n".encode() + b"x = 1\n" * (size // 6))
+        if i % 7 == 0:
+            body = body.rstrip(b"\n")
+        write(str(root / f"pkg{i % 4}" / f"m{i:03d}.py"), body)
+    write(str(root / "crlf.py"), b"a = 1\r\nb = 2\r\n")
+    write(str(root / "blob.py"), b"\x89PNG\x00\x01\x02" + b"\xff" * 100000)
+    return str(root)
+
+
+@pytest.mark.parametrize("read_ahead_mb", [0.01, 1])
+def test_read_ahead_output_matches_serial(code_tree, tmp_path, read_ahead_mb):
+    serial_path = str(tmp_path / "serial.txt")
+    parallel_path = str(tmp_path / "parallel.txt")
+    success, _ = run_with_timeout(merge_code_files, code_tree, serial_path, ".py", read_workers=1)
+    assert success
+    success, message = run_with_timeout(merge_code_files, code_tree, parallel_path, ".py",
+                                        read_workers=8, read_ahead_mb=read_ahead_mb)
+    assert success
+    assert "미리 읽기 8스레드" in message
+    assert read_merged(parallel_path) == read_merged(serial_path)
+
+
+@pytest.mark.parametrize("read_workers", [1, 8])
+def test_files_are_merged_in_sorted_order(code_tree, tmp_path, read_workers):
+    output_path = str(tmp_path / "merged.txt")
+    merge_code_files(code_tree, output_path, ".py", include_folder_structure=False,
+                     read_workers=read_workers, read_ahead_mb=0.01)
+    names = re.findall(rb'^\xed\x8c\x8c\xec\x9d\xbc: (.+)$', read_merged(output_path), re.MULTILINE)
+    expected = sorted(os.path.join(folder, name)
+                      for folder, _, files in os.walk(code_tree) for name in files)
+    assert [name.decode() for name in names] == [os.path.basename(path) for path in expected]
+
+
+@pytest.mark.parametrize("read_workers", [1, 8])
+def test_binary_files_are_skipped(code_tree, tmp_path, read_workers):
+    output_path = str(tmp_path / "merged.txt")
+    success, message = merge_code_files(code_tree, output_path, ".py", read_workers=read_workers)
+    assert success
+    assert "바이너리 파일 1개 건너뜀" in message
+    merged = read_merged(output_path)
+    assert "[바이너리 파일 건너뜀]".encode() in merged
+    assert b"\x89PNG" not in merged
+
+
+def test_contents_copied_byte_for_byte(tmp_path):
+    root = tmp_path / "docs"
+    write(str(root / "a.txt"), "한글\r\n줄바꿈".encode())
+    write(str(root / "b.txt"), b"")
+    output_path = str(tmp_path / "merged.txt")
+    merge_text_files(str(root), output_path, "*.txt", read_workers=1)
+    merged = read_merged(output_path)
+    # 내용은 원본 그대로, 병합기가 쓰는 줄(헤더, 구분선, 빈 줄)은 모두 '\n'
+    assert "\n파일: a.txt\n".encode() + b"=" * 80 + "\n\n한글\r\n줄바꿈\n\n".encode() in merged
+    assert merged.replace(b"\r\n", b"").count(b"\r") == 0
+
+
+def test_read_ahead_stops_workers_when_closed(tmp_path):
+    files = []
+    for i in range(50):
+        path = str(tmp_path / f"f{i}.txt")
+        write(path, b"x" * 50000)
+        files.append(path)
+    reader = _iter_read_ahead(files, 4, 0.1)
+    for _ in range(3):
+        file_path, prefetched = next(reader)
+        assert prefetched.result() == b"x" * 50000
+    reader.close()
+    for thread in threading.enumerate():
+        if thread.name.startswith("merge-read"):
+            thread.join(MERGE_TIMEOUT)
+            assert not thread.is_alive()
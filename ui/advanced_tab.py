@@ -1,6 +1,7 @@
 # ui/advanced_tab.py
+import os
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, filedialog
 
 class AdvancedTab:
     """고급 설정 탭 관련 기능을 담당하는 클래스"""
@@ -28,6 +29,28 @@ class AdvancedTab:
         chunk_combo = ttk.Combobox(chunk_size_frame, textvariable=self.app.chunk_size,
                                values=chunk_values, width=10)
         chunk_combo.pack(side=tk.LEFT, padx=5)
+        ttk.Label(chunk_size_frame, text="단위:").pack(side=tk.LEFT, padx=5)
+        ttk.Combobox(chunk_size_frame, textvariable=self.app.chunk_unit, state="readonly",
+                   values=["chars", "tokens"], width=8).pack(side=tk.LEFT, padx=5)
+        ttk.Label(chunk_size_frame, text="(tokens: EPUB GPT 최적화 모드)").pack(side=tk.LEFT)
+        
+        tokenizer_frame = ttk.Frame(chunk_frame)
+        tokenizer_frame.pack(fill=tk.X, padx=10, pady=5)
+        ttk.Label(tokenizer_frame, text="토크나이저 파일:").pack(side=tk.LEFT, padx=5)
+        ttk.Entry(tokenizer_frame, textvariable=self.app.tokenizer_path, width=40).pack(side=tk.LEFT, padx=5)
+        ttk.Button(tokenizer_frame, text="찾아보기",
+                 command=self.select_tokenizer_file).pack(side=tk.LEFT, padx=5)
+        ttk.Label(tokenizer_frame, text="(비우면 추정)").pack(side=tk.LEFT)
+        
+        # 병렬 처리 설정
+        worker_frame = ttk.LabelFrame(parent, text="병렬 처리 설정")
+        worker_frame.pack(fill=tk.X, pady=10, padx=5)
+        
+        worker_count_frame = ttk.Frame(worker_frame)
+        worker_count_frame.pack(fill=tk.X, padx=10, pady=5)
+        ttk.Label(worker_count_frame, text="변환 워커 프로세스 수:").pack(side=tk.LEFT, padx=5)
+        ttk.Spinbox(worker_count_frame, from_=1, to=max(1, (os.cpu_count() or 1) * 2),
+                  textvariable=self.app.worker_count, width=8).pack(side=tk.LEFT, padx=5)
         
         # 2) 추가 옵션들
         options_frame = ttk.LabelFrame(parent, text="추가 옵션")
@@ -37,9 +60,42 @@ class AdvancedTab:
                       variable=self.app.include_toc).pack(anchor=tk.W, padx=10, pady=2)
         ttk.Checkbutton(options_frame, text="확장 메타데이터 추가 (파일 경로, 크기, 변환 일시 등)",
                       variable=self.app.advanced_metadata).pack(anchor=tk.W, padx=10, pady=2)
+        ttk.Checkbutton(options_frame, text="JSON 압축 저장 (들여쓰기 없이 저장하여 파일 크기 감소)",
+                      variable=self.app.compact_json).pack(anchor=tk.W, padx=10, pady=2)
+        ttk.Checkbutton(options_frame, text="EPUB 호환 모드 (ebooklib으로 이미지 등 전체 파일을 읽음)",
+                      variable=self.app.use_ebooklib_reader).pack(anchor=tk.W, padx=10, pady=2)
+        parser_frame = ttk.Frame(options_frame)
+        parser_frame.pack(fill=tk.X, padx=10, pady=2)
+        ttk.Label(parser_frame, text="파싱 엔진 (EPUB/HTML):").pack(side=tk.LEFT)
+        ttk.Combobox(parser_frame, textvariable=self.app.parser_engine, state="readonly",
+                   values=["html.parser", "bs4-lxml", "lxml"], width=12).pack(side=tk.LEFT, padx=5)
+        ttk.Label(parser_frame, text="(lxml이 가장 빠름)").pack(side=tk.LEFT)
+        
+        table_frame = ttk.Frame(options_frame)
+        table_frame.pack(fill=tk.X, padx=10, pady=2)
+        ttk.Label(table_frame, text="PDF 표 탐지:").pack(side=tk.LEFT)
+        ttk.Combobox(table_frame, textvariable=self.app.table_detection, state="readonly",
+                   values=["always", "auto", "never"], width=12).pack(side=tk.LEFT, padx=5)
+        ttk.Label(table_frame, text="(auto: 선/사각형이 있는 페이지만 검사)").pack(side=tk.LEFT)
+        
         ttk.Checkbutton(options_frame, text="마지막 사용 경로 저장",
                       variable=self.app.save_last_paths).pack(anchor=tk.W, padx=10, pady=2)
         
+        cache_frame = ttk.Frame(options_frame)
+        cache_frame.pack(fill=tk.X, padx=10, pady=2)
+        ttk.Checkbutton(cache_frame, text="변환 결과 캐시 사용 (바뀌지 않은 파일은 다시 변환하지 않음)",
+                      variable=self.app.use_cache).pack(side=tk.LEFT)
+        ttk.Label(cache_frame, text="최대 크기 (MB):").pack(side=tk.LEFT, padx=(10, 5))
+        ttk.Combobox(cache_frame, textvariable=self.app.cache_size_mb,
+                   values=[256, 512, 1024, 2048, 4096, 8192], width=8).pack(side=tk.LEFT)
+        
+        incremental_frame = ttk.Frame(options_frame)
+        incremental_frame.pack(fill=tk.X, padx=10, pady=2)
+        ttk.Checkbutton(incremental_frame, text="증분 변환 (새로 추가되거나 바뀐 파일만 변환)",
+                      variable=self.app.incremental).pack(side=tk.LEFT)
+        ttk.Checkbutton(incremental_frame, text="삭제된 입력 파일의 출력도 삭제",
+                      variable=self.app.prune_removed).pack(side=tk.LEFT, padx=(10, 0))
+        
         # 3) 병합 옵션
         merge_frame = ttk.LabelFrame(parent, text="병합 옵션")
         merge_frame.pack(fill=tk.X, pady=10, padx=5)
@@ -59,3 +115,19 @@ class AdvancedTab:
         
         ttk.Checkbutton(debug_frame, text="디버그 모드 활성화 (상세 로그 출력)",
                       variable=self.app.debug_mode).pack(anchor=tk.W, padx=10, pady=2)
+        ttk.Checkbutton(debug_frame, text="단계별 처리 시간을 출력 메타데이터에 포함",
+                      variable=self.app.embed_timings).pack(anchor=tk.W, padx=10, pady=2)
+        ttk.Checkbutton(debug_frame, text="처리 시간 보고서 저장 (출력 폴더/lexi_run_report.json)",
+                      variable=self.app.save_run_report).pack(anchor=tk.W, padx=10, pady=2)
+    
+    def select_tokenizer_file(self):
+        """토큰 수 계산에 쓸 어휘 파일 선택"""
+        file_path = filedialog.askopenfilename(
+            title="토크나이저 파일 선택",
+            filetypes=[
+                ("토크나이저 파일", "*.txt *.json"),
+                ("모든 파일", "*.*")
+            ]
+        )
+        if file_path:
+            self.app.tokenizer_path.set(file_path)
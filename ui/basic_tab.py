@@ -3,6 +3,8 @@ import os
 import tkinter as tk
 from tkinter import ttk, filedialog
 
+from ui.file_list_view import VirtualFileList
+
 class BasicTab:
     """기본 설정 탭 관련 기능을 담당하는 클래스"""
     
@@ -39,16 +41,9 @@ class BasicTab:
         ttk.Button(file_buttons_frame, text="파일 목록 초기화",
                  command=self.app.clear_files).pack(side=tk.LEFT)
         
-        # 선택된 파일 목록
-        file_list_frame = ttk.Frame(self.app.files_frame)
-        file_list_frame.pack(fill=tk.BOTH, expand=True, pady=5)
-        ttk.Label(file_list_frame, text="선택된 파일:").pack(anchor=tk.W)
-        file_list_scroll = ttk.Scrollbar(file_list_frame)
-        file_list_scroll.pack(side=tk.RIGHT, fill=tk.Y)
-        self.app.file_listbox = tk.Listbox(file_list_frame, height=6,
-                                      yscrollcommand=file_list_scroll.set)
-        self.app.file_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        file_list_scroll.config(command=self.app.file_listbox.yview)
+        # 선택된 파일 목록 (보이는 줄만 그리는 가상화 목록)
+        self.app.file_listbox = VirtualFileList(self.app.files_frame, label="선택된 파일:")
+        self.app.file_listbox.pack(fill=tk.BOTH, expand=True, pady=5)
         
         # 폴더 선택 영역 (폴더 선택 모드)
         self.app.folder_frame = ttk.Frame(input_frame)
@@ -71,6 +66,10 @@ class BasicTab:
         self.app.folder_files_label = ttk.Label(self.app.folder_frame, text="발견된 파일: 0개")
         self.app.folder_files_label.pack(anchor=tk.W, pady=5)
         
+        # 발견된 파일 목록 (검색하는 동안 차례로 추가됨)
+        self.app.folder_file_list = VirtualFileList(self.app.folder_frame, label="발견된 파일 목록:")
+        self.app.folder_file_list.pack(fill=tk.BOTH, expand=True, pady=5)
+        
         # 2) 출력 부분
         output_frame = ttk.LabelFrame(parent, text="출력 설정")
         output_frame.pack(fill=tk.BOTH, expand=True, pady=10, padx=5)
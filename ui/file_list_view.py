@@ -0,0 +1,169 @@
+# ui/file_list_view.py
+"""
+아주 많은 파일 목록을 위한 가상화 목록 위젯.
+
+Listbox에는 화면에 보이는 줄만 넣고, 스크롤바 위치는 전체 목록 기준으로 직접 계산합니다.
+위젯은 앱의 파일 경로 리스트를 복사하지 않고 그대로 참조하므로, 폴더 검색 중에 리스트 뒤에
+추가된 항목은 items_added()로 알려주기만 하면 됩니다.
+필터 입력란에 글자를 입력하면 파일 이름에 그 문자열이 들어 있는 항목만 표시합니다.
+"""
+import os
+import tkinter as tk
+import tkinter.font as tkfont
+from tkinter import ttk
+
+# 필터 입력 후 목록을 다시 거르기까지 기다리는 시간 (ms)
+FILTER_DELAY_MS = 150
+# 마우스 휠 한 칸에 움직이는 줄 수
+WHEEL_LINES = 3
+
+
+class VirtualFileList(ttk.Frame):
+    """파일 경로 리스트의 보이는 구간만 그리는 목록 (파일 이름 필터 포함)"""
+
+    def __init__(self, parent, label="선택된 파일:", height=6):
+        super().__init__(parent)
+        self._items = []
+        self._names = []        # 필터용 소문자 파일 이름 (필터를 처음 쓸 때부터 만듦)
+        self._view = None       # 필터에 맞는 항목 인덱스 목록 (필터가 없으면 None)
+        self._query = ""
+        self._seen = 0          # items_added()에서 이미 반영한 항목 수
+        self._first = 0         # 화면 첫 줄의 (필터 적용 후) 위치
+        self._rows = height
+        self._filter_job = None
+
+        header = ttk.Frame(self)
+        header.pack(fill=tk.X)
+        ttk.Label(header, text=label).pack(side=tk.LEFT)
+        self.count_label = ttk.Label(header, text="0개")
+        self.count_label.pack(side=tk.RIGHT)
+        self.filter_var = tk.StringVar()
+        ttk.Entry(header, textvariable=self.filter_var, width=20).pack(side=tk.RIGHT, padx=5)
+        ttk.Label(header, text="필터:").pack(side=tk.RIGHT)
+
+        body = ttk.Frame(self)
+        body.pack(fill=tk.BOTH, expand=True)
+        self.scrollbar = ttk.Scrollbar(body, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.listbox = tk.Listbox(body, height=height, activestyle=tk.NONE)
+        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.listbox.bind("<Configure>", self._on_resize)
+        self.listbox.bind("<MouseWheel>", self._on_wheel)
+        self.listbox.bind("<Button-4>", self._on_wheel)
+        self.listbox.bind("<Button-5>", self._on_wheel)
+        self.filter_var.trace_add("write", self._schedule_filter)
+
+    def set_items(self, items):
+        """표시할 파일 경로 리스트를 지정합니다 (리스트를 참조만 함)."""
+        self._items = items
+        self._names = []
+        self._seen = len(items)
+        self._first = 0
+        self._view = self._filter_indices(self._query, None) if self._query else None
+        self._render()
+
+    def items_added(self):
+        """참조 중인 리스트 뒤에 추가된 항목을 목록에 반영합니다."""
+        start = self._seen
+        self._seen = len(self._items)
+        if self._view is not None:
+            self._ensure_names()
+            names = self._names
+            self._view.extend(i for i in range(start, self._seen) if self._query in names[i])
+        self._render()
+
+    def _ensure_names(self):
+        """필터용 소문자 파일 이름을 아직 만들지 않은 항목까지 만듭니다."""
+        names = self._names
+        if len(names) < len(self._items):
+            names.extend(os.path.basename(path).lower() for path in self._items[len(names):])
+
+    def _filter_indices(self, query, previous):
+        """파일 이름에 query가 들어 있는 항목 인덱스. previous가 있으면 그 안에서만 찾습니다."""
+        self._ensure_names()
+        names = self._names
+        candidates = previous if previous is not None else range(len(names))
+        return [i for i in candidates if query in names[i]]
+
+    def _schedule_filter(self, *args):
+        """입력이 잠시 멈춘 뒤 한 번만 거르도록 예약합니다."""
+        if self._filter_job is not None:
+            self.after_cancel(self._filter_job)
+        self._filter_job = self.after(FILTER_DELAY_MS, self._apply_filter)
+
+    def _apply_filter(self):
+        self._filter_job = None
+        query = self.filter_var.get().strip().lower()
+        if query == self._query:
+            return
+        if not query:
+            self._view = None
+        else:
+            # 이전 검색어를 이어서 입력한 경우에는 이전 결과 안에서만 찾음
+            narrowing = self._view is not None and query.startswith(self._query)
+            self._view = self._filter_indices(query, self._view if narrowing else None)
+        self._query = query
+        self._first = 0
+        self._render()
+
+    def _visible_count(self):
+        return len(self._view) if self._view is not None else self._seen
+
+    def _render(self):
+        """현재 위치에서 보이는 줄만 Listbox에 넣고 스크롤바를 맞춥니다."""
+        total = self._visible_count()
+        self._first = max(0, min(self._first, total - self._rows))
+        stop = min(total, self._first + self._rows)
+        if self._view is not None:
+            paths = [self._items[i] for i in self._view[self._first:stop]]
+        else:
+            paths = self._items[self._first:stop]
+
+        self.listbox.delete(0, tk.END)
+        if paths:
+            self.listbox.insert(tk.END, *(os.path.basename(path) for path in paths))
+        if total:
+            self.scrollbar.set(self._first / total, stop / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+        if self._view is not None:
+            self.count_label.config(text=f"{total}개 / 전체 {self._seen}개")
+        else:
+            self.count_label.config(text=f"{total}개")
+
+    def _scroll(self, lines):
+        self._first += lines
+        self._render()
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self._first = int(float(value) * self._visible_count())
+            self._render()
+        elif unit == "pages":
+            self._scroll(int(value) * self._rows)
+        else:
+            self._scroll(int(value))
+
+    def _on_wheel(self, event):
+        if event.num == 4:
+            self._scroll(-WHEEL_LINES)
+        elif event.num == 5:
+            self._scroll(WHEEL_LINES)
+        elif event.delta:
+            # Windows는 한 칸에 120, macOS는 1 단위
+            steps = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+            self._scroll(-steps * WHEEL_LINES)
+        return "break"
+
+    def _on_resize(self, event):
+        """Listbox 높이에 들어가는 줄 수만큼만 그리도록 줄 수를 다시 계산합니다."""
+        listbox = self.listbox
+        line_height = (tkfont.Font(font=listbox.cget("font")).metrics("linespace")
+                       + 2 * int(listbox.cget("selectborderwidth")))
+        inner_height = event.height - 2 * (int(listbox.cget("borderwidth")) + int(listbox.cget("highlightthickness")))
+        rows = max(1, inner_height // max(1, line_height))
+        if rows != self._rows:
+            self._rows = rows
+            self._render()
@@ -1,7 +1,10 @@
 # ui/main_app.py
 import os
 import json
+import codecs
 import time
+import shutil
+import tempfile
 import threading
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
@@ -11,13 +14,25 @@ import sys
 
 from utils.module_checker import check_required_modules
 from utils.json_encoder import CustomJSONEncoder
-from converters.common import file_to_json
-from converters.exporters import convert_to_markdown, convert_to_text, save_json_file
+from converters.batch import (ConversionPool, default_worker_count, default_page_workers, iter_document_files,
+                              build_jobs, renamed_jobs, MergedBatchWriter, merged_output_path, summarize_cache,
+                              summarize_table_detection, summarize_stages, write_run_report)
+from utils.stage_timer import format_stage_stats
+from converters.cache import DEFAULT_CACHE_SIZE_MB
+from converters.defaults import DEFAULT_PARSER_ENGINE, DEFAULT_TABLE_DETECTION
+from utils.token_counter import DEFAULT_CHUNK_UNIT
+from converters.manifest import ConversionManifest, manifest_settings
 from converters.file_merger import merge_text_files, merge_code_files, merge_json_files, merge_documents
 
 from ui.basic_tab import BasicTab
 from ui.advanced_tab import AdvancedTab
 from ui.merger_tab import MergerTab  # 새로 추가된 병합 탭
+from ui.update_pump import UIUpdatePump
+
+# 폴더 검색 중 목록에 한 번에 추가하는 파일 수
+DISCOVERY_BATCH_SIZE = 500
+# 디버그 모드에서 로그에 나열하는 최대 파일 수 (전체 목록은 파일 목록 창에서 확인)
+DEBUG_FILE_LIST_LIMIT = 200
 
 class DoctoJSONApp(tk.Tk):
     def __init__(self):
@@ -34,6 +49,8 @@ class DoctoJSONApp(tk.Tk):
         self.input_folder = ""  # 파일들이 들어있는 폴더
         self.output_folder = ""  # JSON 파일을 저장할 폴더
         self.document_files = []  # 변환할 파일 목록
+        self.is_discovering = False  # 폴더 검색 중 플래그
+        self.discovery_id = 0  # 진행 중인 폴더 검색 번호 (목록이 바뀌면 이전 검색 결과는 버림)
         self.is_converting = False
         self.stop_flag = False  # 변환 중단 플래그
         
@@ -50,21 +67,43 @@ class DoctoJSONApp(tk.Tk):
         
         # 설정 변수들
         self.chunk_size = tk.IntVar(value=1000)
+        self.chunk_unit = tk.StringVar(value=DEFAULT_CHUNK_UNIT)  # 청크 크기 단위 (chars 또는 tokens)
+        self.tokenizer_path = tk.StringVar(value="")  # 토큰 수 계산용 어휘 파일 (비우면 추정)
         self.include_toc = tk.BooleanVar(value=True)
         self.advanced_metadata = tk.BooleanVar(value=True)
         self.gpt_optimized = tk.BooleanVar(value=False)
         self.output_format = tk.StringVar(value="json")  # json, markdown, text
         self.merge_output = tk.BooleanVar(value=False)  # 모든 파일을 하나로 병합
         self.merge_filename = tk.StringVar(value="merged_output")
+        self.compact_json = tk.BooleanVar(value=False)  # JSON 들여쓰기 없이 저장
+        self.use_ebooklib_reader = tk.BooleanVar(value=False)  # EPUB 전체를 ebooklib으로 읽기 (호환 모드)
+        self.parser_engine = tk.StringVar(value=DEFAULT_PARSER_ENGINE)  # EPUB/HTML 파싱 엔진
+        self.table_detection = tk.StringVar(value=DEFAULT_TABLE_DETECTION)  # PDF 표 탐지 방식
+        
+        # 병렬 변환 워커 수 (워커 프로세스는 세션 동안 유지됨)
+        self.worker_count = tk.IntVar(value=default_worker_count())
+        self.conversion_pool = ConversionPool(self.worker_count.get())
+        
+        # 변환 결과 캐시 (~/.epub_converter/cache)
+        self.use_cache = tk.BooleanVar(value=True)
+        self.cache_size_mb = tk.IntVar(value=DEFAULT_CACHE_SIZE_MB)
+        
+        # 증분 변환 (출력 폴더의 매니페스트 기준으로 바뀐 파일만 변환)
+        self.incremental = tk.BooleanVar(value=False)
+        self.prune_removed = tk.BooleanVar(value=False)
         
         # 디버그 모드 추가
         self.debug_mode = tk.BooleanVar(value=False)
         
+        # 단계별 처리 시간 기록 (출력 메타데이터 포함 / 출력 폴더에 보고서 저장)
+        self.embed_timings = tk.BooleanVar(value=False)
+        self.save_run_report = tk.BooleanVar(value=False)
+        
         # 마지막 경로 저장
         self.save_last_paths = tk.BooleanVar(value=True)
         
-        # 애플리케이션 아이콘 설정 (작업 표시줄 포함)
-        self.setup_icon()
+        # 애플리케이션 아이콘 설정 (작업 표시줄 포함, 창이 뜬 뒤 PIL을 백그라운드에서 불러옴)
+        self.after_idle(self.setup_icon)
         
         # 테마 및 스타일 설정
         self.setup_styles()
@@ -77,34 +116,71 @@ class DoctoJSONApp(tk.Tk):
             self.load_last_paths()
         except Exception as e:
             print(f"설정 로드 중 오류 발생: {e}")
+        
+        # 창을 닫을 때 워커 프로세스 정리
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+    
+    def on_close(self):
+        """창 종료 시 변환 워커 풀을 정리합니다."""
+        self.stop_flag = True
+        self.conversion_pool.shutdown()
+        self.ui_pump.close()
+        self.destroy()
     
     def setup_icon(self):
-        """애플리케이션 아이콘 설정"""
+        """
+        애플리케이션 아이콘 설정
+        PIL 불러오기와 이미지 읽기는 백그라운드 스레드에서 하고, 창 아이콘 지정(tkinter 호출)만
+        메인 스레드에서 합니다.
+        """
+        # 아이콘 파일 경로
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        icon_path = os.path.join(base_dir, "assets", "images", "Lexi_Convert.png")
+        
+        if not os.path.exists(icon_path):
+            print(f"아이콘 파일을 찾을 수 없습니다: {icon_path}")
+            return
+        
+        # Windows에서 작업 표시줄 아이콘도 설정
+        if sys.platform == 'win32':
+            try:
+                import ctypes
+                app_id = "ElFenomeno.LexiConvert.App"
+                ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(app_id)
+            except Exception as e:
+                print(f"작업 표시줄 아이콘 설정 실패: {e}")
+        
+        result = {}
+        loader = threading.Thread(target=self.load_icon_image, args=(icon_path, result), daemon=True)
+        loader.start()
+        self.after(50, self.apply_icon, loader, result)
+    
+    @staticmethod
+    def load_icon_image(icon_path, result):
+        """백그라운드 스레드에서 PIL로 아이콘 이미지를 읽어 result['image']에 넣습니다."""
         try:
-            from PIL import Image, ImageTk
+            from PIL import Image
             
-            # 아이콘 파일 경로
-            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            icon_path = os.path.join(base_dir, "assets", "images", "Lexi_Convert.png")
+            icon_image = Image.open(icon_path)
+            # Windows 작업 표시줄용 아이콘 준비
+            if sys.platform == 'win32':
+                icon_image = icon_image.resize((32, 32), Image.LANCZOS if hasattr(Image, 'LANCZOS') else Image.ANTIALIAS)
+            icon_image.load()
+            result['image'] = icon_image
+        except Exception as e:
+            result['error'] = e
+    
+    def apply_icon(self, loader, result):
+        """아이콘 이미지를 다 읽었으면 창 아이콘으로 지정합니다. 아직이면 잠시 뒤 다시 확인합니다."""
+        if loader.is_alive():
+            self.after(50, self.apply_icon, loader, result)
+            return
+        try:
+            if 'error' in result:
+                raise result['error']
+            from PIL import ImageTk
             
-            if os.path.exists(icon_path):
-                icon_image = Image.open(icon_path)
-                # Windows 작업 표시줄용 아이콘 준비
-                if sys.platform == 'win32':
-                    icon_image = icon_image.resize((32, 32), Image.LANCZOS if hasattr(Image, 'LANCZOS') else Image.ANTIALIAS)
-                icon_photo = ImageTk.PhotoImage(icon_image)
-                self.iconphoto(True, icon_photo)
-                
-                # Windows에서 작업 표시줄 아이콘도 설정
-                if sys.platform == 'win32':
-                    try:
-                        import ctypes
-                        app_id = "ElFenomeno.LexiConvert.App"
-                        ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(app_id)
-                    except Exception as e:
-                        print(f"작업 표시줄 아이콘 설정 실패: {e}")
-            else:
-                print(f"아이콘 파일을 찾을 수 없습니다: {icon_path}")
+            self.iconphoto(True, ImageTk.PhotoImage(result['image']))
         except Exception as e:
             print(f"아이콘 설정 실패: {e}")
     
@@ -216,6 +292,10 @@ class DoctoJSONApp(tk.Tk):
         self.log_text.tag_configure("info", foreground="blue")
         self.log_text.tag_configure("warning", foreground="orange")
         
+        # 작업 스레드의 로그/진행률 갱신은 펌프가 메인 스레드에서 모아서 반영
+        self.ui_pump = UIUpdatePump(self, self.log_text, self.progress_bar, self.progress_percent,
+                                    self.progress_status)
+        
         # 초기 로그 메시지
         self.log("✨ Lexi Convert가 준비되었습니다.", "info")
         self.log("문서 변환 또는 파일 병합 기능을 사용할 수 있습니다.")
@@ -246,10 +326,20 @@ class DoctoJSONApp(tk.Tk):
                 self.folder_files_label.config(text="발견된 파일: 0개")
     
     def update_file_listbox(self):
-        """파일 목록 리스트박스 업데이트"""
-        self.file_listbox.delete(0, tk.END)
-        for file in self.document_files:
-            self.file_listbox.insert(tk.END, os.path.basename(file))
+        """파일 목록을 새 self.document_files로 바꿉니다 (진행 중인 폴더 검색 결과는 버림)."""
+        self.discovery_id += 1
+        self.is_discovering = False
+        self.file_listbox.set_items(self.document_files)
+        self.folder_file_list.set_items(self.document_files)
+    
+    def log_file_names(self, title, files):
+        """디버그 모드용: 파일 이름 목록을 로그에 나열합니다 (최대 DEBUG_FILE_LIST_LIMIT개)."""
+        self.log(title, "info")
+        for idx, file in enumerate(files[:DEBUG_FILE_LIST_LIMIT], 1):
+            filename = os.path.basename(file)
+            self.log(f" {idx}. {filename}")
+        if len(files) > DEBUG_FILE_LIST_LIMIT:
+            self.log(f" ... 외 {len(files) - DEBUG_FILE_LIST_LIMIT}개")
     
     def select_files(self):
         """파일 선택 대화상자를 표시합니다."""
@@ -284,10 +374,7 @@ class DoctoJSONApp(tk.Tk):
             
             # 파일 목록 표시 (디버그 모드에서만)
             if self.debug_mode.get() and self.document_files:
-                self.log("선택된 파일 목록:", "info")
-                for idx, file in enumerate(self.document_files, 1):
-                    filename = os.path.basename(file)
-                    self.log(f" {idx}. {filename}")
+                self.log_file_names("선택된 파일 목록:", self.document_files)
     
     def clear_files(self):
         """선택된 파일 목록 초기화"""
@@ -306,8 +393,12 @@ class DoctoJSONApp(tk.Tk):
             self.input_folder_entry.insert(0, folder_path)
             self.log(f"📁 입력 폴더가 설정되었습니다: {folder_path}", "info")
     
-    def find_files_in_folder(self):
-        """입력 폴더에서 EPUB/PDF 파일 찾기"""
+    def find_files_in_folder(self, on_done=None):
+        """
+        입력 폴더에서 EPUB/PDF 파일 찾기
+        검색은 백그라운드 스레드에서 하고, 찾은 파일은 묶음 단위로 목록에 차례로 추가됩니다.
+        on_done은 검색이 끝나고 파일을 하나 이상 찾았을 때 호출됩니다.
+        """
         self.input_folder = self.input_folder_entry.get().strip()
         
         if not self.input_folder or not os.path.isdir(self.input_folder):
@@ -316,20 +407,54 @@ class DoctoJSONApp(tk.Tk):
         
         # 폴더 내 파일 검색
         self.document_files = []
-        self.search_docs_in_folder(self.input_folder)
+        self.update_file_listbox()
+        self.is_discovering = True
+        self.folder_files_label.config(text="발견된 파일: 0개 (검색 중...)")
+        threading.Thread(target=self.discover_process,
+                         args=(self.input_folder, self.discovery_id, on_done), daemon=True).start()
+    
+    def discover_process(self, folder, discovery_id, on_done):
+        """폴더를 검색하며 찾은 파일을 묶음으로 메인 스레드에 보냅니다 (작업 스레드에서 실행)."""
+        batch = []
+        error = None
+        try:
+            for path in iter_document_files(folder, recursive=True):
+                batch.append(path)
+                if len(batch) >= DISCOVERY_BATCH_SIZE:
+                    if discovery_id != self.discovery_id:
+                        # 목록이 바뀌어 이 검색 결과는 더 필요 없음
+                        return
+                    self.ui_pump.call(self.add_found_files, discovery_id, batch)
+                    batch = []
+        except OSError as e:
+            error = str(e)
+        self.ui_pump.call(self.add_found_files, discovery_id, batch, True, error, on_done)
+    
+    def add_found_files(self, discovery_id, files, done=False, error=None, on_done=None):
+        """찾은 파일 묶음을 목록에 추가하고, 검색이 끝나면 결과를 표시합니다."""
+        if discovery_id != self.discovery_id:
+            return
+        self.document_files.extend(files)
+        self.file_listbox.items_added()
+        self.folder_file_list.items_added()
         
         # 결과 표시
+        if not done:
+            self.folder_files_label.config(text=f"발견된 파일: {len(self.document_files)}개 (검색 중...)")
+            return
+        self.is_discovering = False
         self.folder_files_label.config(text=f"발견된 파일: {len(self.document_files)}개")
+        if error:
+            self.log(f"⚠️ 폴더 검색 중 오류 발생: {error}", "warning")
         
         if self.document_files:
             self.log(f"📚 {len(self.document_files)}개의 EPUB/PDF 파일을 발견했습니다.", "success")
             
             # 디버그 모드에서 파일 목록 표시
             if self.debug_mode.get():
-                self.log("발견된 파일 목록:", "info")
-                for idx, file in enumerate(self.document_files, 1):
-                    filename = os.path.basename(file)
-                    self.log(f" {idx}. {filename}")
+                self.log_file_names("발견된 파일 목록:", self.document_files)
+            if on_done:
+                on_done()
         else:
             self.log("⚠️ 폴더에서 EPUB/PDF 파일을 찾을 수 없습니다.", "warning")
     
@@ -342,19 +467,6 @@ class DoctoJSONApp(tk.Tk):
             self.output_folder_entry.insert(0, folder_path)
             self.log(f"📁 출력 폴더가 설정되었습니다: {folder_path}", "info")
     
-    def search_docs_in_folder(self, folder):
-        """해당 폴더(하위 폴더 포함) 내의 모든 EPUB/PDF 파일을 찾아 self.document_files에 추가"""
-        count_before = len(self.document_files)
-        
-        for root, dirs, files in os.walk(folder):
-            for file in files:
-                if file.lower().endswith((".epub", ".pdf", ".html", ".htm")):
-                    self.document_files.append(os.path.join(root, file))
-        
-        count_added = len(self.document_files) - count_before
-        if count_added > 0:
-            self.log(f"📚 입력 폴더에서 {count_added}개의 파일이 추가되었습니다.", "info")
-    
     def save_paths(self):
         """마지막 사용 경로 저장"""
         try:
@@ -400,9 +512,14 @@ class DoctoJSONApp(tk.Tk):
         if self.input_mode.get() == "folder":
             self.input_folder = self.input_folder_entry.get().strip()
             
-            # 폴더에서 아직 파일을 검색하지 않았다면
+            if self.is_discovering:
+                messagebox.showwarning("경고", "폴더에서 파일을 검색하는 중입니다. 검색이 끝난 뒤 다시 시도해주세요.")
+                return
+            
+            # 폴더에서 아직 파일을 검색하지 않았다면 검색이 끝난 뒤 변환 시작
             if not self.document_files:
-                self.find_files_in_folder()
+                self.find_files_in_folder(on_done=self.start_conversion)
+                return
         
         self.output_folder = self.output_folder_entry.get().strip()
         
@@ -425,10 +542,9 @@ class DoctoJSONApp(tk.Tk):
         self.stop_flag = False
         self.convert_btn.config(state=tk.DISABLED)
         self.cancel_btn.config(state=tk.NORMAL)
-        self.log_text.delete("1.0", tk.END)
-        self.progress_bar["value"] = 0
-        self.progress_percent.config(text="0%")
-        self.progress_status.config(text="변환 중...")
+        self.ui_pump.clear()
+        self.ui_pump.progress(0)
+        self.ui_pump.status("변환 중...")
         
         self.log("🔄 변환 작업을 시작합니다...", "info")
         if self.merge_output.get() and len(self.document_files) > 1:
@@ -439,223 +555,207 @@ class DoctoJSONApp(tk.Tk):
     def stop_conversion(self):
         if self.is_converting:
             self.stop_flag = True
-            self.log("⚠️ 사용자가 변환 중단을 요청했습니다. 현재 작업 이후 중단됩니다...", "warning")
+            self.log("⚠️ 사용자가 변환 중단을 요청했습니다. 진행 중인 작업 이후 중단됩니다...", "warning")
             self.cancel_btn.config(state=tk.DISABLED)
-            self.progress_status.config(text="중단 중...")
+            self.ui_pump.status("중단 중...")
     
     def convert_process(self):
         total_files = len(self.document_files)
         self.log(f"📚 총 {total_files}개의 문서 파일 변환을 시작합니다.\n", "info")
         
+        output_format = self.output_format.get()
+        merging = self.merge_output.get() and total_files > 1
+        
+        # 워커 프로세스로 전달할 변환 옵션 (tk 변수는 여기서 한 번만 읽음)
+        options = {
+            'chunk_size': self.chunk_size.get(),
+            'chunk_unit': self.chunk_unit.get(),
+            'tokenizer': self.tokenizer_path.get() or None,
+            'include_toc': self.include_toc.get(),
+            'advanced_metadata': self.advanced_metadata.get(),
+            'gpt_optimized': self.gpt_optimized.get(),
+            'compact_json': self.compact_json.get(),
+            'epub_reader': "ebooklib" if self.use_ebooklib_reader.get() else "zip",
+            'parser_engine': self.parser_engine.get(),
+            'table_detection': self.table_detection.get(),
+            'use_cache': self.use_cache.get(),
+            'cache_size_mb': self.cache_size_mb.get(),
+            'embed_timings': self.embed_timings.get(),
+            'debug': self.debug_mode.get()
+        }
+        
         # 병합 옵션이 켜져 있는 경우를 위한 변수
-        merged_data = None
-        if self.merge_output.get() and len(self.document_files) > 1:
-            if self.gpt_optimized.get():
-                merged_data = {
-                    'metadata': {
-                        'title': f"병합된 문서 파일 ({total_files}개)",
-                        'creator': "Document to JSON Converter",
-                        'merged_count': total_files,
-                        'processed_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    },
-                    'chunks': [],
-                    'total_chunks': 0,
-                    'merged_files': [],
-                    'gpt_knowledge': True,
-                    'format_version': "2.0",
-                    'chunked': True
-                }
+        merge_writer = None
+        merge_error = None
+        intermediate_dir = None
+        if merging:
+            # 병합 시 워커는 중간 JSON 파일을 임시 폴더에 기록
+            intermediate_dir = tempfile.mkdtemp(prefix="lexi_merge_")
+        
+        # 변환 작업 목록 (인덱스, 입력 파일, 출력 경로)
+        jobs = build_jobs(self.document_files, self.output_folder, output_format, intermediate_dir)
+        if not merging:
+            for idx, doc_file, output_path in renamed_jobs(jobs):
+                self.log(f"⚠️ 같은 이름의 출력 파일이 있어 {os.path.basename(output_path)}로 저장합니다: {doc_file}", "warning")
+        
+        if merging:
+            # 끝난 문서부터 입력 순서대로 병합 파일에 바로 기록
+            output_path = merged_output_path(self.output_folder, self.merge_filename.get(), output_format)
+            merge_filename = os.path.basename(output_path)
+            try:
+                merge_writer = MergedBatchWriter(output_path, output_format, jobs, self.gpt_optimized.get(),
+                                                 options['compact_json'])
+            except Exception as e:
+                merge_error = str(e)
+                self.log(f"❌ 병합 파일 생성 실패: {merge_error}", "error")
+        
+        # 증분 변환: 마지막 변환 이후 바뀌지 않은 파일은 건너뜀
+        manifest = None
+        if self.incremental.get():
+            if merging:
+                self.log("⚠️ 병합 출력에서는 증분 변환을 사용할 수 없어 모든 파일을 변환합니다.", "warning")
             else:
-                merged_data = {
-                    'metadata': {
-                        'title': f"병합된 문서 파일 ({total_files}개)",
-                        'creator': "Document to JSON Converter",
-                        'merged_count': total_files,
-                        'processed_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    },
-                    'chapters': [],
-                    'total_chapters': 0,
-                    'merged_files': [],
-                    'gpt_knowledge': True,
-                    'format_version': "1.0",
-                    'chunked': False
-                }
-        
-        for idx, doc_file in enumerate(self.document_files, start=1):
-            if self.stop_flag:
-                break
-            
+                manifest = ConversionManifest(self.output_folder)
+                settings = manifest_settings(options, output_format)
+                options['incremental'] = True
+                jobs, unchanged = manifest.plan(jobs, settings)
+                self.log(f"⏭️ 변경되지 않은 {len(unchanged)}개 파일을 건너뛰고 {len(jobs)}개 파일을 변환합니다.", "info")
+                
+                if self.prune_removed.get():
+                    deleted = manifest.prune(manifest.find_removed())
+                    if deleted:
+                        self.log(f"🗑️ 삭제된 입력 파일의 출력 {len(deleted)}개를 정리했습니다.", "info")
+        total_jobs = len(jobs)
+        
+        worker_count = max(1, self.worker_count.get())
+        options['page_workers'] = default_page_workers(worker_count, total_jobs)
+        self.log(f"⚙️ {worker_count}개의 워커 프로세스로 변환합니다.", "info")
+        
+        finished = []
+        completed = 0
+        for idx, record in self.conversion_pool.run(jobs, "json" if merging else output_format, options,
+                                                    max_workers=worker_count,
+                                                    stop_requested=lambda: self.stop_flag):
+            completed += 1
+            finished.append(record)
+            doc_file = record['file']
             file_ext = os.path.splitext(doc_file)[1].lower()
             file_type = "EPUB" if file_ext == ".epub" else "PDF"
-            base_name = os.path.splitext(os.path.basename(doc_file))[0]
-            
-            self.log(f"[{idx}/{total_files}] 📖 변환 중: {doc_file}")
-            self.progress_status.config(text=f"변환 중... ({idx}/{total_files})")
-            
-            # 변환 함수 호출 - 통합 함수 사용
-            data, error = file_to_json(
-                doc_file,
-                chunk_size=self.chunk_size.get(),
-                include_toc=self.include_toc.get(),
-                advanced_metadata=self.advanced_metadata.get(),
-                gpt_optimized=self.gpt_optimized.get()
-            )
+            output_filename = os.path.basename(record['output_path'])
             
-            if error:
-                self.log(f"❌ 변환 실패: {error}\n", "error")
-                continue
+            self.log(f"[{completed}/{total_jobs}] 📖 {doc_file}")
+            self.ui_pump.status(f"변환 중... ({completed}/{total_jobs})")
             
-            # 디버그 모드에서 상세 정보 로깅
-            if self.debug_mode.get():
-                if file_type == "EPUB":
-                    chunks_count = len(data.get('chunks', [])) or len(data.get('chapters', []))
-                    self.log(f"📊 데이터 통계: {chunks_count}개 항목 추출됨 (타입: {file_type})", "info")
-                else:  # PDF
-                    chunks_count = len(data.get('chunks', [])) or len(data.get('pages', []))
-                    self.log(f"📊 데이터 통계: {chunks_count}개 페이지/청크 추출됨 (타입: {file_type})", "info")
-                self.log(f"📋 변환된 구조: {', '.join(data.keys())}", "info")
-            
-            # 병합 로직
-            if self.merge_output.get() and merged_data is not None:
-                if 'chunks' in data and 'chunks' in merged_data:
-                    # 기존 청크 인덱스 조정
-                    chunk_offset = len(merged_data['chunks'])
-                    for i, chunk in enumerate(data['chunks']):
-                        # 오프셋 적용해서 새 ID 생성 (파일 타입에 따라 ID 형식 다름)
-                        prefix = "ch" if file_type == "EPUB" else "pg"
-                        new_id = f"{prefix}{chunk_offset + i + 1}"
-                        chunk['id'] = new_id
-                        # 파일 소스 정보 추가
-                        chunk['source_file'] = base_name
-                        merged_data['chunks'].append(chunk)
-                    
-                    merged_data['total_chunks'] += len(data['chunks'])
-                
-                elif 'chapters' in data and 'chapters' in merged_data:
-                    merged_data['chapters'].extend(data['chapters'])
-                    merged_data['total_chapters'] += len(data['chapters'])
-                
-                elif 'pages' in data and 'chapters' in merged_data:
-                    # PDF 페이지를 EPUB 챕터처럼 처리
-                    for page in data['pages']:
-                        merged_data['chapters'].append(page['content'])
-                    merged_data['total_chapters'] += len(data['pages'])
+            if not record['success']:
+                if record['stage'] == 'convert':
+                    self.log(f"❌ 변환 실패: {record['error']}\n", "error")
+                elif output_format == "json" or merging:
+                    self.log(f"❌ JSON 저장 실패: {record['error']}", "error")
+                elif output_format == "markdown":
+                    self.log(f"❌ 마크다운 변환 실패: {record['error']}", "error")
+                else:
+                    self.log(f"❌ 텍스트 변환 실패: {record['error']}", "error")
+                if self.debug_mode.get() and record.get('traceback'):
+                    self.log(f"상세 오류: {record['traceback']}", "error")
+            else:
+                if manifest:
+                    manifest.record(record, settings)
                 
-                # 병합된 파일 목록에 추가
-                merged_data['merged_files'].append({
-                    'file_name': os.path.basename(doc_file),
-                    'file_type': file_type,
-                    'title': data['metadata']['title'],
-                    'creator': data['metadata']['creator']
-                })
+                # 디버그 모드에서 상세 정보 로깅
+                if self.debug_mode.get():
+                    if file_type == "EPUB":
+                        self.log(f"📊 데이터 통계: {record['item_count']}개 항목 추출됨 (타입: {file_type})", "info")
+                    else:  # PDF
+                        self.log(f"📊 데이터 통계: {record['item_count']}개 페이지/청크 추출됨 (타입: {file_type})", "info")
+                    self.log(f"📋 변환된 구조: {', '.join(record['keys'])}", "info")
+                    if record['cache'] == 'hit':
+                        self.log("💾 캐시된 변환 결과를 사용했습니다.", "info")
+                    if not merging:
+                        self.log(f" - 생성된 파일 크기: {record['output_size'] / 1024:.2f} KB", "info")
+                    self.log(f"⏱️ 처리 시간 {record['seconds']:.3f}초: {format_stage_stats(record['stages'])}", "info")
                 
-                self.log(f"✅ {base_name} 파일이 병합 데이터에 추가되었습니다.", "success")
+                if not merging:
+                    self.log(f"✅ 파일 변환 완료: {output_filename}", "success")
             
-            # 개별 파일 저장
-            if not self.merge_output.get() or total_files == 1:
+            # 순서가 된 문서들을 병합 파일에 기록
+            if merge_writer and not merge_error:
                 try:
-                    # 출력 포맷에 따라 처리
-                    if self.output_format.get() == "json":
-                        output_ext = ".json"
-                        output_filename = base_name + output_ext
-                        output_path = os.path.join(self.output_folder, output_filename)
-                        
-                        success, error = save_json_file(data, output_path)
-                        if not success:
-                            self.log(f"❌ JSON 저장 실패: {error}", "error")
-                            continue
-                        
-                        # 디버그 모드일 경우 파일 크기 체크
-                        if self.debug_mode.get():
-                            file_size = os.path.getsize(output_path)
-                            self.log(f" - 생성된 파일 크기: {file_size / 1024:.2f} KB", "info")
-                    
-                    elif self.output_format.get() == "markdown":
-                        output_ext = ".md"
-                        output_filename = base_name + output_ext
-                        output_path = os.path.join(self.output_folder, output_filename)
-                        
-                        success, error = convert_to_markdown(data, output_path)
-                        if not success:
-                            self.log(f"❌ 마크다운 변환 실패: {error}", "error")
-                            continue
-                    
-                    elif self.output_format.get() == "text":
-                        output_ext = ".txt"
-                        output_filename = base_name + output_ext
-                        output_path = os.path.join(self.output_folder, output_filename)
-                        
-                        success, error = convert_to_text(data, output_path)
-                        if not success:
-                            self.log(f"❌ 텍스트 변환 실패: {error}", "error")
-                            continue
-                    
-                    self.log(f"✅ 파일 변환 완료: {output_filename}", "success")
-                
+                    for merged_file in merge_writer.add(idx, record):
+                        base_name = os.path.splitext(os.path.basename(merged_file))[0]
+                        self.log(f"✅ {base_name} 파일이 병합 데이터에 추가되었습니다.", "success")
                 except Exception as e:
-                    self.log(f"❌ 파일 저장 실패: {str(e)}", "error")
+                    merge_error = str(e)
+                    self.log(f"❌ 병합 파일 저장 중 오류 발생: {merge_error}", "error")
                     if self.debug_mode.get():
                         import traceback
                         self.log(f"상세 오류: {traceback.format_exc()}", "error")
             
-            # 진행 상황 업데이트
-            progress_value = (idx / total_files) * 100
-            self.progress_bar["value"] = progress_value
-            self.progress_percent.config(text=f"{int(progress_value)}%")
-            self.update_idletasks()
-        
-        # 병합 파일 저장 (병합 옵션이 켜져 있고 여러 파일이 있는 경우)
-        if self.merge_output.get() and merged_data is not None and len(self.document_files) > 1 and not self.stop_flag:
+            # 진행 상황 업데이트 (화면에는 펌프가 프레임마다 마지막 값만 반영)
+            self.ui_pump.progress((completed / total_jobs) * 100)
+        
+        # 증분 변환 매니페스트 저장 (중단된 경우에도 완료된 파일은 기록)
+        if manifest:
             try:
-                self.progress_status.config(text="병합 파일 생성 중...")
-                merge_filename = self.merge_filename.get()
-                
-                # 출력 포맷에 따라 처리
-                if self.output_format.get() == "json":
-                    if not merge_filename.endswith('.json'):
-                        merge_filename += '.json'
-                    output_path = os.path.join(self.output_folder, merge_filename)
-                    
-                    success, error = save_json_file(merged_data, output_path)
-                    if not success:
+                manifest.save()
+            except Exception as e:
+                self.log(f"⚠️ 변환 기록(매니페스트) 저장 실패: {e}", "warning")
+        
+        # 캐시 적중/미스 통계
+        if options['use_cache']:
+            cache_hits, cache_misses = summarize_cache(finished)
+            self.log(f"💾 변환 캐시: 적중 {cache_hits}개, 미스 {cache_misses}개", "info")
+        
+        table_skipped, table_pages = summarize_table_detection(finished)
+        if table_pages:
+            self.log(f"📊 PDF 표 탐지 생략: {table_pages}페이지 중 {table_skipped}페이지", "info")
+        
+        # 단계별 처리 시간 요약 및 보고서
+        stages = summarize_stages(finished)
+        if stages:
+            self.log(f"⏱️ 단계별 처리 시간: {format_stage_stats(stages)}", "info")
+        if self.save_run_report.get() and finished:
+            report_path = os.path.join(self.output_folder, "lexi_run_report.json")
+            success, error = write_run_report(finished, report_path)
+            if success:
+                self.log(f"📝 처리 시간 보고서 저장 완료: {report_path}", "info")
+            else:
+                self.log(f"⚠️ 처리 시간 보고서 저장 실패: {error}", "warning")
+        
+        # 병합 파일 마무리 (중단되었거나 오류가 난 경우 작성 중이던 파일 삭제)
+        if merge_writer:
+            if self.stop_flag or merge_error:
+                merge_writer.abort()
+            else:
+                self.ui_pump.status("병합 파일 생성 중...")
+                success, error = merge_writer.close()
+                if not success:
+                    if output_format == "json":
                         self.log(f"❌ 병합 JSON 저장 실패: {error}", "error")
-                
-                elif self.output_format.get() == "markdown":
-                    if not merge_filename.endswith('.md'):
-                        merge_filename += '.md'
-                    output_path = os.path.join(self.output_folder, merge_filename)
-                    
-                    success, error = convert_to_markdown(merged_data, output_path)
-                    if not success:
+                    elif output_format == "markdown":
                         self.log(f"❌ 병합 마크다운 변환 실패: {error}", "error")
-                
-                elif self.output_format.get() == "text":
-                    if not merge_filename.endswith('.txt'):
-                        merge_filename += '.txt'
-                    output_path = os.path.join(self.output_folder, merge_filename)
-                    
-                    success, error = convert_to_text(merged_data, output_path)
-                    if not success:
+                    else:
                         self.log(f"❌ 병합 텍스트 변환 실패: {error}", "error")
-                
-                self.log(f"✅ 병합된 파일 저장 완료: {merge_filename}", "success")
-            
-            except Exception as e:
-                self.log(f"❌ 병합 파일 저장 중 오류 발생: {str(e)}", "error")
-                if self.debug_mode.get():
-                    import traceback
-                    self.log(f"상세 오류: {traceback.format_exc()}", "error")
+                else:
+                    self.log(f"✅ 병합된 파일 저장 완료: {merge_filename}", "success")
+        
+        # 병합용 중간 파일 정리
+        if intermediate_dir:
+            shutil.rmtree(intermediate_dir, ignore_errors=True)
         
         # 작업 완료 메시지 및 UI 상태 업데이트
         if self.stop_flag:
             self.log("⚠️ 사용자 요청으로 일부 파일만 변환되었습니다.", "warning")
-            self.progress_status.config(text="중단됨")
+            self.ui_pump.status("중단됨")
         else:
             self.log("🎉 모든 변환 작업이 완료되었습니다!", "success")
-            self.progress_status.config(text="완료")
-            self.progress_bar["value"] = 100
-            self.progress_percent.config(text="100%")
+            self.ui_pump.status("완료")
+            self.ui_pump.progress(100)
         
+        # 메시지 상자와 버튼 상태 복원은 메인 스레드에서 처리
+        self.ui_pump.call(self.finish_conversion)
+    
+    def finish_conversion(self):
+        """변환 스레드가 끝난 뒤 메인 스레드에서 완료 안내와 UI 상태 복원을 합니다."""
         # 완료 시 파일 탐색기에서 출력 폴더 열기 옵션 제공
         if not self.stop_flag:
             if messagebox.askyesno("변환 완료", f"변환이 완료되었습니다.\n출력 폴더({self.output_folder})를 탐색기에서 열까요?"):
@@ -696,6 +796,25 @@ class DoctoJSONApp(tk.Tk):
             messagebox.showwarning("경고", "출력 파일 이름을 지정해주세요.")
             return
         
+        # 원본 인코딩 이름 확인
+        source_encoding = self.merge_source_encoding.get().strip()
+        if source_encoding:
+            try:
+                codecs.lookup(source_encoding)
+            except LookupError:
+                messagebox.showwarning("경고", f"알 수 없는 인코딩입니다: {source_encoding}")
+                return
+        
+        # 미리 읽기 설정 확인
+        try:
+            read_workers = self.merge_read_workers.get()
+            read_ahead_mb = self.merge_read_ahead_mb.get()
+        except tk.TclError:
+            read_workers = read_ahead_mb = -1
+        if read_workers < 0 or read_ahead_mb < 1:
+            messagebox.showwarning("경고", "미리 읽기 스레드 수는 0 이상, 한도는 1MB 이상의 정수로 지정해주세요.")
+            return
+        
         # 확장자가 없으면 추가
         file_ext = "." + self.merge_output_format.get().lower()
         if not filename.lower().endswith(file_ext):
@@ -717,12 +836,11 @@ class DoctoJSONApp(tk.Tk):
         self.convert_btn.config(state=tk.DISABLED)
         self.merge_btn.config(state=tk.DISABLED)
         self.cancel_btn.config(state=tk.NORMAL)
-        self.progress_bar["value"] = 0
-        self.progress_percent.config(text="0%")
-        self.progress_status.config(text="병합 준비 중...")
+        self.ui_pump.progress(0)
+        self.ui_pump.status("병합 준비 중...")
         
         # 로그 초기화 및 시작 메시지
-        self.log_text.delete("1.0", tk.END)
+        self.ui_pump.clear()
         self.log("🔄 파일 병합 작업을 시작합니다...", "info")
         
         # 스레드로 병합 작업 실행
@@ -732,6 +850,17 @@ class DoctoJSONApp(tk.Tk):
     def merge_process(self):
         """파일 병합 프로세스를 실행"""
         try:
+            # 원본 인코딩(비우면 UTF-8 그대로 복사)과 인코딩 검사 여부
+            encoding = self.merge_source_encoding.get().strip() or None
+            validate = self.merge_validate_text.get()
+            if encoding:
+                self.log(f"🔤 원본 인코딩: {encoding} (UTF-8로 변환)")
+            # 미리 읽기 스레드 수 (0이면 자동: 네트워크 경로일 때만 사용)와 한도
+            read_workers = self.merge_read_workers.get() or None
+            read_ahead_mb = self.merge_read_ahead_mb.get()
+            if read_workers and read_workers > 1:
+                self.log(f"📥 미리 읽기: {read_workers}스레드, 한도 {read_ahead_mb}MB")
+            
             # 병합 모드에 따라 처리
             if self.merge_mode.get() == "directory":
                 directory_path = self.merge_dir_entry.get().strip()
@@ -749,29 +878,34 @@ class DoctoJSONApp(tk.Tk):
                 include_filenames = self.include_filenames.get()
                 include_folder_structure = self.include_folder_structure.get()
                 recursive = self.recursive_search.get()
+                excludes = [rule.strip() for rule in self.merge_excludes.get().split(",") if rule.strip()]
                 
                 self.log(f"📁 폴더: {directory_path}")
                 self.log(f"🔍 파일 패턴: {file_pattern}")
                 if recursive:
                     self.log("🔍 하위 폴더 포함: 예")
-                self.progress_status.config(text="파일 검색 중...")
+                if excludes:
+                    self.log(f"🚫 제외 규칙: {', '.join(excludes)}")
+                self.ui_pump.status("파일 검색 중...")
                 
                 # 수정된 부분: 먼저 파일 패턴에 따라 처리 방법 결정
                 if file_pattern.lower().endswith(".json"):
                     self.log("📊 JSON 파일 병합 중...")
-                    success, message = merge_json_files(directory_path, output_path, recursive)
+                    success, message = merge_json_files(directory_path, output_path, recursive, excludes)
                 elif file_pattern.lower().endswith((".py", ".c", ".h", ".cpp", ".cs")):
                     self.log(f"📝 코드 파일 병합 중... ({file_pattern})")
                     file_ext = os.path.splitext(file_pattern)[1]  # *.py -> .py
                     success, message = merge_code_files(directory_path, output_path, file_ext, 
                                                     include_filenames, include_folder_structure, 
-                                                    recursive)
+                                                    recursive, excludes, encoding, validate,
+                                                    read_workers, read_ahead_mb)
                 else:
                     # 기본 텍스트 파일 병합
                     self.log(f"📄 텍스트 파일 병합 중... ({file_pattern})")
                     success, message = merge_text_files(directory_path, output_path, file_pattern, 
                                                     include_filenames, include_folder_structure, 
-                                                    recursive)
+                                                    recursive, excludes, encoding, validate,
+                                                    read_workers, read_ahead_mb)
             
             else:  # files 모드
                 # 출력 폴더와 파일 이름 조합
@@ -787,17 +921,16 @@ class DoctoJSONApp(tk.Tk):
                 self.log(f"📄 선택한 {len(self.merge_files)}개 파일 병합 중...")
                 
                 # 선택한 파일들 병합
-                success, message = merge_documents(self.merge_files, output_path, self.merge_output_format.get())
+                success, message = merge_documents(self.merge_files, output_path, self.merge_output_format.get(),
+                                               encoding, validate, read_workers, read_ahead_mb)
             
             # 결과 처리
             if success:
                 self.log(f"✅ {message}", "success")
-                self.progress_bar["value"] = 100
-                self.progress_percent.config(text="100%")
+                self.ui_pump.progress(100)
                 
-                # 완료 후 파일 탐색기에서 출력 파일 열기 옵션 제공
-                if messagebox.askyesno("병합 완료", f"파일 병합이 완료되었습니다.\n결과 파일을 열어보시겠습니까?"):
-                    self.open_file(output_path)
+                # 완료 후 파일 탐색기에서 출력 파일 열기 옵션 제공 (메인 스레드에서 질문)
+                self.ui_pump.call(self.ask_open_merged_file, output_path)
             else:
                 self.log(f"❌ {message}", "error")
         
@@ -809,11 +942,20 @@ class DoctoJSONApp(tk.Tk):
         
         finally:
             # UI 상태 복원
-            self.is_merging = False
-            self.progress_status.config(text="준비됨")
-            self.convert_btn.config(state=tk.NORMAL)
-            self.merge_btn.config(state=tk.NORMAL)
-            self.cancel_btn.config(state=tk.DISABLED)
+            self.ui_pump.status("준비됨")
+            self.ui_pump.call(self.finish_merge)
+    
+    def ask_open_merged_file(self, output_path):
+        """병합 결과 파일을 열지 묻습니다."""
+        if messagebox.askyesno("병합 완료", f"파일 병합이 완료되었습니다.\n결과 파일을 열어보시겠습니까?"):
+            self.open_file(output_path)
+    
+    def finish_merge(self):
+        """병합 스레드가 끝난 뒤 메인 스레드에서 UI 상태를 복원합니다."""
+        self.is_merging = False
+        self.convert_btn.config(state=tk.NORMAL)
+        self.merge_btn.config(state=tk.NORMAL)
+        self.cancel_btn.config(state=tk.DISABLED)
 
 
     
@@ -842,6 +984,8 @@ class DoctoJSONApp(tk.Tk):
             self.log(f"⚠️ 폴더 열기 실패: {str(e)}", "warning")
     
     def log(self, message, tag=None):
-        """로그 메시지를 로그 창에 추가합니다."""
-        self.log_text.insert(tk.END, message + "\n", tag)
-        self.log_text.see(tk.END)
+        """
+        로그 메시지를 로그 창에 추가합니다. 작업 스레드에서도 호출할 수 있습니다.
+        (UIUpdatePump가 메인 스레드에서 모아서 추가하고 전체 로그는 파일에 기록)
+        """
+        self.ui_pump.log(message, tag)
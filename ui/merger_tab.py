@@ -3,6 +3,7 @@
 import os
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
+from converters.file_merger import DEFAULT_READ_AHEAD_MB
 
 class MergerTab:
     """병합 기능 전용 탭 관련 기능을 담당하는 클래스"""
@@ -78,6 +79,13 @@ class MergerTab:
         ttk.Checkbutton(recursive_frame, text="하위 폴더의 파일도 모두 포함", 
                     variable=self.app.recursive_search).pack(anchor=tk.W, padx=(20, 0))
         
+        # 제외 규칙 (폴더 모드용, .gitignore 형식)
+        exclude_frame = ttk.Frame(self.app.merge_dir_frame)
+        exclude_frame.pack(fill=tk.X, pady=5)
+        ttk.Label(exclude_frame, text="제외 규칙 (.gitignore 형식, 쉼표로 구분):").pack(side=tk.LEFT, padx=(20, 5))
+        self.app.merge_excludes = tk.StringVar(value="")
+        ttk.Entry(exclude_frame, textvariable=self.app.merge_excludes, width=30).pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
         # 파일 선택 프레임 (파일 모드용)
         self.app.merge_files_frame = ttk.Frame(input_frame)
         # 초기에는 숨김 상태
@@ -144,6 +152,30 @@ class MergerTab:
         ttk.Checkbutton(include_frame, text="병합된 파일에 원본 파일명 포함", 
                     variable=self.app.include_filenames).pack(anchor=tk.W)
         
+        # 원본 인코딩 / 인코딩 검사 옵션 (기본: UTF-8 파일을 디코딩 없이 그대로 복사)
+        encoding_frame = ttk.Frame(output_frame)
+        encoding_frame.pack(fill=tk.X, pady=5, padx=10)
+        
+        ttk.Label(encoding_frame, text="원본 인코딩 (비우면 UTF-8):").pack(side=tk.LEFT, padx=(0, 5))
+        self.app.merge_source_encoding = tk.StringVar(value="")
+        ttk.Entry(encoding_frame, textvariable=self.app.merge_source_encoding, width=12).pack(side=tk.LEFT, padx=(0, 10))
+        self.app.merge_validate_text = tk.BooleanVar(value=False)
+        ttk.Checkbutton(encoding_frame, text="인코딩 검사 (읽을 수 없는 파일은 오류로 표시)", 
+                    variable=self.app.merge_validate_text).pack(side=tk.LEFT)
+        
+        # 미리 읽기 옵션 (네트워크 드라이브에서 작은 파일을 많이 병합할 때)
+        read_ahead_frame = ttk.Frame(output_frame)
+        read_ahead_frame.pack(fill=tk.X, pady=5, padx=10)
+        
+        ttk.Label(read_ahead_frame, text="미리 읽기 스레드 (0=자동):").pack(side=tk.LEFT, padx=(0, 5))
+        self.app.merge_read_workers = tk.IntVar(value=0)
+        ttk.Spinbox(read_ahead_frame, from_=0, to=64, textvariable=self.app.merge_read_workers,
+                  width=6).pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Label(read_ahead_frame, text="미리 읽기 한도 (MB):").pack(side=tk.LEFT, padx=(0, 5))
+        self.app.merge_read_ahead_mb = tk.IntVar(value=DEFAULT_READ_AHEAD_MB)
+        ttk.Spinbox(read_ahead_frame, from_=1, to=4096, textvariable=self.app.merge_read_ahead_mb,
+                  width=6).pack(side=tk.LEFT)
+        
         # 탭 초기화 후 모드에 따른 UI 조정
         self.merge_mode_changed()
 
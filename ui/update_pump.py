@@ -0,0 +1,182 @@
+# ui/update_pump.py
+"""
+작업 스레드의 로그/진행률 갱신을 Tk 메인 스레드에서 모아서 반영하는 펌프.
+
+작업 스레드는 위젯을 직접 건드리지 않고 큐에 갱신 요청만 넣습니다.
+메인 스레드는 after()로 일정 간격(프레임)마다 큐를 비우면서
+로그 줄은 한 번의 insert로 모아 추가하고, 진행률과 상태 문구는 마지막 값만 반영합니다.
+로그 창에는 최근 max_lines줄만 남기고, 전체 로그는 로그 파일에 기록합니다.
+"""
+import os
+import time
+import queue
+import tkinter as tk
+
+# 전체 로그 파일 폴더 (설정 파일 ~/.epub_converter/config.json과 같은 폴더 아래)
+LOG_DIR = os.path.join(os.path.expanduser("~"), ".epub_converter", "logs")
+# 보관할 최근 로그 파일 수 (실행할 때마다 새 파일 하나)
+MAX_LOG_FILES = 10
+# 로그 창에 남길 최대 줄 수
+DEFAULT_MAX_LINES = 5000
+# 큐를 비우는 간격 (ms, 약 20프레임/초)
+FRAME_INTERVAL_MS = 50
+
+# 큐 항목 종류
+_LOG, _PROGRESS, _STATUS, _CLEAR, _CALL = range(5)
+
+
+class UIUpdatePump:
+    """
+    로그 창(ScrolledText)과 진행률 표시(Progressbar, 백분율/상태 Label)의 갱신을 모아서 처리합니다.
+    log/progress/status/clear/call은 어느 스레드에서나 호출할 수 있고, 요청한 순서대로 반영됩니다.
+    """
+
+    def __init__(self, root, log_text, progress_bar, progress_percent, progress_status,
+                 max_lines=DEFAULT_MAX_LINES, log_dir=LOG_DIR, interval_ms=FRAME_INTERVAL_MS):
+        self.root = root
+        self.log_text = log_text
+        self.progress_bar = progress_bar
+        self.progress_percent = progress_percent
+        self.progress_status = progress_status
+        self.max_lines = max_lines
+        self.log_dir = log_dir
+        self.interval_ms = interval_ms
+        self.log_path = None
+        self._queue = queue.SimpleQueue()
+        self._line_count = 0
+        self._log_file = None
+        self._after_id = root.after(interval_ms, self._pump)
+
+    def log(self, message, tag=None):
+        """로그 한 줄을 추가합니다."""
+        self._queue.put((_LOG, message, (tag, time.time())))
+
+    def progress(self, value):
+        """진행률(0~100)을 표시합니다."""
+        self._queue.put((_PROGRESS, value, None))
+
+    def status(self, text):
+        """진행 상태 문구를 표시합니다."""
+        self._queue.put((_STATUS, text, None))
+
+    def clear(self):
+        """로그 창을 비웁니다 (로그 파일은 그대로 유지)."""
+        self._queue.put((_CLEAR, None, None))
+
+    def call(self, func, *args):
+        """func(*args)를 메인 스레드에서 실행합니다 (메시지 상자, 버튼 상태 변경 등)."""
+        self._queue.put((_CALL, func, args))
+
+    def close(self):
+        """펌프를 멈추고 남은 로그를 파일에 기록한 뒤 로그 파일을 닫습니다."""
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        lines = []
+        try:
+            while True:
+                kind, value, extra = self._queue.get_nowait()
+                if kind == _LOG:
+                    lines.append((value, extra))
+        except queue.Empty:
+            pass
+        self._write_log_file(lines)
+        if self._log_file:
+            self._log_file.close()
+            self._log_file = None
+
+    def _pump(self):
+        """after()로 호출됨: 큐에 쌓인 갱신을 한 번에 반영하고 다음 프레임을 예약합니다."""
+        try:
+            self.drain()
+        finally:
+            self._after_id = self.root.after(self.interval_ms, self._pump)
+
+    def drain(self):
+        """큐에 쌓인 갱신을 모두 반영합니다. 메인 스레드에서만 호출합니다."""
+        lines = []
+        progress = status = None
+        try:
+            while True:
+                kind, value, extra = self._queue.get_nowait()
+                if kind == _LOG:
+                    lines.append((value, extra))
+                elif kind == _PROGRESS:
+                    progress = value
+                elif kind == _STATUS:
+                    status = value
+                else:
+                    # 순서를 지키기 위해 지금까지 모은 갱신을 먼저 반영
+                    self._apply(lines, progress, status)
+                    lines = []
+                    progress = status = None
+                    if kind == _CLEAR:
+                        self.log_text.delete("1.0", tk.END)
+                        self._line_count = 0
+                    else:
+                        value(*extra)
+        except queue.Empty:
+            pass
+        self._apply(lines, progress, status)
+
+    def _apply(self, lines, progress, status):
+        """모은 로그 줄, 마지막 진행률, 마지막 상태 문구를 위젯에 반영합니다."""
+        if lines:
+            self._write_log_file(lines)
+            self._insert_lines(lines[-self.max_lines:])
+        if progress is not None:
+            self.progress_bar["value"] = progress
+            self.progress_percent.config(text=f"{int(progress)}%")
+        if status is not None:
+            self.progress_status.config(text=status)
+
+    def _insert_lines(self, lines):
+        """같은 태그가 이어지는 줄은 문자열 하나로 합쳐 insert 한 번으로 추가하고, 오래된 줄을 지웁니다."""
+        args = []
+        run_tag = None
+        run = []
+        for message, (tag, _) in lines:
+            if run and tag != run_tag:
+                args += ("".join(run), run_tag or ())
+                run = []
+            run_tag = tag
+            run.append(message + "\n")
+            self._line_count += message.count("\n") + 1
+        args += ("".join(run), run_tag or ())
+        self.log_text.insert(tk.END, *args)
+
+        # 로그 창에는 최근 max_lines줄만 유지 (링 버퍼)
+        excess = self._line_count - self.max_lines
+        if excess > 0:
+            self.log_text.delete("1.0", f"{excess + 1}.0")
+            self._line_count = self.max_lines
+        self.log_text.see(tk.END)
+
+    def _open_log_file(self):
+        """이번 실행의 로그 파일을 만들고, 오래된 로그 파일은 MAX_LOG_FILES개만 남깁니다."""
+        os.makedirs(self.log_dir, exist_ok=True)
+        self.log_path = os.path.join(self.log_dir, time.strftime("lexi_convert_%Y%m%d_%H%M%S.log"))
+        self._log_file = open(self.log_path, 'a', encoding='utf-8')
+        old_logs = sorted(name for name in os.listdir(self.log_dir)
+                          if name.startswith("lexi_convert_") and name.endswith(".log"))
+        for name in old_logs[:-MAX_LOG_FILES]:
+            try:
+                os.remove(os.path.join(self.log_dir, name))
+            except OSError:
+                pass
+
+    def _write_log_file(self, lines):
+        """로그 줄 전체를 시각과 함께 로그 파일에 기록합니다. 파일을 쓸 수 없으면 로그 창에만 표시합니다."""
+        if not lines or self._log_file is False:
+            return
+        try:
+            if self._log_file is None:
+                self._open_log_file()
+            self._log_file.write("".join(
+                f"[{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(logged_at))}]"
+                f"{f' [{tag}]' if tag else ''} {message}\n"
+                for message, (tag, logged_at) in lines))
+            self._log_file.flush()
+        except OSError as e:
+            print(f"로그 파일 기록 실패: {e}")
+            self._log_file = False
@@ -0,0 +1,269 @@
+# utils/file_discovery.py
+"""
+os.scandir 기반 파일 검색 (문서 변환과 파일 병합이 함께 사용).
+
+- patterns     : 파일 이름 패턴 목록 (fnmatch 형식, 예: "*.txt"). 비우면 모든 파일
+- excludes     : .gitignore 형식 제외 규칙 목록 ("build/", "*.log", "/docs/tmp", "**/cache", "!keep.log")
+- min_size / max_size     : 파일 크기 범위 (바이트)
+- newer_than / older_than : 수정 시각 범위 (epoch 초)
+- include_hidden=False면 '.'으로 시작하는 파일과 폴더(.git 등)를 건너뜁니다.
+
+폴더마다 os.scandir를 한 번만 호출하고, 항목 종류(파일/폴더)는 scandir가 준 정보로 판단합니다.
+workers가 2 이상이면 하위 폴더 나열을 스레드 풀에서 동시에 진행하므로 네트워크 드라이브처럼
+폴더 하나를 여는 데 오래 걸리는 곳에서 빨라집니다. 로컬 디스크에서는 스레드 전환 비용 때문에 오히려
+느리므로, workers를 지정하지 않으면 네트워크 경로일 때만 스레드를 사용합니다.
+결과는 찾는 대로 하나씩 반환하며, 순서는 workers와 관계없이 os.walk와 같습니다
+(폴더의 파일을 먼저, 그다음 하위 폴더를 차례로).
+"""
+import os
+import re
+import sys
+import fnmatch
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# 네트워크 경로에서 하위 폴더를 동시에 나열할 스레드 수
+DEFAULT_DISCOVERY_WORKERS = 8
+# GetDriveTypeW 결과: 네트워크 드라이브
+_DRIVE_REMOTE = 4
+
+
+def default_discovery_workers(root):
+    """네트워크 경로(UNC 경로, Windows 네트워크 드라이브)면 DEFAULT_DISCOVERY_WORKERS, 아니면 1을 반환합니다."""
+    path = os.path.abspath(root)
+    if path.startswith(('\\\\', '//')):
+        return DEFAULT_DISCOVERY_WORKERS
+    if sys.platform == 'win32':
+        try:
+            import ctypes
+            drive = os.path.splitdrive(path)[0] + '\\'
+            if ctypes.windll.kernel32.GetDriveTypeW(drive) == _DRIVE_REMOTE:
+                return DEFAULT_DISCOVERY_WORKERS
+        except Exception:
+            pass
+    return 1
+
+
+def _translate_gitignore(pattern):
+    """.gitignore 패턴 하나(앞뒤 '/'와 '!'를 뗀 것)를 정규식 문자열로 바꿉니다."""
+    parts = []
+    i = 0
+    n = len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            if pattern.startswith('**', i):
+                i += 2
+                if i < n and pattern[i] == '/':
+                    # "**/" : 0개 이상의 폴더
+                    parts.append('(?:.*/)?')
+                    i += 1
+                else:
+                    parts.append('.*')
+                continue
+            parts.append('[^/]*')
+        elif c == '?':
+            parts.append('[^/]')
+        elif c == '[':
+            end = pattern.find(']', i + 1)
+            if end == -1:
+                parts.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                parts.append(f"[{body}]")
+                i = end
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            parts.append(re.escape(pattern[i]))
+        else:
+            parts.append(re.escape(c))
+        i += 1
+    return ''.join(parts)
+
+
+class ExcludeRules:
+    """
+    .gitignore 형식 제외 규칙.
+    '/'가 없는 패턴은 모든 깊이의 이름과, '/'가 있는 패턴은 검색 시작 폴더 기준 상대 경로와 비교합니다.
+    '/'로 끝나면 폴더에만, '!'로 시작하면 앞 규칙에서 제외된 항목을 다시 포함하며, 마지막으로 맞은 규칙이
+    적용됩니다. 제외된 폴더의 하위 항목은 검사하지 않습니다.
+    """
+
+    def __init__(self, rules=()):
+        self.rules = []
+        for rule in rules:
+            rule = rule.strip()
+            if not rule or rule.startswith('#'):
+                continue
+            negate = rule.startswith('!')
+            if negate:
+                rule = rule[1:]
+            dir_only = rule.endswith('/')
+            rule = rule.rstrip('/')
+            if not rule:
+                continue
+            anchored = '/' in rule
+            regex = re.compile(_translate_gitignore(rule.lstrip('/')) + r'\Z', re.DOTALL)
+            self.rules.append((regex, negate, dir_only, anchored))
+
+    def __bool__(self):
+        return bool(self.rules)
+
+    def excluded(self, rel_path, name, is_dir):
+        """상대 경로('/' 구분)가 rel_path이고 이름이 name인 항목이 제외되는지 반환합니다."""
+        result = False
+        for regex, negate, dir_only, anchored in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path if anchored else name):
+                result = not negate
+        return result
+
+
+def load_exclude_file(path):
+    """.gitignore 같은 제외 규칙 파일을 읽어 규칙 목록으로 반환합니다."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read().splitlines()
+
+
+def _compile_patterns(patterns, ignore_case):
+    """fnmatch 패턴 목록을 정규식 하나로 합칩니다. ignore_case가 None이면 운영체제 규칙(fnmatch)을 따릅니다."""
+    if not patterns:
+        return None
+    if ignore_case is None:
+        ignore_case = os.path.normcase('A') == 'a'
+    regex = '|'.join(f"(?:{fnmatch.translate(pattern)})" for pattern in patterns)
+    return re.compile(regex, re.IGNORECASE if ignore_case else 0).match
+
+
+class _DirScanner:
+    """폴더 하나를 나열하여 조건에 맞는 파일과 내려갈 하위 폴더를 고릅니다."""
+
+    def __init__(self, patterns, excludes, recursive, include_hidden, min_size, max_size,
+                 newer_than, older_than, ignore_case, onerror):
+        self.match = _compile_patterns(patterns, ignore_case)
+        self.excludes = excludes if isinstance(excludes, ExcludeRules) else ExcludeRules(excludes or ())
+        self.recursive = recursive
+        self.include_hidden = include_hidden
+        self.min_size = min_size
+        self.max_size = max_size
+        self.newer_than = newer_than
+        self.older_than = older_than
+        self.needs_stat = any(value is not None for value in (min_size, max_size, newer_than, older_than))
+        self.onerror = onerror
+
+    def scan(self, path, rel_dir):
+        """(조건에 맞는 파일 경로 목록, [(하위 폴더 경로, 상대 경로)])를 반환합니다."""
+        files = []
+        dirs = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if not self.include_hidden and name.startswith('.'):
+                        continue
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    rel_path = f"{rel_dir}/{name}" if rel_dir else name
+                    if self.excludes and self.excludes.excluded(rel_path, name, is_dir):
+                        continue
+                    if is_dir:
+                        # os.walk(followlinks=False)와 같이 폴더 링크는 따라가지 않음
+                        if self.recursive and not entry.is_symlink():
+                            dirs.append((entry.path, rel_path))
+                        continue
+                    if self.match is not None and not self.match(name):
+                        continue
+                    if self.needs_stat and not self._stat_ok(entry):
+                        continue
+                    files.append(entry.path)
+        except OSError as e:
+            if self.onerror is not None:
+                self.onerror(e)
+        return files, dirs
+
+    def _stat_ok(self, entry):
+        try:
+            stat = entry.stat()
+        except OSError:
+            return False
+        if self.min_size is not None and stat.st_size < self.min_size:
+            return False
+        if self.max_size is not None and stat.st_size > self.max_size:
+            return False
+        if self.newer_than is not None and stat.st_mtime < self.newer_than:
+            return False
+        if self.older_than is not None and stat.st_mtime > self.older_than:
+            return False
+        return True
+
+
+def iter_files(root, patterns=None, excludes=None, recursive=True, include_hidden=True,
+               min_size=None, max_size=None, newer_than=None, older_than=None,
+               ignore_case=None, workers=None, onerror=None):
+    """
+    root 아래에서 조건에 맞는 파일 경로를 찾는 대로 하나씩 반환하는 제너레이터.
+    workers가 None이면 default_discovery_workers(root)를 사용합니다.
+    나열할 수 없는 폴더는 건너뛰며, onerror가 주어지면 그 OSError로 호출합니다.
+    """
+    scanner = _DirScanner(patterns, excludes, recursive, include_hidden, min_size, max_size,
+                          newer_than, older_than, ignore_case, onerror)
+    if workers is None:
+        workers = default_discovery_workers(root)
+    if workers <= 1 or not recursive:
+        yield from _iter_serial(scanner, root)
+    else:
+        yield from _iter_parallel(scanner, root, workers)
+
+
+def find_files(root, **options):
+    """iter_files 결과를 목록으로 반환합니다."""
+    return list(iter_files(root, **options))
+
+
+def _iter_serial(scanner, root):
+    stack = [iter([(root, "")])]
+    while stack:
+        next_dir = next(stack[-1], None)
+        if next_dir is None:
+            stack.pop()
+            continue
+        files, dirs = scanner.scan(*next_dir)
+        yield from files
+        if dirs:
+            stack.append(iter(dirs))
+
+
+def _iter_parallel(scanner, root, workers):
+    """
+    폴더를 나열한 스레드가 하위 폴더 나열을 바로 풀에 넣어 트리 전체를 동시에 나열하고,
+    소비하는 쪽은 폴더별 결과(Future)를 os.walk 순서대로 꺼냅니다.
+    """
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="discovery")
+    stopped = threading.Event()
+
+    def scan(path, rel_dir):
+        if stopped.is_set():
+            return [], []
+        files, dirs = scanner.scan(path, rel_dir)
+        return files, [pool.submit(scan, *sub) for sub in dirs]
+
+    try:
+        stack = [iter([pool.submit(scan, root, "")])]
+        while stack:
+            future = next(stack[-1], None)
+            if future is None:
+                stack.pop()
+                continue
+            files, sub_futures = future.result()
+            yield from files
+            if sub_futures:
+                stack.append(iter(sub_futures))
+    finally:
+        # 소비를 중간에 멈추면 남은 나열 작업은 취소
+        stopped.set()
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,54 @@
+# utils/file_utils.py
+import os
+import shutil
+import hashlib
+
+# 커널 복사를 쓸 수 없을 때 shutil.copyfileobj에 쓸 버퍼 크기
+COPY_BUFFER_SIZE = 1024 * 1024
+# os.copy_file_range / os.sendfile 한 번에 요청할 최대 바이트 수
+_KERNEL_COPY_CHUNK = 64 * 1024 * 1024
+
+def hash_file(file_path, block_size=1024 * 1024):
+    """파일 내용의 SHA-256 해시를 계산합니다."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            digest.update(block)
+    return digest.hexdigest()
+
+def copy_file_data(infile, outfile):
+    """
+    이진 모드로 연 infile의 현재 위치부터 끝까지를 outfile의 현재 쓰기 위치에 이어 씁니다.
+    os.copy_file_range(리눅스), os.sendfile 순서로 커널 안에서 복사하고, 둘 다 쓸 수 없으면
+    (Windows, 다른 파일 시스템 사이 등) 큰 버퍼의 shutil.copyfileobj로 복사합니다.
+    infile은 읽기 버퍼가 없는 파일(open(..., 'rb', buffering=0))이어야 위치가 정확합니다.
+    outfile은 텍스트 모드 파일이어도 되며, 복사 전에 쌓여 있던 내용을 먼저 씁니다.
+    복사한 바이트 수를 반환합니다.
+    """
+    outfile.flush()
+    in_fd = infile.fileno()
+    out_fd = outfile.fileno()
+    copied = 0
+    kernel_copies = []
+    if hasattr(os, 'copy_file_range'):
+        kernel_copies.append(os.copy_file_range)
+    if hasattr(os, 'sendfile'):
+        kernel_copies.append(lambda src, dst, count: os.sendfile(dst, src, None, count))
+    for copy_func in kernel_copies:
+        try:
+            while True:
+                sent = copy_func(in_fd, out_fd, _KERNEL_COPY_CHUNK)
+                if sent == 0:
+                    return copied
+                copied += sent
+        except OSError:
+            # 지원하지 않는 조합이면 다음 방식으로 (이미 복사한 부분은 두 파일의 위치에 반영되어 있음)
+            continue
+    target = getattr(outfile, 'buffer', outfile)
+    start = infile.tell()
+    shutil.copyfileobj(infile, target, COPY_BUFFER_SIZE)
+    target.flush()
+    return copied + infile.tell() - start
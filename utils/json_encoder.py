@@ -4,6 +4,10 @@ import json
 class CustomJSONEncoder(json.JSONEncoder):
     """Section 객체 직렬화를 위한 사용자 정의 JSON 인코더"""
     def default(self, obj):
+        # 청크 레코드 등 직렬화 형식을 직접 만드는 객체
+        if hasattr(obj, 'to_dict'):
+            return obj.to_dict()
+        
         # Section 객체나 기타 직렬화할 수 없는 객체 처리
         if hasattr(obj, '__dict__'):
             return obj.__dict__
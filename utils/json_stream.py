@@ -0,0 +1,200 @@
+# utils/json_stream.py
+from json.encoder import encode_basestring
+
+from utils.json_encoder import CustomJSONEncoder
+
+# json.dump(indent=4)와 같은 들여쓰기 단위
+INDENT = "    "
+
+
+def _float_str(value):
+    """json 모듈과 같은 방식으로 실수를 문자열로 바꿉니다 (NaN/Infinity 포함)."""
+    if value != value:
+        return 'NaN'
+    if value == float('inf'):
+        return 'Infinity'
+    if value == -float('inf'):
+        return '-Infinity'
+    return float.__repr__(value)
+
+
+def _key_str(key):
+    """딕셔너리 키를 json 모듈과 같은 규칙으로 문자열로 바꿉니다."""
+    if isinstance(key, str):
+        return key
+    if isinstance(key, float):
+        return _float_str(key)
+    if key is True:
+        return 'true'
+    if key is False:
+        return 'false'
+    if key is None:
+        return 'null'
+    if isinstance(key, int):
+        return int.__repr__(key)
+    raise TypeError(f"keys must be str, int, float, bool or None, not {key.__class__.__name__}")
+
+
+class _IndentedEncoder:
+    """
+    json.dump(indent=4, ensure_ascii=False)와 바이트 단위로 같은 결과를 만드는 인코더.
+    문자열 이스케이프는 C 구현(encode_basestring)을 쓰고, 제너레이터 대신
+    리스트에 조각을 모아 한 번에 합치므로 표준 들여쓰기 경로보다 빠릅니다.
+    """
+
+    def __init__(self, default):
+        self.default = default
+        self.markers = set()
+
+    def encode(self, value, level=0):
+        parts = []
+        self._encode(value, level, parts)
+        return ''.join(parts)
+
+    def _encode(self, value, level, parts):
+        if isinstance(value, str):
+            parts.append(encode_basestring(value))
+        elif value is None:
+            parts.append('null')
+        elif value is True:
+            parts.append('true')
+        elif value is False:
+            parts.append('false')
+        elif isinstance(value, int):
+            parts.append(int.__repr__(value))
+        elif isinstance(value, float):
+            parts.append(_float_str(value))
+        elif isinstance(value, (list, tuple)):
+            self._encode_list(value, level, parts)
+        elif isinstance(value, dict):
+            self._encode_dict(value, level, parts)
+        else:
+            marker = self._enter(value)
+            self._encode(self.default(value), level, parts)
+            self.markers.discard(marker)
+
+    def _enter(self, value):
+        marker = id(value)
+        if marker in self.markers:
+            raise ValueError("Circular reference detected")
+        self.markers.add(marker)
+        return marker
+
+    def _encode_list(self, value, level, parts):
+        if not value:
+            parts.append('[]')
+            return
+        marker = self._enter(value)
+        newline = '\n' + INDENT * (level + 1)
+        separator = '[' + newline
+        for item in value:
+            parts.append(separator)
+            separator = ',' + newline
+            if type(item) is str:
+                parts.append(encode_basestring(item))
+            elif type(item) is float:
+                parts.append(_float_str(item))
+            else:
+                self._encode(item, level + 1, parts)
+        parts.append('\n' + INDENT * level + ']')
+        self.markers.discard(marker)
+
+    def _encode_dict(self, value, level, parts):
+        if not value:
+            parts.append('{}')
+            return
+        marker = self._enter(value)
+        newline = '\n' + INDENT * (level + 1)
+        separator = '{' + newline
+        for key, item in value.items():
+            if type(key) is not str:
+                key = _key_str(key)
+            # 가장 흔한 문자열/정수 값은 재귀 호출 없이 바로 기록
+            if type(item) is str:
+                parts.append(separator + encode_basestring(key) + ': ' + encode_basestring(item))
+            elif type(item) is int:
+                parts.append(separator + encode_basestring(key) + ': ' + int.__repr__(item))
+            else:
+                parts.append(separator + encode_basestring(key) + ': ')
+                self._encode(item, level + 1, parts)
+            separator = ',' + newline
+        parts.append('\n' + INDENT * level + '}')
+        self.markers.discard(marker)
+
+
+class JsonStreamWriter:
+    """
+    최상위 JSON 객체를 키 단위로 파일에 기록합니다.
+    배열 값은 이터레이터에서 요소를 하나씩 받아 바로 기록하므로 문서 전체를 메모리에 둘 필요가 없습니다.
+    기본 모드는 json.dump(indent=4, ensure_ascii=False, cls=CustomJSONEncoder)와 바이트 단위로 같고,
+    compact=True면 들여쓰기와 공백 없이 기록합니다.
+    """
+
+    def __init__(self, file, compact=False):
+        self.file = file
+        self.compact = compact
+        if compact:
+            self._encoder = CustomJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+        else:
+            self._encoder = _IndentedEncoder(CustomJSONEncoder().default)
+        self._key_count = 0
+        self._array_count = None
+
+    def _encode(self, value, level):
+        if self.compact:
+            return self._encoder.encode(value)
+        return self._encoder.encode(value, level)
+
+    def _write_key(self, key):
+        if self.compact:
+            prefix = '{' if self._key_count == 0 else ','
+            self.file.write(prefix + encode_basestring(_key_str(key)) + ':')
+        else:
+            prefix = '{\n' if self._key_count == 0 else ',\n'
+            self.file.write(prefix + INDENT + encode_basestring(_key_str(key)) + ': ')
+        self._key_count += 1
+
+    def write_item(self, key, value):
+        """최상위 키와 값을 기록합니다."""
+        self._write_key(key)
+        self.file.write(self._encode(value, 1))
+
+    def begin_array(self, key):
+        """최상위 배열 기록을 시작합니다. 요소는 add_element로 추가합니다."""
+        self._write_key(key)
+        self.file.write('[')
+        self._array_count = 0
+
+    def add_element(self, value):
+        """열려 있는 배열에 요소 하나를 기록합니다."""
+        if self.compact:
+            prefix = ',' if self._array_count else ''
+        else:
+            prefix = (',\n' if self._array_count else '\n') + INDENT * 2
+        self.file.write(prefix + self._encode(value, 2))
+        self._array_count += 1
+
+    def end_array(self):
+        """열려 있는 배열을 닫고 기록한 요소 수를 반환합니다."""
+        count = self._array_count
+        if count and not self.compact:
+            self.file.write('\n' + INDENT)
+        self.file.write(']')
+        self._array_count = None
+        return count
+
+    def write_array(self, key, items):
+        """리스트나 이터레이터의 요소를 하나씩 배열로 기록하고 요소 수를 반환합니다."""
+        self.begin_array(key)
+        for item in items:
+            self.add_element(item)
+        return self.end_array()
+
+    def close(self):
+        """최상위 객체를 닫습니다."""
+        if self._key_count == 0:
+            self.file.write('{}')
+        elif self.compact:
+            self.file.write('}')
+        else:
+            self.file.write('\n}')
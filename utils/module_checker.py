@@ -1,35 +1,49 @@
 # utils/module_checker.py
 import sys
 import subprocess
-import tkinter.messagebox as messagebox
+from importlib.util import find_spec
+
+# 설치 패키지 이름 -> import 이름
+REQUIRED_MODULES = {
+    "ebooklib": "ebooklib",
+    "beautifulsoup4": "bs4",
+    "pymupdf": "fitz",  # PDF 처리 추가
+    "pandas": "pandas",       # ✅ pandas 추가
+    "lxml": "lxml"            # ✅ lxml 추가 (pandas가 내부적으로 사용)
+}
+
+def find_missing_modules():
+    """
+    설치되지 않은 필수 모듈의 패키지 이름 목록을 반환합니다. (GUI 없이 사용 가능)
+    모듈을 실제로 불러오지 않고 설치 여부만 확인하므로 시작 시간에 영향을 주지 않습니다.
+    """
+    missing = []
+    for module_name, import_name in REQUIRED_MODULES.items():
+        try:
+            if find_spec(import_name) is None:
+                missing.append(module_name)
+        except (ImportError, ValueError):
+            missing.append(module_name)
+    return missing
 
 def check_required_modules():
     """필요한 모듈 체크 및 설치"""
-    required_modules = {
-        "ebooklib": "ebooklib",
-        "beautifulsoup4": "bs4",
-        "pymupdf": "fitz",  # PDF 처리 추가
-        "pandas": "pandas",       # ✅ pandas 추가
-        "lxml": "lxml"            # ✅ lxml 추가 (pandas가 내부적으로 사용)
-    }
+    import tkinter.messagebox as messagebox
     
-    for module_name, import_name in required_modules.items():
-        try:
-            __import__(import_name)
-        except ImportError:
-            if messagebox.askyesno(f"{module_name} 설치 필요",
-                                 f"이 프로그램은 {module_name} 모듈이 필요합니다. 설치하시겠습니까?"):
-                try:
-                    subprocess.run(
-                        [sys.executable, "-m", "pip", "install", module_name],
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE,
-                        creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
-                    )
-                    messagebox.showinfo("설치 완료", f"{module_name}가 성공적으로 설치되었습니다. 프로그램을 재시작해주세요.")
-                    exit(0)
-                except Exception as e:
-                    messagebox.showerror("설치 실패", f"{module_name} 설치 중 오류가 발생했습니다: {str(e)}")
-                    exit(1)
-            else:
+    for module_name in find_missing_modules():
+        if messagebox.askyesno(f"{module_name} 설치 필요",
+                             f"이 프로그램은 {module_name} 모듈이 필요합니다. 설치하시겠습니까?"):
+            try:
+                subprocess.run(
+                    [sys.executable, "-m", "pip", "install", module_name],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
+                )
+                messagebox.showinfo("설치 완료", f"{module_name}가 성공적으로 설치되었습니다. 프로그램을 재시작해주세요.")
+                exit(0)
+            except Exception as e:
+                messagebox.showerror("설치 실패", f"{module_name} 설치 중 오류가 발생했습니다: {str(e)}")
                 exit(1)
+        else:
+            exit(1)
@@ -0,0 +1,110 @@
+# utils/stage_timer.py
+"""
+변환 단계별 처리 시간과 처리량 기록.
+
+단계마다 경과 시간(초), 읽은 바이트, 쓴 바이트, 처리 항목 수(페이지/챕터/청크 등)를 누적합니다.
+단계 안에서 다른 단계를 시작하면 안쪽 단계의 시간은 바깥 단계에서 빠지므로
+(예: 청크를 기록하는 동안 EPUB 챕터를 파싱) 모든 단계 시간의 합이 전체 시간이 됩니다.
+"""
+import time
+from contextlib import contextmanager
+
+# 단계별 기록 항목
+STAGE_FIELDS = ('seconds', 'bytes_read', 'bytes_written', 'items')
+
+
+class StageTimer:
+    """변환 하나의 단계별 시간/바이트/항목 수를 기록합니다."""
+
+    def __init__(self):
+        self.stages = {}
+        self._child_seconds = []
+
+    @contextmanager
+    def stage(self, name, items=0, bytes_read=0, bytes_written=0):
+        """with 블록의 경과 시간을 name 단계에 더합니다 (안쪽 단계 시간 제외)."""
+        start = time.perf_counter()
+        self._child_seconds.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            child_seconds = self._child_seconds.pop()
+            if self._child_seconds:
+                self._child_seconds[-1] += elapsed
+            self.add(name, elapsed - child_seconds, items, bytes_read, bytes_written)
+
+    def add(self, name, seconds=0.0, items=0, bytes_read=0, bytes_written=0):
+        """name 단계에 값을 더합니다."""
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = [0.0, 0, 0, 0]
+        stats[0] += seconds
+        stats[1] += bytes_read
+        stats[2] += bytes_written
+        stats[3] += items
+
+    def merge(self, stages):
+        """다른 프로세스에서 기록한 to_dict() 결과를 더합니다."""
+        for name, stats in stages.items():
+            self.add(name, stats['seconds'], stats['items'], stats['bytes_read'], stats['bytes_written'])
+
+    def to_dict(self):
+        """{단계: {'seconds', 'bytes_read', 'bytes_written', 'items'}} 형식으로 반환합니다."""
+        return {name: dict(zip(STAGE_FIELDS, (round(stats[0], 6), *stats[1:])))
+                for name, stats in self.stages.items()}
+
+
+class _NullTimer:
+    """계측하지 않을 때 쓰는 아무 일도 하지 않는 타이머"""
+
+    stages = {}
+
+    @contextmanager
+    def stage(self, name, items=0, bytes_read=0, bytes_written=0):
+        yield
+
+    def add(self, name, seconds=0.0, items=0, bytes_read=0, bytes_written=0):
+        pass
+
+    def merge(self, stages):
+        pass
+
+    def to_dict(self):
+        return {}
+
+
+NULL_TIMER = _NullTimer()
+
+
+def merge_stage_stats(stage_dicts):
+    """여러 변환의 to_dict() 결과를 단계별로 합칩니다."""
+    timer = StageTimer()
+    for stages in stage_dicts:
+        timer.merge(stages)
+    return timer.to_dict()
+
+
+def _format_bytes(size):
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f} MB"
+    return f"{size / 1024:.1f} KB"
+
+
+def format_stage_stats(stages):
+    """단계별 기록을 '단계 시간 (처리량)' 형식의 한 줄로 만듭니다."""
+    parts = []
+    for name, stats in stages.items():
+        seconds = stats['seconds']
+        detail = []
+        size = stats['bytes_read'] or stats['bytes_written']
+        if size:
+            detail.append(_format_bytes(size))
+            if seconds > 0:
+                detail.append(f"{size / (1024 * 1024) / seconds:.1f} MB/s")
+        if stats['items']:
+            detail.append(f"{stats['items']}개")
+            if seconds > 0:
+                detail.append(f"{stats['items'] / seconds:.0f}개/s")
+        parts.append(f"{name} {seconds:.3f}초" + (f" ({', '.join(detail)})" if detail else ""))
+    return ", ".join(parts)
@@ -1,51 +1,220 @@
 # utils/text_utils.py
 import re
 
-def split_text_into_chunks(text, chunk_size=1000):
-    """텍스트를 적절한 크기의 청크로 분할합니다."""
-    chunks = []
-    current_chunk = ""
-    
+# 문장 경계: 마침표/느낌표/물음표와 뒤따르는 공백 (문장은 문장부호까지 포함)
+# 후방탐색 (?<=[.!?])\s+ 과 같은 위치를 찾지만 모든 위치에서 후방탐색을 시도하지 않아 더 빠름
+SENTENCE_BOUNDARY = re.compile(r'[.!?]\s+')
+PARAGRAPH_SEPARATOR = '\n\n'
+
+
+def _sentence_spans(text, start, end):
+    """text[start:end]를 문장 경계로 나눈 (시작, 끝) 위치들을 반환합니다 (re.split과 같은 결과)."""
+    for boundary in SENTENCE_BOUNDARY.finditer(text, start, end):
+        yield start, boundary.start() + 1
+        start = boundary.end()
+    yield start, end
+
+
+def iter_chunk_spans(text, chunk_size=1000):
+    """
+    텍스트를 청크 단위로 나누어 각 청크의 조각 목록을 반환하는 제너레이터.
+    조각은 (앞 구분자, 시작, 끝) 튜플이며 문자열을 만들지 않고 원문 위치와 길이만 계산하므로
+    텍스트 길이에 비례하는 시간에 동작합니다. 원문에서 구분자까지 그대로 이어지는 조각은
+    하나로 합쳐 두므로 대부분의 청크는 조각 하나입니다. 청크 문자열은 chunk_text로 만듭니다.
+    """
+    pieces = []  # 현재 청크의 조각
+    length = 0   # 현재 청크를 문자열로 만들었을 때의 길이 (구분자 포함)
+    text_length = len(text)
+    separator_length = len(PARAGRAPH_SEPARATOR)
+    find = text.find
+
     # 단락 또는 문장 단위로 분할 시도
-    paragraphs = text.split('\n\n')
-    
-    for para in paragraphs:
-        if not para.strip():
+    para_start = 0
+    while para_start <= text_length:
+        para_end = find(PARAGRAPH_SEPARATOR, para_start)
+        if para_end == -1:
+            para_end = text_length
+        next_para_start = para_end + separator_length
+
+        # 비어 있거나 공백뿐인 단락은 건너뜀 (첫 글자가 공백일 때만 전체 확인)
+        if para_start == para_end or (text[para_start].isspace() and text[para_start:para_end].isspace()):
+            para_start = next_para_start
             continue
-        
+        para_length = para_end - para_start
+
         # 현재 청크에 현재 단락을 추가했을 때 청크 크기를 초과하는 경우
-        if len(current_chunk) + len(para) > chunk_size:
+        if length + para_length > chunk_size:
             # 현재 청크가 있으면 추가
-            if current_chunk:
-                chunks.append(current_chunk.strip())
-                current_chunk = ""
-            
+            if length:
+                yield pieces
+                pieces, length = [], 0
+
             # 단락이 너무 큰 경우 문장 단위로 분할
-            if len(para) > chunk_size:
-                sentences = re.split(r'(?<=[.!?])\s+', para)
-                for sentence in sentences:
-                    if len(current_chunk) + len(sentence) > chunk_size:
-                        if current_chunk:
-                            chunks.append(current_chunk.strip())
-                            current_chunk = ""
-                        
+            if para_length > chunk_size:
+                for sentence_start, sentence_end in _sentence_spans(text, para_start, para_end):
+                    sentence_length = sentence_end - sentence_start
+                    if length + sentence_length > chunk_size:
+                        if length:
+                            yield pieces
+                            pieces, length = [], 0
+
                         # 문장이 여전히 너무 큰 경우 강제 분할
-                        if len(sentence) > chunk_size:
-                            while sentence:
-                                chunk_part = sentence[:chunk_size]
-                                chunks.append(chunk_part.strip())
-                                sentence = sentence[chunk_size:]
+                        if sentence_length > chunk_size:
+                            for part_start in range(sentence_start, sentence_end, chunk_size):
+                                yield [('', part_start, min(part_start + chunk_size, sentence_end))]
+                        else:
+                            pieces, length = [('', sentence_start, sentence_end)], sentence_length
+                    elif length:
+                        last_separator, last_start, last_end = pieces[-1]
+                        if last_end + 1 == sentence_start and text[last_end] == ' ':
+                            # 원문의 문장 사이 공백이 한 칸이면 앞 조각을 늘림
+                            pieces[-1] = (last_separator, last_start, sentence_end)
                         else:
-                            current_chunk = sentence
+                            pieces.append((' ', sentence_start, sentence_end))
+                        length += 1 + sentence_length
                     else:
-                        current_chunk += " " + sentence if current_chunk else sentence
+                        pieces, length = [('', sentence_start, sentence_end)], sentence_length
             else:
-                current_chunk = para
+                pieces, length = [('', para_start, para_end)], para_length
+        elif length:
+            last_separator, last_start, last_end = pieces[-1]
+            if last_end + separator_length == para_start:
+                # 바로 이어지는 단락이면 앞 조각을 늘림 (사이의 원문이 단락 구분자)
+                pieces[-1] = (last_separator, last_start, para_end)
+            else:
+                pieces.append((PARAGRAPH_SEPARATOR, para_start, para_end))
+            length += separator_length + para_length
         else:
-            current_chunk += "\n\n" + para if current_chunk else para
-    
+            pieces, length = [('', para_start, para_end)], para_length
+
+        para_start = next_para_start
+
     # 마지막 청크 추가
-    if current_chunk:
-        chunks.append(current_chunk.strip())
-    
-    return chunks
+    if length:
+        yield pieces
+
+
+def chunk_text(text, pieces):
+    """iter_chunk_spans가 반환한 조각 목록으로 청크 문자열을 만듭니다 (앞뒤 공백 제거)."""
+    if len(pieces) == 1:
+        _, start, end = pieces[0]
+        return text[start:end].strip()
+    return ''.join([separator + text[start:end] for separator, start, end in pieces]).strip()
+
+
+def strip_chunk_pieces(text, pieces):
+    """
+    조각 목록에서 청크 앞뒤 공백을 원문 위치로 잘라낸 조각 튜플을 반환합니다.
+    반환한 조각들을 이어 붙이면 chunk_text와 같은 문자열이 되며, 내용이 없으면 빈 튜플입니다.
+    """
+    pieces = list(pieces)
+    # 앞쪽 공백: 첫 조각 시작 위치를 옮기고, 공백뿐인 조각은 버림 (다음 조각의 구분자도 공백이므로 제거)
+    while pieces:
+        _, start, end = pieces[0]
+        while start < end and text[start].isspace():
+            start += 1
+        if start < end:
+            pieces[0] = ('', start, end)
+            break
+        del pieces[0]
+    # 뒤쪽 공백: 마지막 조각 끝 위치를 옮기고, 공백뿐인 조각은 구분자와 함께 버림
+    while pieces:
+        separator, start, end = pieces[-1]
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        if start < end:
+            pieces[-1] = (separator, start, end)
+            break
+        del pieces[-1]
+    return tuple(pieces)
+
+
+def split_text_into_chunks(text, chunk_size=1000):
+    """텍스트를 적절한 크기의 청크로 분할합니다."""
+    return [chunk_text(text, pieces) for pieces in iter_chunk_spans(text, chunk_size)]
+
+
+def _paragraph_spans(text):
+    """내용이 있는 단락들의 (시작, 끝) 위치를 반환합니다 (text.split('\n\n')에서 빈 단락 제외)."""
+    spans = []
+    text_length = len(text)
+    para_start = 0
+    while para_start <= text_length:
+        para_end = text.find(PARAGRAPH_SEPARATOR, para_start)
+        if para_end == -1:
+            para_end = text_length
+        if para_start < para_end and not text[para_start:para_end].isspace():
+            spans.append((para_start, para_end))
+        para_start = para_end + len(PARAGRAPH_SEPARATOR)
+    return spans
+
+
+def token_chunk_spans(text, max_tokens, count_batch):
+    """
+    텍스트를 토큰 수 기준 청크로 분할하여 (조각 목록, 토큰 수) 목록을 반환합니다 (내용이 없는 청크는 제외).
+    count_batch는 텍스트 목록의 토큰 수 목록을 반환하는 함수이며 (utils.token_counter),
+    단락 → 긴 단락의 문장 → 완성된 청크 순서로 단계마다 한 번씩만 호출합니다.
+    분할 규칙은 split_text_into_chunks와 같고, 조각 토큰 수의 합으로 청크를 채운 뒤
+    청크의 실제 토큰 수를 다시 계산합니다.
+    """
+    paragraphs = _paragraph_spans(text)
+    para_tokens = count_batch([text[start:end] for start, end in paragraphs])
+
+    # 토큰 수를 넘는 단락만 문장 단위로 나누어 한 번에 계산
+    sentences = {}
+    for i, (start, end) in enumerate(paragraphs):
+        if para_tokens[i] > max_tokens:
+            sentences[i] = list(_sentence_spans(text, start, end))
+    sentence_spans = [span for spans in sentences.values() for span in spans]
+    sentence_tokens = iter(count_batch([text[start:end] for start, end in sentence_spans]) if sentence_spans else [])
+
+    chunks = []
+    pieces = []  # 현재 청크의 (앞 구분자, 시작, 끝) 조각
+    tokens = 0   # 현재 청크 조각들의 토큰 수 합
+
+    for i, (para_start, para_end) in enumerate(paragraphs):
+        if i not in sentences:
+            if pieces and tokens + para_tokens[i] > max_tokens:
+                chunks.append(pieces)
+                pieces, tokens = [], 0
+            pieces.append((PARAGRAPH_SEPARATOR if pieces else '', para_start, para_end))
+            tokens += para_tokens[i]
+            continue
+
+        # 긴 단락은 새 청크에서 문장 단위로 채움
+        if pieces:
+            chunks.append(pieces)
+            pieces, tokens = [], 0
+        for sentence_start, sentence_end in sentences[i]:
+            sentence_token_count = next(sentence_tokens)
+            if sentence_token_count > max_tokens:
+                if pieces:
+                    chunks.append(pieces)
+                    pieces, tokens = [], 0
+                # 문장이 여전히 너무 큰 경우 토큰 수에 비례한 글자 수로 강제 분할
+                part_count = -(-sentence_token_count // max_tokens)
+                part_length = max(1, -(-(sentence_end - sentence_start) // part_count))
+                for part_start in range(sentence_start, sentence_end, part_length):
+                    chunks.append([('', part_start, min(part_start + part_length, sentence_end))])
+                continue
+            if pieces and tokens + sentence_token_count > max_tokens:
+                chunks.append(pieces)
+                pieces, tokens = [], 0
+            pieces.append((' ' if pieces else '', sentence_start, sentence_end))
+            tokens += sentence_token_count
+
+    # 마지막 청크 추가
+    if pieces:
+        chunks.append(pieces)
+
+    # 청크 문자열은 토큰 수를 계산하는 동안만 만들고 조각 목록을 반환
+    chunk_texts = [chunk_text(text, pieces) for pieces in chunks]
+    chunks = [pieces for pieces, chunk in zip(chunks, chunk_texts) if chunk]
+    chunk_texts = [chunk for chunk in chunk_texts if chunk]
+    return list(zip(chunks, count_batch(chunk_texts) if chunk_texts else []))
+
+
+def split_text_into_token_chunks(text, max_tokens, count_batch):
+    """텍스트를 토큰 수 기준 청크로 분할하여 (청크, 토큰 수) 목록을 반환합니다 (token_chunk_spans 참고)."""
+    return [(chunk_text(text, pieces), token_count)
+            for pieces, token_count in token_chunk_spans(text, max_tokens, count_batch)]
@@ -0,0 +1,189 @@
+# utils/token_counter.py
+"""
+토큰 단위 청크 분할에 쓰는 토큰 수 계산기.
+
+- 기본값: 외부 파일 없이 문자 종류로 토큰 수를 추정 (한글/한자/가나는 글자당 1토큰, 영문 단어는 4글자당 1토큰)
+- vocab.txt: WordPiece 어휘 파일 (한 줄에 토큰 하나)로 직접 토큰화
+- tokenizer.json: Hugging Face tokenizers 파일 (tokenizers 모듈 필요)
+
+모든 계산기는 count_batch(texts)로 여러 텍스트의 토큰 수를 한 번에 계산합니다.
+"""
+import os
+import re
+import unicodedata
+
+from utils.file_utils import hash_file
+
+# tokenizer.json 지원 체크
+try:
+    from tokenizers import Tokenizer
+    TOKENIZERS_SUPPORT = True
+except ImportError:
+    Tokenizer = None
+    TOKENIZERS_SUPPORT = False
+
+# 청크 크기 단위: chars (문자 수), tokens (토큰 수)
+CHUNK_UNITS = ("chars", "tokens")
+DEFAULT_CHUNK_UNIT = "chars"
+
+# 글자 하나가 토큰 하나로 세어지는 문자 (한글, 한자, 가나)
+_CJK_CHARS = '\u1100-\u11ff\u3040-\u30ff\u3130-\u318f\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff'
+# 추정용 조각: CJK 글자 하나, 영문 등 단어, 숫자 3자리, 그 밖의 기호 하나
+_ESTIMATE_PIECE = re.compile(rf'[{_CJK_CHARS}]|[^\W\d_{_CJK_CHARS}]+|\d{{1,3}}|[^\w\s]|_')
+# 영문 단어는 평균 4글자당 1토큰으로 추정
+_CHARS_PER_WORD_TOKEN = 4
+
+# WordPiece 사전 토큰화: CJK 글자 하나, 단어, 구두점 하나
+_WORDPIECE_PIECE = re.compile(rf'[{_CJK_CHARS}]|[^\W{_CJK_CHARS}]+|[^\w\s]')
+_WORDPIECE_MAX_CHARS = 100
+
+# 프로세스별로 불러온 계산기 (어휘 파일을 파일마다 다시 읽지 않도록, 키: 경로와 내용 해시)
+_loaded_counters = {}
+# 토크나이저 파일 내용 해시 (키: 경로, 크기, 수정 시각)
+_fingerprints = {}
+
+
+class ApproximateTokenCounter:
+    """어휘 파일 없이 문자 종류로 토큰 수를 추정합니다."""
+
+    name = "estimate"
+
+    def count(self, text):
+        pieces = _ESTIMATE_PIECE.findall(text)
+        long_words = [len(piece) for piece in pieces if len(piece) > _CHARS_PER_WORD_TOKEN]
+        return len(pieces) + sum((length - 1) // _CHARS_PER_WORD_TOKEN for length in long_words)
+
+    def count_batch(self, texts):
+        return [self.count(text) for text in texts]
+
+
+class WordPieceTokenCounter:
+    """
+    WordPiece 어휘 파일(vocab.txt)로 토큰 수를 계산합니다.
+    단어마다 가장 긴 어휘부터 맞추며, 대문자 토큰이 없는 어휘는 소문자/악센트 제거 어휘로 봅니다.
+    """
+
+    def __init__(self, vocab_path):
+        with open(vocab_path, 'r', encoding='utf-8') as f:
+            self.vocab = {line.rstrip('\n') for line in f if line.strip()}
+        self.name = os.path.basename(vocab_path)
+        self.lowercase = not any(token != token.lower() for token in self.vocab if not token.startswith('['))
+        self.max_token_length = max((len(token) for token in self.vocab), default=1)
+        self._word_cache = {}
+
+    def _normalize(self, text):
+        if not self.lowercase:
+            return text
+        # 악센트만 제거하고 한글 등은 다시 조합
+        text = unicodedata.normalize('NFD', text.lower())
+        return unicodedata.normalize('NFC', ''.join(char for char in text if unicodedata.category(char) != 'Mn'))
+
+    def _count_word(self, word):
+        """단어 하나의 WordPiece 토큰 수 (맞는 어휘가 없으면 [UNK] 하나)"""
+        count = self._word_cache.get(word)
+        if count is not None:
+            return count
+        if len(word) > _WORDPIECE_MAX_CHARS:
+            count = 1
+        else:
+            count = 0
+            start = 0
+            while start < len(word):
+                end = min(len(word), start + self.max_token_length)
+                while end > start:
+                    piece = word[start:end] if start == 0 else "##" + word[start:end]
+                    if piece in self.vocab:
+                        break
+                    end -= 1
+                if end == start:
+                    count = 1
+                    break
+                count += 1
+                start = end
+        self._word_cache[word] = count
+        return count
+
+    def count(self, text):
+        return sum(self._count_word(word) for word in _WORDPIECE_PIECE.findall(self._normalize(text)))
+
+    def count_batch(self, texts):
+        return [self.count(text) for text in texts]
+
+
+class HuggingFaceTokenCounter:
+    """Hugging Face tokenizer.json 파일로 토큰 수를 계산합니다 (tokenizers 모듈 필요)."""
+
+    def __init__(self, tokenizer_path):
+        self.tokenizer = Tokenizer.from_file(tokenizer_path)
+        self.name = os.path.basename(tokenizer_path)
+
+    def count(self, text):
+        return self.count_batch([text])[0]
+
+    def count_batch(self, texts):
+        if not texts:
+            return []
+        encodings = self.tokenizer.encode_batch(list(texts), add_special_tokens=False)
+        return [len(encoding.ids) for encoding in encodings]
+
+
+def tokenizer_fingerprint(tokenizer_path):
+    """
+    토크나이저 파일 내용의 SHA-256 해시를 반환합니다. 경로가 없거나 파일을 읽을 수 없으면 None.
+    같은 경로의 파일을 고치거나 바꾸면 값이 달라지므로 변환 캐시 키, 변환 기록, 불러온 계산기 구분에 씁니다.
+    크기와 수정 시각이 그대로면 해시를 다시 계산하지 않습니다.
+    """
+    if not tokenizer_path:
+        return None
+    try:
+        stat = os.stat(tokenizer_path)
+    except OSError:
+        return None
+    signature = (tokenizer_path, stat.st_size, stat.st_mtime_ns)
+    fingerprint = _fingerprints.get(signature)
+    if fingerprint is None:
+        try:
+            fingerprint = hash_file(tokenizer_path)
+        except OSError:
+            return None
+        _fingerprints[signature] = fingerprint
+    return fingerprint
+
+
+def load_token_counter(tokenizer_path=None):
+    """
+    토큰 수 계산기를 반환합니다. (계산기, 오류 메시지) 튜플을 반환합니다.
+    tokenizer_path가 없으면 추정 계산기를, .json이면 Hugging Face 토크나이저를, 그 밖의 파일은 WordPiece 어휘로 읽습니다.
+    같은 경로라도 파일 내용이 바뀌면 다시 읽습니다.
+    """
+    if not tokenizer_path:
+        tokenizer_path = ApproximateTokenCounter.name
+    key = tokenizer_path
+    if tokenizer_path != ApproximateTokenCounter.name:
+        key = (tokenizer_path, tokenizer_fingerprint(tokenizer_path))
+    if key in _loaded_counters:
+        return _loaded_counters[key], None
+
+    if tokenizer_path == ApproximateTokenCounter.name:
+        counter = ApproximateTokenCounter()
+    elif not os.path.isfile(tokenizer_path):
+        return None, f"토크나이저 파일을 찾을 수 없습니다: {tokenizer_path}"
+    elif tokenizer_path.lower().endswith('.json'):
+        if not TOKENIZERS_SUPPORT:
+            return None, "tokenizer.json을 사용하려면 tokenizers 모듈이 필요합니다."
+        try:
+            counter = HuggingFaceTokenCounter(tokenizer_path)
+        except Exception as e:
+            return None, f"토크나이저 파일을 읽는 중 오류 발생: {str(e)}"
+    else:
+        try:
+            counter = WordPieceTokenCounter(tokenizer_path)
+        except Exception as e:
+            return None, f"어휘 파일을 읽는 중 오류 발생: {str(e)}"
+
+    # 같은 경로의 이전 내용으로 불러온 계산기는 버림
+    for old_key in [old_key for old_key in _loaded_counters
+                    if isinstance(old_key, tuple) and old_key[0] == tokenizer_path]:
+        del _loaded_counters[old_key]
+    _loaded_counters[key] = counter
+    return counter, None